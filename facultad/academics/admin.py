@@ -1,8 +1,22 @@
 from django.contrib import admin
-from .models import Department
+from .models import Department, PlanEstudio, PlanItem
 @admin.register(Department)
 class DepartmentAdmin(admin.ModelAdmin):
     list_display = ("nombre", "created_at")
     search_fields = ("nombre",)
 
+
+class PlanItemInline(admin.TabularInline):
+    model = PlanItem
+    extra = 0
+    fields = ("nombre", "anio", "materia")
+    raw_id_fields = ("materia",)
+
+
+@admin.register(PlanEstudio)
+class PlanEstudioAdmin(admin.ModelAdmin):
+    list_display = ("carrera", "updated_at")
+    search_fields = ("carrera",)
+    inlines = [PlanItemInline]
+
 # Register your models here.
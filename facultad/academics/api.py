@@ -0,0 +1,238 @@
+# academics/api.py
+# API REST de solo lectura (DRF), versionada en la URL: /api/v1/...
+#   departamentos/            materias/?departamento=      cursadas/?materia=&anio=
+#   profesores/               (+ detalle <id>/ en cada una)
+#   ratings/?materia=1,2&mca=7  (o POST {"materia": [1, 2], "mca": [7]}) -> muchos ratings juntos
+# - ?fields=id,nombre -> solo esos campos (si no se pide "rating" no se consulta)
+# - paginación por cursor (?cursor=...&page_size=...), estable aunque se agreguen filas
+# - ratings de la página con una sola consulta agrupada (ratings.ratings_for)
+# - ETag solo con las versiones del catálogo (catalog_cache, incluido RATINGS si se
+#   muestran ratings): un 304 no toca la base. Presupuesto: ApiQueryCountTests.
+import hashlib
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from academics import catalog_cache, ratings
+from academics.models import Department, Materia, MateriaComisionAnio, ResenaItem
+from academics.serializers import (
+    DepartmentSerializer, MateriaSerializer, MCASerializer, ProfesorSerializer, rating_data,
+    requested_fields,
+)
+from people.models import User
+
+# consultas por request (sin contar la sesión): página + ratings de la página
+QUERY_BUDGET = 2
+
+_PROFESOR_FIELDS = ["id", "username", "first_name", "last_name"]
+
+
+class CatalogCursorPagination(CursorPagination):
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+    def get_ordering(self, request, queryset, view):
+        # cada vista define su orden (un campo único adelante: el cursor se posiciona por él)
+        return view.ordering
+
+
+def _int_param(request, name):
+    raw = request.query_params.get(name)
+    if raw in (None, ""):
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        raise ValidationError({name: "Tiene que ser un número entero."})
+
+
+class CatalogViewSet(viewsets.ReadOnlyModelViewSet):
+    permission_classes = [IsAuthenticated]
+    pagination_class = CatalogCursorPagination
+    ordering = ("id",)
+    etag_scopes = ()      # del catálogo (catalog_cache) de los que depende la respuesta
+    rating_type = None    # ratings.* para obj.rating; None = sin rating
+
+    def wants(self, field) -> bool:
+        fields = requested_fields(self.request)
+        return fields is None or field in fields
+
+    def _with_rating(self) -> bool:
+        return self.rating_type is not None and self.wants("rating")
+
+    def _attach_ratings(self, objs):
+        if not self._with_rating():
+            return
+        found = ratings.ratings_for(self.rating_type, [o.pk for o in objs])
+        for o in objs:
+            o.rating = found.get(o.pk, ratings.SIN_RATING)
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        self._attach_ratings(page)
+        return page
+
+    def get_object(self):
+        obj = super().get_object()
+        self._attach_ratings([obj])
+        return obj
+
+    def etag(self, request) -> str:
+        scopes = [catalog_cache.GLOBAL, *self.etag_scopes]
+        if self._with_rating():
+            scopes.append(catalog_cache.RATINGS)
+        parts = [request.get_full_path(), request.accepted_renderer.format]
+        parts += [str(v) for v in catalog_cache.versions(scopes)]
+        return quote_etag(hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest())
+
+    def _conditional(self, handler, request, *args, **kwargs):
+        etag = self.etag(request)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response.headers.setdefault("ETag", etag)
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional(super().retrieve, request, *args, **kwargs)
+
+
+class DepartmentViewSet(CatalogViewSet):
+    serializer_class = DepartmentSerializer
+    queryset = Department.objects.all()
+    ordering = ("nombre",)
+    etag_scopes = (catalog_cache.DEPARTMENTS,)
+
+
+class MateriaViewSet(CatalogViewSet):
+    serializer_class = MateriaSerializer
+    ordering = ("nombre",)
+    etag_scopes = (catalog_cache.MATERIAS, catalog_cache.DEPARTMENTS)
+    rating_type = ResenaItem.Target.MATERIA
+
+    def get_queryset(self):
+        qs = Materia.objects.filter(eliminado=False)
+        if self.wants("departamento_nombre"):
+            qs = qs.select_related("departamento")
+        departamento = _int_param(self.request, "departamento")
+        if departamento is not None:
+            qs = qs.filter(departamento_id=departamento)
+        return qs
+
+
+class MCAViewSet(CatalogViewSet):
+    serializer_class = MCASerializer
+    etag_scopes = (
+        catalog_cache.CURSADAS, catalog_cache.MATERIAS, catalog_cache.COMISIONES,
+        catalog_cache.PROFESORES,
+    )
+    rating_type = ratings.MCA
+
+    def get_queryset(self):
+        # un solo JOIN con las columnas que se muestran (nada de password/email de los profesores)
+        related = ["materia", "comision"] + [r for r in ("titular", "jtp", "ayudante") if self.wants(r)]
+        only = ["id", "anio", "materia__id", "materia__nombre", "comision__id", "comision__nombre"]
+        only += [f"{r}__{f}" for r in related[2:] for f in _PROFESOR_FIELDS]
+        qs = (
+            MateriaComisionAnio.objects
+            .filter(materia__eliminado=False)
+            .select_related(*related)
+            .only(*only)
+        )
+        materia = _int_param(self.request, "materia")
+        if materia is not None:
+            qs = qs.filter(materia_id=materia)
+        anio = _int_param(self.request, "anio")
+        if anio is not None:
+            qs = qs.filter(anio=anio)
+        return qs
+
+
+class ProfesorViewSet(CatalogViewSet):
+    serializer_class = ProfesorSerializer
+    etag_scopes = (catalog_cache.PROFESORES,)
+    rating_type = ratings.PROFESOR
+
+    def get_queryset(self):
+        return User.objects.filter(rol=User.Role.PROFESOR).only(*_PROFESOR_FIELDS, "imagen_perfil")
+
+
+# parámetro -> tipo de ratings.ratings_for
+RATING_TYPES = {
+    "materia": ResenaItem.Target.MATERIA,
+    "comision": ResenaItem.Target.COMISION,
+    "titular": ResenaItem.Target.TITULAR,
+    "jtp": ResenaItem.Target.JTP,
+    "mca": ratings.MCA,            # la comisión dentro de esa cursada
+    "profesor": ratings.PROFESOR,  # titular + JTP
+}
+
+
+def ratings_batch_max() -> int:
+    return getattr(settings, "RATINGS_BATCH_MAX", 500)
+
+
+def _parse_ids(name, raw) -> set:
+    if isinstance(raw, str):
+        raw = [p for p in raw.split(",") if p.strip()]
+    if not isinstance(raw, list):
+        raise ValidationError({name: "Tiene que ser una lista de ids."})
+    try:
+        return {int(i) for i in raw}
+    except (TypeError, ValueError):
+        raise ValidationError({name: "Los ids tienen que ser números enteros."})
+
+
+class RatingsBatchView(APIView):
+    """
+    Ratings de muchas entidades en un request, para las grillas de cards. Ids por tipo
+    (GET ?materia=1,2,3 o POST con un objeto JSON de listas; las claves en mayúsculas,
+    MATERIA/COMISION/..., también valen). Una consulta agrupada por tipo pedido y como
+    mucho RATINGS_BATCH_MAX ids en total.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def _ids_por_tipo(self, data) -> dict:
+        pedidos = {}
+        for key, raw in data.items():
+            name = key.lower()
+            if name not in RATING_TYPES:
+                continue  # ?format=, etc.
+            ids = _parse_ids(name, raw)
+            if ids:
+                pedidos[name] = pedidos.get(name, set()) | ids
+        total = sum(len(ids) for ids in pedidos.values())
+        if total > ratings_batch_max():
+            raise ValidationError({"detail": f"Máximo {ratings_batch_max()} ids por request (se pidieron {total})."})
+        return pedidos
+
+    def _response(self, data):
+        pedidos = self._ids_por_tipo(data)
+        body = {}
+        for name, ids in pedidos.items():
+            found = ratings.ratings_for(RATING_TYPES[name], ids)
+            body[name] = {str(pk): rating_data(r) for pk, r in sorted(found.items())}
+        response = Response(body)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def get(self, request, *args, **kwargs):
+        return self._response({k: request.query_params.get(k) for k in request.query_params})
+
+    def post(self, request, *args, **kwargs):
+        if not isinstance(request.data, dict):
+            raise ValidationError({"detail": "Se espera un objeto JSON: {\"materia\": [1, 2], ...}."})
+        return self._response(request.data)
@@ -0,0 +1,19 @@
+# academics/api_urls.py
+# Rutas de la API (academics/api.py); facultad/urls.py las monta en /api/<version>/.
+from django.urls import path
+from rest_framework.routers import DefaultRouter
+
+from academics import api
+
+app_name = "api"
+
+router = DefaultRouter()
+router.register("departamentos", api.DepartmentViewSet, basename="departamento")
+router.register("materias", api.MateriaViewSet, basename="materia")
+router.register("cursadas", api.MCAViewSet, basename="cursada")
+router.register("profesores", api.ProfesorViewSet, basename="profesor")
+
+urlpatterns = [
+    path("ratings/", api.RatingsBatchView.as_view(), name="ratings"),
+    *router.urls,
+]
@@ -1,16 +1,25 @@
 from django.apps import AppConfig
-from better_profanity import profanity
+from django.db.models.signals import post_migrate
 
-SPANISH_BAD_WORDS = [
-    "mierda", "boludos", "pelotudo", "forro", "concha",
-    "carajo", "puta", "puto", "hdp", "pete", "culiado",
-    "garca", "mogólico", "mogolico", "pelotudez"
-]
+
+def _install_search_index(sender, using, **kwargs):
+    # Si una migración recreó la tabla de items (SQLite), vuelve a crear los triggers de FTS
+    from django.db import connections
+    from django.db.migrations.recorder import MigrationRecorder
+    from academics import search
+
+    conn = connections[using]
+    applied = MigrationRecorder(conn).applied_migrations()
+    if ("academics", "0011_resenaitem_search_index") in applied:
+        search.install(conn)
 
 
 class AcademicsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'academics'
     def ready(self):
-        profanity.load_censor_words()
-        profanity.add_censor_words(SPANISH_BAD_WORDS)
+        # Compila el autómata de censura una sola vez por proceso
+        from academics.censor import get_engine
+        get_engine()
+        from academics import signals  # noqa: F401
+        post_migrate.connect(_install_search_index, sender=self)
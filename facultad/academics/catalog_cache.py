@@ -0,0 +1,86 @@
+# academics/catalog_cache.py
+# Cache de las grillas de cards del catálogo (home, materias por departamento,
+# comisiones por materia/año). Cada fragmento se guarda bajo una clave que incluye
+# la versión de los "scopes" de los que depende; cuando algo cambia se incrementa
+# la versión del scope (ver academics/signals.py) y las claves viejas dejan de usarse.
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+GLOBAL = "catalog"
+DEPARTMENTS = "departments"
+COMISIONES = "comisiones"
+PROFESORES = "profesores"
+MATERIAS = "materias"    # cualquier materia (nombres en el perfil de profesor)
+CURSADAS = "cursadas"    # cualquier MateriaComisionAnio (quién dicta qué)
+RATINGS = "ratings"      # cualquier RatingSummary (ETag de la API, academics/api.py)
+COMENTARIOS = "comentarios"  # texto censurado de los comentarios (censor.recensor_items)
+
+
+def dept_scope(department_id) -> str:
+    return f"dept:{department_id}"
+
+
+def materia_scope(materia_id) -> str:
+    return f"materia:{materia_id}"
+
+
+def _cache():
+    return caches[getattr(settings, "CATALOG_CACHE_ALIAS", "default")]
+
+
+def _timeout():
+    return getattr(settings, "CATALOG_CACHE_TIMEOUT", 300)
+
+
+def _version_key(scope):
+    return f"catalog:v:{scope}"
+
+
+def _new_version():
+    # La versión es el instante del último cambio (ns): nunca se repite aunque el valor
+    # se pierda (eviction/reinicio).
+    return time.time_ns()
+
+
+def versions(scopes) -> list:
+    """Versión actual de cada scope (las que faltan se inicializan)."""
+    cache = _cache()
+    keys = [_version_key(s) for s in scopes]
+    found = cache.get_many(keys)
+    result = []
+    for key in keys:
+        v = found.get(key)
+        if v is None:
+            v = _new_version()
+            if not cache.add(key, v, None):
+                v = cache.get(key, v)
+        result.append(v)
+    return result
+
+
+def fragment_key(name, scopes, parts=()) -> str:
+    vs = ".".join(str(v) for v in versions(scopes))
+    extra = ":".join(str(p) for p in parts)
+    return f"catalog:frag:{name}:{extra}:{vs}"
+
+
+def get_fragment(key):
+    return _cache().get(key)
+
+
+def set_fragment(key, value):
+    _cache().set(key, value, _timeout())
+
+
+def _bump_now(scopes):
+    _cache().set_many({_version_key(s): _new_version() for s in scopes}, None)
+
+
+def bump(*scopes):
+    """Invalida los fragmentos que dependen de esos scopes (al confirmar la transacción)."""
+    scopes = [s for s in scopes if s]
+    if scopes:
+        transaction.on_commit(lambda: _bump_now(scopes))
@@ -0,0 +1,241 @@
+# academics/censor.py
+# Censura de comentarios. Misma lista de palabras y sustituciones que better_profanity
+# ("4ss", "@$$", "sh1t") + las palabras en castellano, pero compiladas en un trie que se
+# recorre como un DFA armado a demanda: cada carácter del texto es una búsqueda en un dict.
+import hashlib
+import re
+import threading
+
+from better_profanity.constants import ALLOWED_CHARACTERS
+from better_profanity.utils import get_complete_path_of_file, read_wordlist
+
+from academics import catalog_cache
+
+SPANISH_BAD_WORDS = [
+    "mierda", "boludo", "boludos", "pelotudo", "forro", "concha",
+    "carajo", "puta", "puto", "hdp", "pete", "culiado",
+    "garca", "mogólico", "mogolico", "pelotudez"
+]
+
+# Igual que better_profanity: letra de la palabra -> cómo puede aparecer escrita
+CHARS_MAPPING = {
+    "a": ("a", "@", "*", "4"),
+    "i": ("i", "*", "l", "1"),
+    "o": ("o", "*", "0", "@"),
+    "u": ("u", "*", "v"),
+    "v": ("v", "*", "u"),
+    "l": ("l", "1"),
+    "e": ("e", "*", "3"),
+    "s": ("s", "$", "5"),
+    "t": ("t", "7"),
+}
+
+
+def _char_class(chars):
+    # Agrupa los caracteres en rangos (a-z, ...) para que la regex no sea una lista de miles
+    codes = sorted(ord(c) for c in chars)
+    parts = []
+    start = prev = codes[0]
+    for code in codes[1:] + [None]:
+        if code is not None and code == prev + 1:
+            prev = code
+            continue
+        parts.append(re.escape(chr(start)) if start == prev
+                     else f"{re.escape(chr(start))}-{re.escape(chr(prev))}")
+        if code is not None:
+            start = prev = code
+    return "[%s]" % "".join(parts)
+
+
+# Una "palabra" son los mismos caracteres que considera better_profanity
+_TOKEN_RE = re.compile(_char_class(ALLOWED_CHARACTERS) + "+")
+
+
+class CensorEngine:
+    """
+    Reemplaza por censor_char * 4 cada palabra (o frase de varias palabras)
+    de la lista, comparando palabras completas como better_profanity. A diferencia de
+    better_profanity, no junta palabras sueltas del texto para formar una de la lista
+    ("a s s", "h.d.p"): solo cruza separadores escritos igual que en una frase de la lista.
+    """
+
+    def __init__(self, words, char_map=CHARS_MAPPING):
+        self.words = sorted({w.strip().lower() for w in words if w and w.strip()})
+        self.version = hashlib.sha1("\n".join(self.words).encode("utf-8")).hexdigest()[:12]
+
+        # Trie (NFA): nodo -> {caracter: nodo}
+        self._children = [{}]
+        self._terminal = [False]
+        self._max_tokens = 1
+        for w in self.words:
+            node = 0
+            for ch in w:
+                nxt = self._children[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._children)
+                    self._children[node][ch] = nxt
+                    self._children.append({})
+                    self._terminal.append(False)
+                node = nxt
+            self._terminal[node] = True
+            self._max_tokens = max(self._max_tokens, len(_TOKEN_RE.findall(w)))
+
+        # caracter escrito -> letras de la lista que puede representar
+        self._variants = {}
+        for letter, subs in char_map.items():
+            for s in subs:
+                self._variants.setdefault(s, {s}).add(letter)
+
+        # DFA perezoso: cada estado es un conjunto de nodos del trie
+        self._lock = threading.Lock()
+        self._state_ids = {}
+        self._state_nodes = []
+        self._accepting = []
+        self._delta = []
+        self._start = self._intern(frozenset([0]))
+        self._dead = self._intern(frozenset())
+
+    # ---- DFA ----
+    def _intern(self, nodes):
+        sid = self._state_ids.get(nodes)
+        if sid is None:
+            sid = len(self._state_nodes)
+            self._state_nodes.append(nodes)
+            self._accepting.append(any(self._terminal[n] for n in nodes))
+            self._delta.append({})
+            self._state_ids[nodes] = sid
+        return sid
+
+    def _step_slow(self, state, ch):
+        nodes = self._state_nodes[state]
+        for low in ch.lower():
+            nxt = set()
+            for n in nodes:
+                children = self._children[n]
+                for c in self._variants.get(low, (low,)):
+                    t = children.get(c)
+                    if t is not None:
+                        nxt.add(t)
+            nodes = nxt
+        with self._lock:
+            sid = self._intern(frozenset(nodes))
+            self._delta[state][ch] = sid
+        return sid
+
+    def _walk(self, state, text, start, end):
+        delta, dead = self._delta, self._dead
+        for k in range(start, end):
+            ch = text[k]
+            nxt = delta[state].get(ch)
+            if nxt is None:
+                nxt = self._step_slow(state, ch)
+            if nxt == dead:
+                return dead
+            state = nxt
+        return state
+
+    def _match(self, text, spans, i):
+        """Índice del último token de la coincidencia más larga que arranca en spans[i], o None."""
+        best = None
+        state = self._start
+        j = i
+        while True:
+            state = self._walk(state, text, spans[j][0], spans[j][1])
+            if state == self._dead:
+                return best
+            if self._accepting[state]:
+                best = j
+            j += 1
+            if j >= len(spans) or j - i >= self._max_tokens:
+                return best
+            # Sigue solo si la lista tiene una frase con ese mismo separador ("bull shit",
+            # "f.u.c.k"). Nunca pegando palabras sueltas: "7 1 7" o "a s s" no son "tit" ni "ass".
+            state = self._walk(state, text, spans[j - 1][1], spans[j][0])
+            if state == self._dead:
+                return best
+
+    # ---- API ----
+    def censor(self, text, censor_char="*"):
+        if not isinstance(text, str):
+            text = str(text)
+        spans = [m.span() for m in _TOKEN_RE.finditer(text)]
+        out = []
+        last = 0
+        i = 0
+        while i < len(spans):
+            end = self._match(text, spans, i)
+            if end is None:
+                i += 1
+                continue
+            out.append(text[last:spans[i][0]])
+            out.append(censor_char * 4)
+            last = spans[end][1]
+            i = end + 1
+        if not out:
+            return text
+        out.append(text[last:])
+        return "".join(out)
+
+    def contains_profanity(self, text):
+        return self.censor(text) != text
+
+
+_engine = None
+
+
+def default_words():
+    words = list(read_wordlist(get_complete_path_of_file("profanity_wordlist.txt")))
+    return words + SPANISH_BAD_WORDS
+
+
+def get_engine() -> CensorEngine:
+    global _engine
+    if _engine is None:
+        _engine = CensorEngine(default_words())
+    return _engine
+
+
+def censor_text(text) -> str:
+    """Texto de un comentario listo para mostrar (sin espacios sobrantes y censurado)."""
+    return get_engine().censor((text or "").strip())
+
+
+def wordlist_version() -> str:
+    """
+    Huella corta de la lista de palabras. Se guarda con cada comentario
+    censurado para saber qué filas hay que re-censurar cuando la lista cambia.
+    """
+    return get_engine().version
+
+
+def recensor_items(queryset, batch_size=500, force=False) -> int:
+    """
+    Recalcula comentario_censurado de los items del queryset cuya versión no
+    coincide con la lista actual (o de todos con force=True). Devuelve cuántos actualizó.
+    Si cambió alguno, invalida los ETags de los perfiles (scope COMENTARIOS).
+    """
+    version = wordlist_version()
+    if not force:
+        queryset = queryset.exclude(censura_version=version)
+
+    # De a páginas por pk, actualizando cada una antes de pedir la siguiente: no queda un
+    # cursor abierto sobre la tabla mientras se escribe en ella
+    queryset = queryset.only("id", "comentario").order_by("id")
+    total = 0
+    last = None
+    while True:
+        page = queryset if last is None else queryset.filter(pk__gt=last)
+        batch = list(page[:batch_size])
+        if not batch:
+            break
+        for it in batch:
+            it.comentario_censurado = censor_text(it.comentario)
+            it.censura_version = version
+        queryset.model.objects.bulk_update(batch, ["comentario_censurado", "censura_version"])
+        total += len(batch)
+        if len(batch) < batch_size:
+            break
+        last = batch[-1].pk
+    if total:
+        catalog_cache.bump(catalog_cache.COMENTARIOS)
+    return total
@@ -0,0 +1,78 @@
+# academics/conditional.py
+# GET condicional (ETag) para los perfiles públicos de materia, comisión y profesor.
+# El validador sale de una sola consulta agregada sobre las reseñas de la entidad + las
+# versiones del catálogo (academics/catalog_cache.py), así que un 304 no arma el
+# contexto ni renderiza. Sin Last-Modified: las bajas y la re-censura no dejan una fecha
+# más nueva en las reseñas, pero sí cambian la etiqueta (cantidad y scope COMENTARIOS).
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+
+from academics import catalog_cache
+
+
+def _shared_max_age():
+    return getattr(settings, "PROFILE_CACHE_S_MAXAGE", 60)
+
+
+def profile_validators(request, items_qs, scopes):
+    """
+    ETag de un perfil:
+    - items_qs: ResenaItem que se muestran (última alta/edición y cantidad, por las bajas)
+    - scopes: del catálogo de los que dependen nombres, comisiones y profesores
+      (COMENTARIOS, el texto censurado, va siempre)
+    """
+    agg = items_qs.aggregate(
+        creado=Max("created_at"), editado=Max("resena__updated_at"), n=Count("id")
+    )
+    versions = catalog_cache.versions([*scopes, catalog_cache.COMENTARIOS])
+
+    # El navbar cambia según quién mira: en la etiqueta va el usuario logueado
+    user = request.user
+    viewer = f"{user.pk}:{user.rol}:{user.imagen_perfil.name}" if user.is_authenticated else "anon"
+    raw = "|".join([
+        request.get_full_path(),  # order (y cursor)
+        viewer,
+        str(agg["n"]),
+        str(agg["creado"]),
+        str(agg["editado"]),
+        *(str(v) for v in versions),
+    ])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def conditional_profile(get_parts):
+    """
+    Decorador para vistas de perfil. get_parts(*args, **kwargs) de la vista devuelve
+    (items_qs, scopes). Si el cliente (o un proxy) ya tiene la versión actual responde
+    304 sin ejecutar la vista.
+    """
+    def decorator(view):
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view(request, *args, **kwargs)
+
+            etag = quote_etag(profile_validators(request, *get_parts(*args, **kwargs)))
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = view(request, *args, **kwargs)
+            if response.status_code not in (200, 304):
+                return response
+
+            response.headers.setdefault("ETag", etag)
+            if request.user.is_authenticated:
+                # el HTML incluye el navbar del usuario: solo el navegador lo guarda
+                patch_cache_control(response, private=True, no_cache=True)
+            else:
+                patch_cache_control(
+                    response, public=True, max_age=0, s_maxage=_shared_max_age(),
+                    must_revalidate=True,
+                )
+            return response
+        return inner
+    return decorator
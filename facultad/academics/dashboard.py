@@ -0,0 +1,115 @@
+# academics/dashboard.py
+# Datos del dashboard del alumno (people:perfil). Cantidad fija de consultas sin importar
+# cuántas notas o reseñas tenga el alumno:
+#   1. snapshot de avance (ProgresoAlumno: notas por estado, promedio, cobertura del plan)
+#   2. cursadas para evaluar (y si la reseña quedó en la cola write-behind)
+#   3. items de sus reseñas (con todo lo que se muestra en un solo select_related)
+# Sin contar sesión/usuario del request, con el snapshot al día (si falta o quedó viejo se
+# recalcula una vez). Lo controla DashboardQueryBudgetTests (academics/tests.py).
+from django.db.models import Exists, OuterRef
+
+from academics.models import MateriaComisionAnio, Nota, ResenaItem, ResenaPendiente
+from academics.progress import get_progress
+
+QUERY_BUDGET = 3
+
+
+def donut(snap) -> dict:
+    """Conteos del donut (cursando / promocionada / aprobada / pendientes) desde el snapshot."""
+    pendientes = max(snap.plan_total - snap.plan_tocadas, 0)
+    counts = {
+        "Cursando": snap.cursando,
+        "Promocionada": snap.promocionada,
+        "Aprobada": snap.aprobada,
+        "Pendientes": pendientes if snap.plan_total else 0,
+    }
+    total = sum(counts.values()) or 1
+    return {
+        "counts": counts,
+        "pct": {k: round(v * 100 / total, 2) for k, v in counts.items()},
+        "total": total,
+    }
+
+
+def mcas_para_evaluar(alumno_id):
+    """
+    Cursadas aprobadas/promocionadas que el alumno todavía no reseñó (una consulta).
+    pendiente=True si su reseña está en la cola write-behind esperando publicarse.
+    """
+    return list(
+        MateriaComisionAnio.objects
+        .filter(
+            notas__alumno_id=alumno_id,
+            notas__estado__in=[Nota.Estado.APROBADA, Nota.Estado.PROMOCIONADA],
+        )
+        .exclude(resenas__alumno_id=alumno_id)
+        .annotate(pendiente=Exists(ResenaPendiente.objects.filter(
+            alumno_id=alumno_id, mca=OuterRef("pk"),
+        ).exclude(estado=ResenaPendiente.Estado.ERROR)))
+        .select_related("materia", "comision")
+        .order_by("materia__nombre", "comision__nombre", "-anio")
+        .distinct()
+    )
+
+
+def _comentario(it) -> dict:
+    mca = it.resena.mca
+    com = mca.comision.nombre if mca.comision else "—"
+    base = {
+        "fecha": it.resena.created_at,
+        "puntuacion": it.puntuacion,
+        "comentario": it.comentario_censurado,
+        "mca_id": mca.id,
+    }
+    if it.target_type == ResenaItem.Target.MATERIA:
+        return {**base, "tipo": "Materia", "badge": "materia",
+                "title": mca.materia.nombre, "subtitle": f"Año {mca.anio}"}
+    if it.target_type == ResenaItem.Target.COMISION:
+        return {**base, "tipo": "Comisión", "badge": "comision",
+                "title": f"{mca.materia.nombre} — {com}", "subtitle": f"Año {mca.anio}"}
+    rol = "Titular" if it.target_type == ResenaItem.Target.TITULAR else "JTP"
+    prof = it.titular or it.jtp
+    nombre = (prof.get_full_name() or prof.username) if prof else "—"
+    return {**base, "tipo": f"Profesor · {rol}", "badge": "profesor",
+            "title": nombre, "subtitle": f"{mca.materia.nombre} — {com} · Año {mca.anio}"}
+
+
+def comentarios(alumno_id, orden="desc") -> list[dict]:
+    """Items de las reseñas del alumno, listos para el template (una consulta)."""
+    order_by = ("-" if orden == "desc" else "") + "resena__created_at"
+    items = (
+        ResenaItem.objects
+        .filter(resena__alumno_id=alumno_id)
+        .select_related(
+            "resena__mca__materia", "resena__mca__comision", "titular", "jtp",
+        )
+        .order_by(order_by, "id")
+    )
+    return [_comentario(it) for it in items]
+
+
+def dashboard_context(user, orden="desc") -> dict:
+    """Todo lo que muestra people/perfil_usuario.html, con QUERY_BUDGET consultas."""
+    snap = get_progress(user)
+    por_estado = {
+        Nota.Estado.CURSANDO: snap.cursando,
+        Nota.Estado.PROMOCIONADA: snap.promocionada,
+        Nota.Estado.APROBADA: snap.aprobada,
+    }
+    pct = {e: round(100 * c / (snap.total_notas or 1), 2) for e, c in por_estado.items() if c}
+    d = donut(snap)
+    items = comentarios(user.id, orden)
+    return {
+        "promedio": snap.promedio,
+        "pct": pct,
+        "mcas_para_evaluar": mcas_para_evaluar(user.id),
+        "comentarios_todos": items,
+        "comentarios_total": len(items),
+        "orden": orden,
+
+        # donut
+        "donut_counts": d["counts"],
+        "donut_pct": d["pct"],
+        "donut_total": d["total"],
+        "dashboard_carrera": snap.carrera or "Plan",
+    }
@@ -0,0 +1,117 @@
+# academics/exports.py
+# Exportación de reseñas (ResenaItem) y notas para análisis, en CSV o NDJSON (una fila JSON
+# por línea). Se lee con .values_list().iterator(chunk_size) y se escribe fila a fila, así
+# que la memoria no depende del tamaño de la tabla. Lo usan las vistas de export (solo
+# admins, StreamingHttpResponse) y manage.py export_data.
+import csv
+import json
+
+from django.conf import settings
+
+from academics.models import Nota, ResenaItem
+
+# Una celda de texto que empieza así la toma como fórmula Excel/LibreOffice (=HYPERLINK(...))
+_FORMULA_CHARS = ("=", "+", "-", "@", "\t", "\r")
+
+FORMATOS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _profesor(r):
+    # solo los items TITULAR/JTP tienen profesor
+    pk, first, last, username = r
+    nombre = f"{first or ''} {last or ''}".strip() or username
+    return [pk, nombre if pk else None]
+
+
+# dataset -> (modelo, campos del values_list, columnas de salida, armado de la fila)
+DATASETS = {
+    "resenas": (
+        ResenaItem,
+        [
+            "id", "resena_id", "created_at", "resena__updated_at", "target_type", "puntuacion",
+            "comentario_censurado", "resena__mca_id", "resena__mca__anio",
+            "resena__mca__materia_id", "resena__mca__materia__nombre",
+            "resena__mca__materia__departamento__nombre",
+            "resena__mca__comision_id", "resena__mca__comision__nombre",
+            "titular_id", "titular__first_name", "titular__last_name", "titular__username",
+            "jtp_id", "jtp__first_name", "jtp__last_name", "jtp__username",
+        ],
+        [
+            "item_id", "resena_id", "created_at", "updated_at", "tipo", "puntuacion", "comentario",
+            "mca_id", "anio", "materia_id", "materia", "departamento", "comision_id", "comision",
+            "profesor_id", "profesor",
+        ],
+        lambda r: list(r[:14]) + (_profesor(r[14:18]) if r[14] else _profesor(r[18:22])),
+    ),
+    "notas": (
+        Nota,
+        [
+            "id", "alumno_id", "created_at", "estado", "nota", "mca_id", "mca__anio",
+            "mca__materia_id", "mca__materia__nombre", "mca__materia__departamento__nombre",
+            "mca__comision_id", "mca__comision__nombre",
+        ],
+        [
+            "nota_id", "alumno_id", "created_at", "estado", "nota", "mca_id", "anio",
+            "materia_id", "materia", "departamento", "comision_id", "comision",
+        ],
+        list,
+    ),
+}
+
+
+def chunk_size() -> int:
+    return getattr(settings, "EXPORT_CHUNK_SIZE", 2000)
+
+
+def queryset(dataset, desde=None, hasta=None, anio=None, departamento=None):
+    """values_list del dataset con los filtros opcionales (fechas inclusivas, por created_at)."""
+    model, fields, _, _ = DATASETS[dataset]
+    mca = "resena__mca" if model is ResenaItem else "mca"
+    qs = model.objects.all()
+    if desde:
+        qs = qs.filter(created_at__date__gte=desde)
+    if hasta:
+        qs = qs.filter(created_at__date__lte=hasta)
+    if anio:
+        qs = qs.filter(**{f"{mca}__anio": anio})
+    if departamento:
+        qs = qs.filter(**{f"{mca}__materia__departamento_id": departamento})
+    return qs.order_by("id").values_list(*fields)
+
+
+class _Echo:
+    """Pseudo-archivo para csv.writer: devuelve la línea en vez de escribirla."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_cell(value):
+    # comentarios y nombres los escribe cualquiera: con ' adelante la planilla los muestra como texto
+    if isinstance(value, str) and value.startswith(_FORMULA_CHARS):
+        return "'" + value
+    return value
+
+
+def _csv_lines(columns, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([_csv_cell(v) for v in row])
+
+
+def _ndjson_lines(columns, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(columns, row)), default=str, ensure_ascii=False) + "\n"
+
+
+def stream(dataset, fmt, **filters):
+    """Generador de líneas (str) del export; la consulta corre recién al iterarlo."""
+    _, _, columns, build = DATASETS[dataset]
+    rows = (build(r) for r in queryset(dataset, **filters).iterator(chunk_size=chunk_size()))
+    if fmt == "csv":
+        return _csv_lines(columns, rows)
+    return _ndjson_lines(columns, rows)
@@ -0,0 +1,95 @@
+# academics/idempotency.py
+# Claves de idempotencia para los forms que crean cosas (evaluar_mca). El form lleva una
+# clave nueva en cada GET; el primer POST con esa clave la reserva en el cache (cache.add)
+# y al terminar guarda a dónde redirigió y con qué mensaje. Un POST repetido (doble click,
+# reenvío del navegador) devuelve esa misma respuesta sin tocar la base.
+# Con CACHE_URL=locmem cada worker tiene su cache: ahí la constraint única de la base
+# sigue siendo el respaldo.
+import re
+import time
+import uuid
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import caches
+from django.shortcuts import redirect
+
+FIELD = "idempotency_key"
+
+_PENDING = "pending"
+_KEY_RE = re.compile(r"^[0-9a-f]{32}$")
+
+
+def _cache():
+    return caches[getattr(settings, "IDEMPOTENCY_CACHE_ALIAS", "default")]
+
+
+def _ttl():
+    return getattr(settings, "IDEMPOTENCY_TTL", 60 * 30)
+
+
+def new_key() -> str:
+    return uuid.uuid4().hex
+
+
+def _cache_key(request, scope):
+    if request.method != "POST" or not request.user.is_authenticated:
+        return None
+    key = request.POST.get(FIELD) or ""
+    if not _KEY_RE.match(key):
+        return None  # form viejo o clave inventada: sin idempotencia
+    # por usuario: la clave de otro no sirve para ver su respuesta
+    return f"idem:{scope}:{request.user.pk}:{key}"
+
+
+def begin(request, scope, wait_timeout=5.0, poll_interval=0.05):
+    """
+    Llamar al principio del POST. None -> es el primer envío con esa clave (o no trae
+    clave) y la vista sigue normalmente; si no, la respuesta a devolver: la del primer
+    envío, o un aviso si todavía se está procesando pasado wait_timeout.
+    """
+    key = _cache_key(request, scope)
+    if key is None:
+        return None
+    cache = _cache()
+    # la reserva vence rápido por si el request se cae sin llegar a finish()
+    if cache.add(key, _PENDING, getattr(settings, "IDEMPOTENCY_PENDING_TTL", 30)):
+        return None
+
+    deadline = time.monotonic() + wait_timeout
+    stored = cache.get(key)
+    while stored == _PENDING and time.monotonic() < deadline:
+        time.sleep(poll_interval)
+        stored = cache.get(key)
+
+    if isinstance(stored, dict):
+        if stored.get("text"):
+            messages.add_message(request, stored["level"], stored["text"])
+        return redirect(stored["location"])
+    if stored is None:
+        # la reserva venció sin respuesta (el primero se cayó): se procesa de nuevo
+        return None
+    messages.info(request, "Tu envío anterior todavía se está procesando.")
+    return redirect("people:perfil")
+
+
+def finish(request, scope, response, level=None, text=None):
+    """
+    Guarda la respuesta del primer envío (solo redirects; cualquier otra cosa libera la
+    clave para que se pueda reintentar). Devuelve response.
+    """
+    key = _cache_key(request, scope)
+    if key is None:
+        return response
+    if 300 <= response.status_code < 400:
+        _cache().set(key, {"location": response["Location"], "level": level, "text": text}, _ttl())
+    else:
+        _cache().delete(key)
+    return response
+
+
+def release(request, scope):
+    """Libera la clave sin guardar respuesta (error o excepción): el reintento se procesa."""
+    key = _cache_key(request, scope)
+    if key is not None:
+        _cache().delete(key)
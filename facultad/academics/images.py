@@ -0,0 +1,145 @@
+# academics/images.py
+# Versiones chicas de las imágenes subidas (Department/Materia/Comision.imagen y
+# User.imagen_perfil) para no mandar el original de varios megapíxeles en cada card.
+# Por cada ancho de IMAGE_DERIVATIVE_WIDTHS menor al original se guarda un WebP y un
+# JPEG al lado del original: "materias/foto.jpg" -> "materias/foto.jpg.w320.webp".
+# Se generan solo al subir la imagen (signals.py, on_commit) o con
+# manage.py build_image_derivatives; el template tag (templatetags/imagenes.py) nada más
+# se fija qué derivados existen y si no hay ninguno usa el original.
+import io
+import logging
+import math
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# extensión -> (formato de Pillow, opciones de save)
+FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+
+def image_fields() -> dict:
+    """Modelo -> nombre del ImageField con derivados."""
+    from django.contrib.auth import get_user_model
+
+    from academics.models import Comision, Department, Materia
+
+    return {Department: "imagen", Materia: "imagen", Comision: "imagen", get_user_model(): "imagen_perfil"}
+
+
+def widths() -> tuple:
+    return tuple(sorted(getattr(settings, "IMAGE_DERIVATIVE_WIDTHS", (160, 320, 640, 1280))))
+
+
+def _cache():
+    return caches[getattr(settings, "CATALOG_CACHE_ALIAS", "default")]
+
+
+# lo que existe en disco se recuerda un rato; generate/delete_derivatives lo actualizan
+AVAILABLE_CACHE_TTL = 300
+
+
+def _cache_key(name):
+    return f"img:{name}:{','.join(map(str, widths()))}"
+
+
+def derivative_name(name, width, ext) -> str:
+    return f"{name}.w{width}.{ext}"
+
+
+def _encode(img, fmt, options) -> bytes:
+    if fmt == "JPEG" and img.mode != "RGB":
+        # sin transparencia en JPEG: fondo blanco
+        rgba = img.convert("RGBA")
+        fondo = Image.new("RGB", rgba.size, (255, 255, 255))
+        fondo.paste(rgba, mask=rgba.getchannel("A"))
+        img = fondo
+    elif fmt == "WEBP" and img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA" if "transparency" in img.info or img.mode in ("LA", "PA") else "RGB")
+    buf = io.BytesIO()
+    img.save(buf, fmt, **options)
+    return buf.getvalue()
+
+
+def generate(fieldfile, force=False) -> list[int]:
+    """
+    Genera los derivados que falten (todos con force) de un ImageField/FieldFile.
+    Devuelve los anchos disponibles; [] si no hay imagen, es más chica que el menor
+    ancho o no se puede leer (SVG, archivo roto...).
+    """
+    if not fieldfile:
+        return []
+    storage, name = fieldfile.storage, fieldfile.name
+    try:
+        with storage.open(name, "rb") as fh:
+            img = Image.open(fh)
+            w0, h0 = img.size
+            # orientación EXIF 5-8: la foto se ve girada, ancho y alto invertidos
+            ancho = h0 if img.getexif().get(0x0112, 1) in (5, 6, 7, 8) else w0
+            disponibles = [w for w in widths() if w < ancho]
+            pendientes = [
+                w for w in disponibles
+                if force or not all(storage.exists(derivative_name(name, w, ext)) for ext in FORMATS)
+            ]
+            if pendientes:
+                # JPEG: decodifica directo a una escala reducida (mucho más rápido en fotos grandes)
+                escala = max(pendientes) / ancho
+                img.draft(None, (math.ceil(w0 * escala), math.ceil(h0 * escala)))
+                img = ImageOps.exif_transpose(img)  # copia ya decodificada
+    except (OSError, ValueError, Image.DecompressionBombError) as ex:
+        logger.warning("No se pudieron generar derivados de %s: %s", name, ex)
+        _cache().set(_cache_key(name), [], AVAILABLE_CACHE_TTL)
+        return []
+
+    for w in pendientes:
+        resized = img.resize((w, max(1, round(img.height * w / img.width))), Image.LANCZOS, reducing_gap=3.0)
+        for ext, (fmt, options) in FORMATS.items():
+            target = derivative_name(name, w, ext)
+            if storage.exists(target):
+                storage.delete(target)  # si no, storage.save le cambia el nombre
+            storage.save(target, ContentFile(_encode(resized, fmt, options)))
+
+    _cache().set(_cache_key(name), disponibles, AVAILABLE_CACHE_TTL)
+    return disponibles
+
+
+def available(fieldfile) -> list[int]:
+    """
+    Anchos que ya tienen todos sus derivados en el storage. No genera nada (se llama
+    mientras se renderiza un template): si faltan, quedan afuera del srcset.
+    """
+    if not fieldfile:
+        return []
+    storage, name = fieldfile.storage, fieldfile.name
+    found = _cache().get(_cache_key(name))
+    if found is None:
+        found = [
+            w for w in widths()
+            if all(storage.exists(derivative_name(name, w, ext)) for ext in FORMATS)
+        ]
+        _cache().set(_cache_key(name), found, AVAILABLE_CACHE_TTL)
+    return found
+
+
+def srcset(fieldfile, ext="webp") -> str:
+    """ "url 160w, url 320w, ..." para <img srcset> / <source srcset>; "" si no hay derivados."""
+    storage, name = fieldfile.storage, fieldfile.name
+    return ", ".join(
+        f"{storage.url(derivative_name(name, w, ext))} {w}w" for w in available(fieldfile)
+    )
+
+
+def delete_derivatives(storage, name):
+    """Borra los derivados de name (para cuando se reemplaza o borra el original)."""
+    for w in widths():
+        for ext in FORMATS:
+            target = derivative_name(name, w, ext)
+            if storage.exists(target):
+                storage.delete(target)
+    _cache().delete(_cache_key(name))
@@ -0,0 +1,79 @@
+import random
+import time
+
+from better_profanity import Profanity
+from django.core.management.base import BaseCommand
+
+from academics.censor import CensorEngine, default_words
+
+PALABRAS = (
+    "la materia estuvo muy buena el profe explica bien pero los parciales son "
+    "difíciles recomiendo hacer todos los prácticos la comisión es organizada "
+    "clases teoría práctica consultas horario aula campus apuntes final tp "
+    "excelente regular mala cursada exigente claro ordenado puntual"
+).split()
+
+SUSTITUCIONES = {"a": "4", "e": "3", "i": "1", "o": "0", "s": "$"}
+
+
+def _synthetic_corpus(n, seed, malas):
+    rnd = random.Random(seed)
+    corpus = []
+    for _ in range(n):
+        words = rnd.choices(PALABRAS, k=rnd.randint(5, 40))
+        if rnd.random() < 0.2:
+            mala = rnd.choice(malas)
+            if rnd.random() < 0.3:
+                mala = "".join(SUSTITUCIONES.get(c, c) if rnd.random() < 0.5 else c for c in mala)
+            if rnd.random() < 0.3:
+                mala = mala.capitalize()
+            words.insert(rnd.randrange(len(words) + 1), mala)
+        corpus.append(" ".join(words) + rnd.choice([".", "!", "", "..."]))
+    return corpus
+
+
+def _throughput(fn, corpus):
+    t0 = time.perf_counter()
+    out = fn(corpus)
+    elapsed = time.perf_counter() - t0
+    return out, elapsed, len(corpus) / elapsed if elapsed else float("inf")
+
+
+class Command(BaseCommand):
+    help = "Compara comentarios/segundo del motor de censura contra better_profanity."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=100_000, help="Comentarios del corpus sintético.")
+        parser.add_argument(
+            "--baseline-count", type=int, default=1000,
+            help="Comentarios a pasar por better_profanity (es lento: se mide una muestra y se "
+                 "extrapola al corpus; 0 = todo el corpus).",
+        )
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        words = default_words()
+        malas = [w for w in words if w.isalpha()]
+        corpus = _synthetic_corpus(options["count"], options["seed"], malas)
+        baseline_corpus = corpus[: options["baseline_count"] or len(corpus)]
+
+        t0 = time.perf_counter()
+        engine = CensorEngine(words)
+        build = time.perf_counter() - t0
+        ours, t_ours, cps_ours = _throughput(lambda texts: [engine.censor(t) for t in texts], corpus)
+
+        profanity = Profanity(words)
+        theirs, t_theirs, cps_theirs = _throughput(
+            lambda texts: [profanity.censor(t) for t in texts], baseline_corpus
+        )
+
+        iguales = sum(a == b for a, b in zip(ours, theirs))
+        self.stdout.write(f"Corpus: {len(corpus)} comentarios (better_profanity: {len(baseline_corpus)})")
+        self.stdout.write(f"CensorEngine:     {cps_ours:12,.0f} comentarios/s  ({t_ours:.2f}s, compilación {build:.2f}s)")
+        extra = ""
+        if len(baseline_corpus) < len(corpus):
+            extra = f", ~{len(corpus) / cps_theirs:.0f}s estimado para el corpus"
+        self.stdout.write(f"better_profanity: {cps_theirs:12,.0f} comentarios/s  ({t_theirs:.2f}s{extra})")
+        self.stdout.write(f"Aceleración:      {cps_ours / cps_theirs:12.1f}x")
+        # no tiene que dar 100%: acá no se pegan palabras sueltas ("a s s") como en better_profanity
+        self.stdout.write(f"Misma salida en {iguales}/{len(baseline_corpus)} comentarios")
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from academics import images
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera los derivados WebP/JPEG (academics/images.py) de las imágenes ya subidas "
+        "de departamentos, materias, comisiones y perfiles. Solo los que falten, salvo --force."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Regenera aunque ya existan.")
+        parser.add_argument("--dry-run", action="store_true", help="Solo lista las imágenes.")
+
+    def handle(self, *args, **options):
+        vistos = set()
+        imagenes = sin_derivados = 0
+        for model, field in images.image_fields().items():
+            # varias filas pueden apuntar al mismo archivo: uno por nombre
+            for obj in model.objects.exclude(**{field: ""}).exclude(**{f"{field}__isnull": True}).only("pk", field):
+                fieldfile = getattr(obj, field)
+                if fieldfile.name in vistos:
+                    continue
+                vistos.add(fieldfile.name)
+                imagenes += 1
+                if options["dry_run"]:
+                    self.stdout.write(fieldfile.name)
+                    continue
+                anchos = images.generate(fieldfile, force=options["force"])
+                if not anchos:
+                    sin_derivados += 1
+                if options["verbosity"] >= 2:
+                    self.stdout.write(f"{fieldfile.name}: {', '.join(map(str, anchos)) or 'sin derivados'}")
+
+        if options["dry_run"]:
+            self.stdout.write(f"{imagenes} imágenes (dry-run, no se generó nada).")
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"{imagenes} imágenes procesadas ({sin_derivados} sin derivados: chicas o ilegibles)."
+        ))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from academics import singleflight
+
+
+class Command(BaseCommand):
+    help = "Muestra los contadores del cache de agregados (hits, misses, recálculos...)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Pone los contadores en cero después de mostrarlos.")
+
+    def handle(self, *args, **options):
+        if not singleflight.metrics_enabled():
+            self.stdout.write(self.style.WARNING("SINGLEFLIGHT_METRICS está apagado: los contadores no se actualizan."))
+        stats = singleflight.metrics()
+        for name in singleflight.METRICS:
+            self.stdout.write(f"{name:>13}: {stats[name]}")
+        lecturas = stats["hit"] + stats["miss"] + stats["stale"] + stats["early"]
+        if lecturas:
+            self.stdout.write(f"{'hit ratio':>13}: {stats['hit'] / lecturas:.1%}")
+        if options["reset"]:
+            singleflight.reset_metrics()
+            self.stdout.write(self.style.SUCCESS("Contadores reiniciados."))
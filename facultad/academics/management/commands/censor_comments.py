@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from academics.censor import recensor_items, wordlist_version
+from academics.models import ResenaItem
+
+
+class Command(BaseCommand):
+    help = (
+        "Completa/actualiza ResenaItem.comentario_censurado. Por defecto solo procesa "
+        "los comentarios censurados con otra versión de la lista de palabras."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Re-censura todos los comentarios.")
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        total = recensor_items(
+            ResenaItem.objects.all(),
+            batch_size=options["batch_size"],
+            force=options["all"],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Comentarios censurados: {total} (lista {wordlist_version()})."
+        ))
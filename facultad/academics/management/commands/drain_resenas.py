@@ -0,0 +1,61 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+
+from academics import review_queue
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Pasa las reseñas encoladas (modo RESENAS_WRITE_BEHIND) a Resena/ResenaItem en lotes. "
+        "Con --loop queda corriendo como worker."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=200)
+        parser.add_argument("--max-batches", type=int, help="Corta después de esta cantidad de lotes.")
+        parser.add_argument("--loop", action="store_true", help="No termina: vuelve a mirar la cola cada --sleep segundos.")
+        parser.add_argument("--sleep", type=float, default=2.0)
+        parser.add_argument("--stats", action="store_true", help="Solo muestra la profundidad de la cola y el último drenaje.")
+
+    def handle(self, *args, **options):
+        if options["stats"]:
+            return self._stats()
+
+        while True:
+            try:
+                stats = review_queue.drain(options["batch_size"], options["max_batches"])
+            except Exception:
+                if not options["loop"]:
+                    raise
+                # el worker sigue: las filas del lote fallido vuelven a la cola
+                logger.exception("Falló el drenaje de reseñas; se reintenta en %ss", options["sleep"])
+                time.sleep(options["sleep"])
+                continue
+            if stats["lotes"]:
+                self.stdout.write(self.style.SUCCESS(
+                    f"Publicadas: {stats['publicadas']}, con error: {stats['errores']}, "
+                    f"lotes: {stats['lotes']} en {stats['segundos']:.2f}s "
+                    f"({stats['por_segundo']:,.0f} reseñas/s)"
+                ))
+            elif not options["loop"]:
+                self.stdout.write("La cola está vacía.")
+            if not options["loop"]:
+                break
+            time.sleep(options["sleep"])
+
+    def _stats(self):
+        m = review_queue.metrics()
+        self.stdout.write(f"{'pendientes':>16}: {m['pendientes']}")
+        self.stdout.write(f"{'con error':>16}: {m['errores']}")
+        self.stdout.write(f"{'espera máxima':>16}: {m['espera_max']:.0f}s")
+        self.stdout.write(f"{'publicadas':>16}: {m['publicadas_total']}")
+        ultimo = m["ultimo_drenaje"]
+        if ultimo:
+            self.stdout.write(
+                f"{'último drenaje':>16}: {ultimo['publicadas']} en {ultimo['segundos']:.2f}s "
+                f"({ultimo['por_segundo']:,.0f}/s) — {ultimo['at']}"
+            )
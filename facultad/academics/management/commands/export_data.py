@@ -0,0 +1,56 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from academics import exports
+
+
+def _date(raw):
+    try:
+        d = parse_date(raw)
+    except ValueError:
+        d = None
+    if d is None:
+        raise CommandError(f"Fecha inválida: {raw!r} (usar AAAA-MM-DD)")
+    return d
+
+
+class Command(BaseCommand):
+    help = (
+        "Exporta reseñas (items con cursada, materia, comisión y profesor) o notas en CSV o "
+        "NDJSON, leyendo en chunks para no cargar la tabla en memoria."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=sorted(exports.DATASETS))
+        parser.add_argument("--format", choices=sorted(exports.FORMATOS), default="csv")
+        parser.add_argument("--output", "-o", help="Archivo de salida (por defecto stdout).")
+        parser.add_argument("--desde", type=_date, help="Fecha de alta mínima (AAAA-MM-DD).")
+        parser.add_argument("--hasta", type=_date, help="Fecha de alta máxima (AAAA-MM-DD).")
+        parser.add_argument("--anio", type=int, help="Año de la cursada.")
+        parser.add_argument("--departamento", type=int, help="Id del departamento.")
+
+    def handle(self, *args, **options):
+        t0 = time.perf_counter()
+        lines = exports.stream(
+            options["dataset"], options["format"],
+            desde=options["desde"], hasta=options["hasta"],
+            anio=options["anio"], departamento=options["departamento"],
+        )
+        out = open(options["output"], "w", newline="", encoding="utf-8") if options["output"] else sys.stdout
+        n = 0
+        try:
+            for line in lines:
+                out.write(line)
+                n += 1
+        finally:
+            if options["output"]:
+                out.close()
+
+        if options["output"]:
+            filas = n - 1 if options["format"] == "csv" else n  # sin el encabezado
+            self.stdout.write(self.style.SUCCESS(
+                f"{filas} filas -> {options['output']} en {time.perf_counter() - t0:.2f}s"
+            ))
@@ -0,0 +1,58 @@
+import csv
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from academics.notas_import import ArchivoInvalido, import_notas
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa notas desde un CSV (legajo, materia, comision, anio, estado[, nota]) leyéndolo "
+        "de a una fila y haciendo upsert por (alumno, mca) en lotes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument("--delimiter", default=",")
+        parser.add_argument("--encoding", default="utf-8-sig")
+        parser.add_argument("--rejects", help="CSV donde guardar las filas rechazadas (con el motivo).")
+        parser.add_argument("--dry-run", action="store_true", help="Valida el archivo sin guardar nada.")
+
+    def handle(self, *args, **options):
+        t0 = time.perf_counter()
+        rejects_file = rejects = None
+
+        try:
+            with open(options["path"], newline="", encoding=options["encoding"]) as f:
+                reader = csv.DictReader(f, delimiter=options["delimiter"])
+                if options["rejects"] and reader.fieldnames:
+                    rejects_file = open(options["rejects"], "w", newline="", encoding="utf-8")
+                    rejects = csv.DictWriter(rejects_file, fieldnames=list(reader.fieldnames) + ["motivo"])
+                    rejects.writeheader()
+
+                stats = import_notas(
+                    reader,
+                    batch_size=options["batch_size"],
+                    dry_run=options["dry_run"],
+                    on_reject=(lambda row, motivo: rejects.writerow({**row, "motivo": motivo})) if rejects else None,
+                )
+        except FileNotFoundError:
+            raise CommandError(f"No existe el archivo {options['path']}")
+        except ArchivoInvalido as e:
+            raise CommandError(str(e))
+        finally:
+            if rejects_file:
+                rejects_file.close()
+
+        elapsed = time.perf_counter() - t0
+        for motivo, n in stats["motivos"].most_common():
+            self.stdout.write(self.style.WARNING(f"{n:8d}  {motivo}"))
+        sufijo = " (dry-run, no se guardó nada)" if options["dry_run"] else ""
+        leidas = stats["leidas"]
+        self.stdout.write(self.style.SUCCESS(
+            f"Filas: {leidas}, guardadas: {stats['guardadas']}, repetidas: {stats['repetidas']}, "
+            f"rechazadas: {stats['rechazadas']} "
+            f"en {elapsed:.2f}s ({leidas / elapsed if elapsed else 0:,.0f} filas/s){sufijo}"
+        ))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from academics.plan_import import import_plan
+from academics.plan_loader import get_plan, read_plan_file
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa el plan de estudios (plan.json/csv) a PlanEstudio/PlanItem y vincula cada "
+        "fila con su Materia por nombre (sin tildes ni mayúsculas)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", nargs="?", help="Archivo .json o .csv (por defecto ACADEMICS_PLAN_PATH).")
+        parser.add_argument("--prune", action="store_true", help="Borra los planes de carreras que no están en el archivo.")
+        parser.add_argument("--dry-run", action="store_true", help="Muestra el resultado sin guardar nada.")
+
+    def handle(self, *args, **options):
+        rows = read_plan_file(options["path"]) if options["path"] else get_plan().rows
+        if not rows:
+            raise CommandError("No se encontraron filas de plan para importar.")
+
+        stats = import_plan(rows, prune=options["prune"], dry_run=options["dry_run"])
+
+        for carrera, nombre in stats["sin_materia"]:
+            self.stdout.write(self.style.WARNING(f"Sin materia en la BD: {nombre} ({carrera})"))
+        resumen = (
+            f"Planes: {stats['planes']}, items: {stats['items']}, "
+            f"vinculados: {stats['vinculadas']}, sin materia: {len(stats['sin_materia'])}"
+        )
+        if options["prune"]:
+            resumen += f", borrados: {stats['borrados']}"
+        if options["dry_run"]:
+            resumen += " (dry-run, no se guardó nada)"
+        self.stdout.write(self.style.SUCCESS(resumen))
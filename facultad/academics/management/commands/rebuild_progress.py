@@ -0,0 +1,41 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from academics.progress import refresh_progress
+from people.models import User
+
+
+def _refresh_batch(ids):
+    try:
+        return refresh_progress(ids)
+    finally:
+        # cada thread abre su propia conexión: la cierro al terminar el lote
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = "Recalcula el snapshot de avance (ProgresoAlumno) de todos los alumnos, en paralelo."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        ids = list(User.objects.filter(rol=User.Role.ALUMNO).order_by("id").values_list("id", flat=True))
+        size = options["batch_size"]
+        batches = [ids[i:i + size] for i in range(0, len(ids), size)]
+
+        t0 = time.perf_counter()
+        total = 0
+        with ThreadPoolExecutor(max_workers=options["workers"]) as pool:
+            for future in as_completed([pool.submit(_refresh_batch, b) for b in batches]):
+                total += future.result()
+        elapsed = time.perf_counter() - t0
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Snapshots recalculados: {total} en {elapsed:.2f}s "
+            f"({len(batches)} lotes, {options['workers']} workers)"
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from academics.ratings import rebuild_summaries
+
+
+class Command(BaseCommand):
+    help = "Recalcula la tabla RatingSummary a partir de todos los ResenaItem."
+
+    def handle(self, *args, **options):
+        total = rebuild_summaries()
+        self.stdout.write(self.style.SUCCESS(f"Resúmenes reconstruidos: {total} filas."))
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from academics.rollover import rollover
+
+
+def _equipo(mca) -> str:
+    nombres = [
+        f"{rol}: {p.get_full_name() or p.username}"
+        for rol, p in (("titular", mca.titular), ("jtp", mca.jtp), ("ayudante", mca.ayudante))
+        if p
+    ]
+    return ", ".join(nombres) or "sin docentes"
+
+
+class Command(BaseCommand):
+    help = (
+        "Copia las cursadas (materia-comisión-año) de un año al siguiente con los mismos "
+        "docentes, salteando las que ya existen en el año destino."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("desde", type=int, help="Año origen.")
+        parser.add_argument("--hasta", type=int, help="Año destino (por defecto desde + 1).")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--dry-run", action="store_true", help="Muestra el diff sin guardar nada.")
+
+    def handle(self, *args, **options):
+        desde = options["desde"]
+        hasta = options["hasta"] if options["hasta"] is not None else desde + 1
+        if hasta == desde:
+            raise CommandError("El año destino tiene que ser distinto del origen.")
+
+        res = rollover(desde, hasta, dry_run=options["dry_run"], batch_size=options["batch_size"])
+        if not res["nuevas"] and not res["existentes"]:
+            raise CommandError(f"No hay cursadas en {desde}.")
+
+        for mca in res["nuevas"]:
+            self.stdout.write(f"+ {mca.materia} — {mca.comision} [{hasta}]  ({_equipo(mca)})")
+        if options["verbosity"] > 1:
+            for mca in res["existentes"]:
+                self.stdout.write(f"= {mca.materia} — {mca.comision} [{hasta}] ya existe")
+
+        resumen = (
+            f"{desde} -> {hasta}: nuevas {len(res['nuevas'])}, ya existían {len(res['existentes'])}"
+        )
+        if options["dry_run"]:
+            resumen += f" en {res['segundos']:.2f}s (dry-run, no se guardó nada)"
+        else:
+            resumen += f", creadas {res['creadas']} en {res['segundos']:.2f}s"
+        self.stdout.write(self.style.SUCCESS(resumen))
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:25
+
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+# Copia de academics.ratings.rebuild_summaries de cuando se creó la tabla: la migración
+# no importa código de la app, que puede cambiar después
+ESTRELLAS = [f"estrellas_{i}" for i in range(1, 6)]
+TARGET_FK = {"MATERIA": "materia_id", "COMISION": "comision_id", "TITULAR": "titular_id", "JTP": "jtp_id"}
+
+
+def poblar_resumenes(apps, schema_editor):
+    ResenaItem = apps.get_model("academics", "ResenaItem")
+    RatingSummary = apps.get_model("academics", "RatingSummary")
+
+    stars = {field: Count("id", filter=Q(puntuacion=i)) for i, field in enumerate(ESTRELLAS, start=1)}
+    rows = defaultdict(lambda: {"suma": 0, "cantidad": 0, **{f: 0 for f in ESTRELLAS}})
+    for target_type, fk in TARGET_FK.items():
+        grouped = (
+            ResenaItem.objects
+            .filter(target_type=target_type, **{f"{fk}__isnull": False})
+            .values(fk, "resena__mca_id")
+            .annotate(suma=Sum("puntuacion"), cantidad=Count("id"), **stars)
+            .order_by()
+        )
+        for g in grouped:
+            for mca in (None, g["resena__mca_id"]):
+                acc = rows[(target_type, g[fk], mca)]
+                for k in acc:
+                    acc[k] += g[k]
+
+    RatingSummary.objects.bulk_create(
+        [
+            RatingSummary(target_type=tt, target_id=tid, mca_id=mca, **vals)
+            for (tt, tid, mca), vals in rows.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0007_skip_department_slug'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RatingSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('target_type', models.CharField(choices=[('MATERIA', 'Materia'), ('COMISION', 'Comisión'), ('TITULAR', 'Profesor Titular'), ('JTP', 'Jefe de Trabajos Prácticos')], max_length=16)),
+                ('target_id', models.PositiveBigIntegerField()),
+                ('suma', models.PositiveIntegerField(default=0)),
+                ('cantidad', models.PositiveIntegerField(default=0)),
+                ('estrellas_1', models.PositiveIntegerField(default=0)),
+                ('estrellas_2', models.PositiveIntegerField(default=0)),
+                ('estrellas_3', models.PositiveIntegerField(default=0)),
+                ('estrellas_4', models.PositiveIntegerField(default=0)),
+                ('estrellas_5', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('mca', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='rating_summaries', to='academics.materiacomisionanio')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(condition=models.Q(('mca__isnull', True)), fields=('target_type', 'target_id'), name='uq_rating_summary_total'), models.UniqueConstraint(fields=('target_type', 'target_id', 'mca'), name='uq_rating_summary_mca')],
+            },
+        ),
+        migrations.RunPython(poblar_resumenes, migrations.RunPython.noop),
+    ]
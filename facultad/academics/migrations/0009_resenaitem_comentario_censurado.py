@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:27
+
+from django.db import migrations, models
+
+
+# Lista en castellano de cuando se agregó la columna. La migración no importa
+# academics.censor: censura con better_profanity y deja censura_version vacía, así
+# manage.py censor_comments los vuelve a pasar por el motor actual.
+SPANISH_BAD_WORDS = [
+    "mierda", "boludo", "boludos", "pelotudo", "forro", "concha",
+    "carajo", "puta", "puto", "hdp", "pete", "culiado",
+    "garca", "mogólico", "mogolico", "pelotudez"
+]
+
+
+def censurar_existentes(apps, schema_editor):
+    from better_profanity import Profanity
+    from better_profanity.utils import get_complete_path_of_file, read_wordlist
+
+    ResenaItem = apps.get_model("academics", "ResenaItem")
+    words = list(read_wordlist(get_complete_path_of_file("profanity_wordlist.txt"))) + SPANISH_BAD_WORDS
+    profanity = Profanity(words)
+    batch = []
+    for it in ResenaItem.objects.only("id", "comentario").order_by("id").iterator(chunk_size=500):
+        it.comentario_censurado = profanity.censor((it.comentario or "").strip())
+        batch.append(it)
+        if len(batch) >= 500:
+            ResenaItem.objects.bulk_update(batch, ["comentario_censurado"])
+            batch = []
+    if batch:
+        ResenaItem.objects.bulk_update(batch, ["comentario_censurado"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0008_ratingsummary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resenaitem',
+            name='censura_version',
+            field=models.CharField(blank=True, default='', max_length=16),
+        ),
+        migrations.AddField(
+            model_name='resenaitem',
+            name='comentario_censurado',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.RunPython(censurar_existentes, migrations.RunPython.noop),
+    ]
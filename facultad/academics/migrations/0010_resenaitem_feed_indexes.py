@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0009_resenaitem_comentario_censurado'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='resenaitem',
+            index=models.Index(fields=['materia', 'created_at', 'id'], name='academics_r_materia_b9767b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resenaitem',
+            index=models.Index(fields=['comision', 'created_at', 'id'], name='academics_r_comisio_0261bf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resenaitem',
+            index=models.Index(fields=['titular', 'created_at', 'id'], name='academics_r_titular_77bbf3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resenaitem',
+            index=models.Index(fields=['jtp', 'created_at', 'id'], name='academics_r_jtp_id_c5236c_idx'),
+        ),
+    ]
@@ -0,0 +1,64 @@
+from django.db import migrations
+
+
+# SQL de academics/search.py de cuando se creó el índice, copiado para que la migración
+# no dependa del código de la app. Después, el post_migrate de apps.py recrea los
+# triggers si alguna migración rehace la tabla.
+ITEMS = "academics_resenaitem"
+FTS = f"{ITEMS}_fts"
+
+
+def crear_indice(apps, schema_editor):
+    conn = schema_editor.connection
+    with conn.cursor() as cursor:
+        if conn.vendor == "sqlite":
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS} USING fts5("
+                f"comentario_censurado, content='{ITEMS}', content_rowid='id', "
+                f"tokenize='unicode61 remove_diacritics 2')"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {FTS}_ai AFTER INSERT ON {ITEMS} BEGIN "
+                f"INSERT INTO {FTS}(rowid, comentario_censurado) VALUES (new.id, new.comentario_censurado); END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {FTS}_ad AFTER DELETE ON {ITEMS} BEGIN "
+                f"INSERT INTO {FTS}({FTS}, rowid, comentario_censurado) "
+                f"VALUES ('delete', old.id, old.comentario_censurado); END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {FTS}_au AFTER UPDATE OF comentario_censurado ON {ITEMS} BEGIN "
+                f"INSERT INTO {FTS}({FTS}, rowid, comentario_censurado) "
+                f"VALUES ('delete', old.id, old.comentario_censurado); "
+                f"INSERT INTO {FTS}(rowid, comentario_censurado) VALUES (new.id, new.comentario_censurado); END"
+            )
+            cursor.execute(f"INSERT INTO {FTS}({FTS}) VALUES ('rebuild')")
+        elif conn.vendor == "postgresql":
+            cursor.execute(
+                f"ALTER TABLE {ITEMS} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+                f"GENERATED ALWAYS AS (to_tsvector('spanish', coalesce(comentario_censurado, ''))) STORED"
+            )
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {ITEMS}_search_gin ON {ITEMS} USING GIN (search_vector)")
+
+
+def borrar_indice(apps, schema_editor):
+    conn = schema_editor.connection
+    with conn.cursor() as cursor:
+        if conn.vendor == "sqlite":
+            for suffix in ("ai", "ad", "au"):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {FTS}_{suffix}")
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS}")
+        elif conn.vendor == "postgresql":
+            cursor.execute(f"DROP INDEX IF EXISTS {ITEMS}_search_gin")
+            cursor.execute(f"ALTER TABLE {ITEMS} DROP COLUMN IF EXISTS search_vector")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0010_resenaitem_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice, borrar_indice),
+    ]
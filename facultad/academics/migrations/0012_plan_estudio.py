@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0011_resenaitem_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlanEstudio',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('carrera', models.CharField(max_length=200, unique=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['carrera'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PlanItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=200)),
+                ('nombre_normalizado', models.CharField(max_length=200)),
+                ('anio', models.PositiveSmallIntegerField(default=1)),
+                ('materia', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='plan_items', to='academics.materia')),
+                ('plan', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='academics.planestudio')),
+            ],
+            options={
+                'ordering': ['plan', 'anio', 'nombre'],
+                'indexes': [models.Index(fields=['plan', 'materia'], name='academics_p_plan_id_825403_idx'), models.Index(fields=['nombre_normalizado'], name='academics_p_nombre__160296_idx')],
+                'constraints': [models.UniqueConstraint(fields=('plan', 'nombre_normalizado'), name='uq_plan_item_materia')],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:49
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0012_plan_estudio'),
+        ('people', '0005_user_carrera'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProgresoAlumno',
+            fields=[
+                ('alumno', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='progreso', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('cursando', models.PositiveIntegerField(default=0)),
+                ('promocionada', models.PositiveIntegerField(default=0)),
+                ('aprobada', models.PositiveIntegerField(default=0)),
+                ('total_notas', models.PositiveIntegerField(default=0)),
+                ('materias', models.PositiveIntegerField(default=0)),
+                ('nota_suma', models.DecimalField(decimal_places=1, default=0, max_digits=8)),
+                ('nota_cantidad', models.PositiveIntegerField(default=0)),
+                ('carrera', models.CharField(blank=True, default='', max_length=200)),
+                ('plan_total', models.PositiveIntegerField(default=0)),
+                ('plan_tocadas', models.PositiveIntegerField(default=0)),
+                ('plan_version', models.CharField(blank=True, default='', max_length=16)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0013_progreso_alumno'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResenaPendiente',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('datos', models.JSONField()),
+                ('estado', models.CharField(choices=[('PENDIENTE', 'Pendiente'), ('ERROR', 'Error')], default='PENDIENTE', max_length=16)),
+                ('error', models.CharField(blank=True, default='', max_length=200)),
+                ('intentos', models.PositiveSmallIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('alumno', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resenas_pendientes', to=settings.AUTH_USER_MODEL)),
+                ('mca', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resenas_pendientes', to='academics.materiacomisionanio')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['estado', 'id'], name='academics_r_estado_7acb88_idx')],
+                'constraints': [models.UniqueConstraint(fields=('alumno', 'mca'), name='uq_resena_pendiente_alumno_mca')],
+            },
+        ),
+    ]
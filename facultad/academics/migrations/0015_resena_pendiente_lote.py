@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0014_resena_pendiente'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resenapendiente',
+            name='lote',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='resenapendiente',
+            name='tomada_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='resenapendiente',
+            name='estado',
+            field=models.CharField(choices=[('PENDIENTE', 'Pendiente'), ('PROCESANDO', 'Procesando'), ('ERROR', 'Error')], default='PENDIENTE', max_length=16),
+        ),
+    ]
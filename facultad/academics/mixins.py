@@ -1,6 +1,9 @@
 # academics/mixins.py
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.core.exceptions import PermissionDenied
+from django.template.loader import render_to_string
+
+from academics import catalog_cache
 
 class AdminRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
     login_url = "people:login"
@@ -10,3 +13,36 @@ class AdminRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
         if self.request.user.is_authenticated:
             raise PermissionDenied("No tenés permiso para ver esta página.")
         return super().handle_no_permission()
+
+
+class CatalogCacheMixin:
+    """
+    Para ListViews del catálogo: guarda la grilla de cards ya renderizada (más los
+    pocos datos del encabezado) y en un hit responde sin tocar la base de datos.
+    """
+    grid_template = None
+
+    def catalog_scopes(self) -> list[str]:
+        return [catalog_cache.GLOBAL]
+
+    def catalog_key_parts(self) -> tuple:
+        return ()
+
+    def header_context(self, ctx) -> dict:
+        return {}
+
+    def get(self, request, *args, **kwargs):
+        key = catalog_cache.fragment_key(
+            type(self).__name__, self.catalog_scopes(), self.catalog_key_parts()
+        )
+        entry = catalog_cache.get_fragment(key)
+        self.object_list = None  # en un hit no se arma el queryset
+        if entry is None:
+            self.object_list = self.get_queryset()
+            ctx = self.get_context_data()
+            entry = {
+                "grid_html": render_to_string(self.grid_template, ctx, request=request),
+                **self.header_context(ctx),
+            }
+            catalog_cache.set_fragment(key, entry)
+        return self.render_to_response(entry)
@@ -4,6 +4,9 @@ from django.db import models
 from django.core.exceptions import ValidationError
 from django.db.models import Q
 
+from academics.censor import censor_text, wordlist_version
+from academics.plan_loader import normalize_name
+
 Usuario = settings.AUTH_USER_MODEL
 
 class Department(models.Model):
@@ -113,6 +116,9 @@ class ResenaItem(models.Model):
 
     puntuacion = models.PositiveSmallIntegerField()
     comentario = models.TextField(blank=True)
+    # Versión censurada que se muestra en los perfiles; se calcula al guardar
+    comentario_censurado = models.TextField(blank=True, default="")
+    censura_version = models.CharField(max_length=16, blank=True, default="")
 
     materia = models.ForeignKey(
         "academics.Materia", on_delete=models.CASCADE, null=True, blank=True, related_name="resenas_items"
@@ -176,6 +182,11 @@ class ResenaItem(models.Model):
         ]
         indexes = [
             models.Index(fields=["target_type"]),
+            # Listados de comentarios por cursor (created_at, id) en los perfiles
+            models.Index(fields=["materia", "created_at", "id"]),
+            models.Index(fields=["comision", "created_at", "id"]),
+            models.Index(fields=["titular", "created_at", "id"]),
+            models.Index(fields=["jtp", "created_at", "id"]),
         ]
 
     def __str__(self):
@@ -204,8 +215,14 @@ class ResenaItem(models.Model):
             if self.titular_id is not None:
                 raise ValidationError("En un item JTP, el campo TITULAR debe ser nulo.")
 
+    def censurar(self):
+        """Completa la versión censurada (save() lo hace solo; bulk_create no)."""
+        self.comentario_censurado = censor_text(self.comentario)
+        self.censura_version = wordlist_version()
+
     def save(self, *args, **kwargs):
         self.full_clean()
+        self.censurar()
         return super().save(*args, **kwargs)
     
 class Nota(models.Model):
@@ -238,4 +255,156 @@ class Nota(models.Model):
         # si querés restringir nota/estado juntos:
         if self.estado == self.Estado.APROBADA and self.nota is None:
             # opcional: exigir nota cuando está aprobada
-            pass
\ No newline at end of file
+            pass
+
+class RatingSummary(models.Model):
+    """
+    Agregado de puntuaciones por entidad reseñada. Se mantiene en cada
+    alta/edición/baja de ResenaItem (ver academics/ratings.py) para que las
+    vistas no recorran la tabla de items.
+    mca=None -> total de la entidad en todas las cursadas.
+    """
+    target_type = models.CharField(max_length=16, choices=ResenaItem.Target.choices)
+    target_id = models.PositiveBigIntegerField()
+    mca = models.ForeignKey(
+        "academics.MateriaComisionAnio", on_delete=models.CASCADE, null=True, blank=True,
+        related_name="rating_summaries"
+    )
+
+    suma = models.PositiveIntegerField(default=0)
+    cantidad = models.PositiveIntegerField(default=0)
+    estrellas_1 = models.PositiveIntegerField(default=0)
+    estrellas_2 = models.PositiveIntegerField(default=0)
+    estrellas_3 = models.PositiveIntegerField(default=0)
+    estrellas_4 = models.PositiveIntegerField(default=0)
+    estrellas_5 = models.PositiveIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["target_type", "target_id"],
+                condition=Q(mca__isnull=True),
+                name="uq_rating_summary_total",
+            ),
+            models.UniqueConstraint(
+                fields=["target_type", "target_id", "mca"],
+                name="uq_rating_summary_mca",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.target_type} #{self.target_id} [{self.cantidad}]"
+
+    @property
+    def promedio(self) -> float:
+        return self.suma / self.cantidad if self.cantidad else 0.0
+
+
+class PlanEstudio(models.Model):
+    """Plan de una carrera, importado de plan.json/csv (manage.py import_plan)."""
+    carrera = models.CharField(max_length=200, unique=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["carrera"]
+
+    def __str__(self):
+        return self.carrera
+
+
+class PlanItem(models.Model):
+    plan = models.ForeignKey(PlanEstudio, on_delete=models.CASCADE, related_name="items")
+    # null = la materia del plan todavía no existe en la BD (cuenta igual como pendiente)
+    materia = models.ForeignKey(
+        Materia, on_delete=models.SET_NULL, null=True, blank=True, related_name="plan_items"
+    )
+    nombre = models.CharField(max_length=200)             # tal cual figura en el plan
+    nombre_normalizado = models.CharField(max_length=200)  # sin tildes/mayúsculas, para matchear
+    anio = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        ordering = ["plan", "anio", "nombre"]
+        constraints = [
+            models.UniqueConstraint(fields=["plan", "nombre_normalizado"], name="uq_plan_item_materia"),
+        ]
+        indexes = [
+            models.Index(fields=["plan", "materia"]),
+            models.Index(fields=["nombre_normalizado"]),
+        ]
+
+    def __str__(self):
+        return f"{self.plan} — {self.nombre} ({self.anio}°)"
+
+    def save(self, *args, **kwargs):
+        self.nombre_normalizado = normalize_name(self.nombre)
+        return super().save(*args, **kwargs)
+
+
+class ProgresoAlumno(models.Model):
+    """
+    Snapshot del avance de un alumno para el dashboard: notas por estado, promedio
+    (suma/cantidad) y cobertura del plan de su carrera. Se actualiza cuando cambian
+    sus notas (ver academics/progress.py); manage.py rebuild_progress lo rehace entero.
+    """
+    alumno = models.OneToOneField(Usuario, on_delete=models.CASCADE, primary_key=True, related_name="progreso")
+
+    cursando = models.PositiveIntegerField(default=0)
+    promocionada = models.PositiveIntegerField(default=0)
+    aprobada = models.PositiveIntegerField(default=0)
+    total_notas = models.PositiveIntegerField(default=0)
+    materias = models.PositiveIntegerField(default=0)  # materias distintas con alguna nota
+
+    nota_suma = models.DecimalField(max_digits=8, decimal_places=1, default=0)
+    nota_cantidad = models.PositiveIntegerField(default=0)
+
+    carrera = models.CharField(max_length=200, blank=True, default="")
+    plan_total = models.PositiveIntegerField(default=0)
+    plan_tocadas = models.PositiveIntegerField(default=0)
+    plan_version = models.CharField(max_length=16, blank=True, default="")
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.alumno} — {self.total_notas} notas"
+
+    @property
+    def promedio(self):
+        return self.nota_suma / self.nota_cantidad if self.nota_cantidad else None
+
+
+class ResenaPendiente(models.Model):
+    """
+    Cola de reseñas enviadas en modo write-behind (RESENAS_WRITE_BEHIND): el POST solo
+    inserta acá y manage.py drain_resenas las pasa a Resena/ResenaItem en lotes.
+    Las procesadas se borran; las que no se pudieron publicar quedan con estado ERROR.
+    """
+    class Estado(models.TextChoices):
+        PENDIENTE = "PENDIENTE", "Pendiente"
+        PROCESANDO = "PROCESANDO", "Procesando"
+        ERROR = "ERROR", "Error"
+
+    alumno = models.ForeignKey(Usuario, on_delete=models.CASCADE, related_name="resenas_pendientes")
+    mca = models.ForeignKey("academics.MateriaComisionAnio", on_delete=models.CASCADE, related_name="resenas_pendientes")
+    # lo que vino en el form ({tipo}_score / {tipo}_comment), ya validado al encolar
+    datos = models.JSONField()
+    estado = models.CharField(max_length=16, choices=Estado.choices, default=Estado.PENDIENTE)
+    error = models.CharField(max_length=200, blank=True, default="")
+    intentos = models.PositiveSmallIntegerField(default=0)
+    # worker que la tomó (PROCESANDO) y cuándo; si no termina, otro la vuelve a tomar
+    lote = models.CharField(max_length=32, blank=True, default="")
+    tomada_at = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["alumno", "mca"], name="uq_resena_pendiente_alumno_mca"),
+        ]
+        indexes = [
+            models.Index(fields=["estado", "id"]),
+        ]
+
+    def __str__(self):
+        return f"{self.alumno} — {self.mca} [{self.estado}]"
@@ -0,0 +1,132 @@
+# academics/notas_import.py
+# Importación de notas desde un CSV (manage.py import_notas). Se lee de a una fila, se
+# valida contra dos mapas en memoria (legajo -> alumno y materia/comisión/año -> cursada,
+# una consulta cada uno) y se hace upsert por (alumno, mca) en lotes.
+from collections import Counter
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+
+from academics.models import MateriaComisionAnio, Nota
+from academics.plan_loader import normalize_name
+from academics.progress import notas_bulk_changed
+from people.models import User
+
+COLUMNAS = ("legajo", "materia", "comision", "anio", "estado")
+
+_ESTADOS = {normalize_name(v): v for v in Nota.Estado.values}
+_ESTADOS.update({normalize_name(label): v for v, label in Nota.Estado.choices})
+
+
+class ArchivoInvalido(Exception):
+    """El CSV entero no se puede importar (no es un error de una fila)."""
+
+
+class Rechazo(Exception):
+    pass
+
+
+def _parse_nota(raw):
+    raw = (raw or "").strip().replace(",", ".")
+    if not raw:
+        return None
+    try:
+        nota = Decimal(raw).quantize(Decimal("0.1"))
+    except InvalidOperation:
+        raise Rechazo(f"nota inválida: {raw!r}")
+    if not 0 <= nota <= 10:
+        raise Rechazo(f"nota fuera de rango: {raw}")
+    return nota
+
+
+def _maps():
+    # solo alumnos: un profesor con legajo no puede recibir notas
+    alumnos = dict(
+        User.objects.filter(rol=User.Role.ALUMNO, legajo__isnull=False).values_list("legajo", "id")
+    )
+    mcas = {
+        (normalize_name(materia), normalize_name(comision), anio): pk
+        for pk, materia, comision, anio in MateriaComisionAnio.objects.values_list(
+            "id", "materia__nombre", "comision__nombre", "anio"
+        )
+    }
+    return alumnos, mcas
+
+
+def parse_row(row, alumnos, mcas) -> Nota:
+    """Nota sin guardar para una fila del CSV, o Rechazo con el motivo."""
+    legajo = (row.get("legajo") or "").strip()
+    alumno_id = alumnos.get(legajo)
+    if not alumno_id:
+        raise Rechazo(f"legajo desconocido: {legajo!r}")
+
+    try:
+        anio = int((row.get("anio") or "").strip())
+    except ValueError:
+        raise Rechazo(f"año inválido: {row.get('anio')!r}")
+    key = (normalize_name(row.get("materia")), normalize_name(row.get("comision")), anio)
+    mca_id = mcas.get(key)
+    if not mca_id:
+        raise Rechazo(f"cursada desconocida: {row.get('materia')} / {row.get('comision')} / {anio}")
+
+    estado = _ESTADOS.get(normalize_name(row.get("estado")))
+    if not estado:
+        raise Rechazo(f"estado inválido: {row.get('estado')!r}")
+
+    return Nota(alumno_id=alumno_id, mca_id=mca_id, estado=estado, nota=_parse_nota(row.get("nota")))
+
+
+def _flush(batch, dry_run) -> int:
+    if not batch or dry_run:
+        return len(batch)
+    with transaction.atomic():
+        Nota.objects.bulk_create(
+            list(batch.values()),
+            update_conflicts=True,
+            unique_fields=["alumno", "mca"],
+            update_fields=["estado", "nota"],
+        )
+        # bulk_create no dispara signals: snapshot de avance de esos alumnos
+        notas_bulk_changed({alumno_id for alumno_id, _ in batch})
+    return len(batch)
+
+
+def import_notas(reader, batch_size=2000, dry_run=False, on_reject=None) -> dict:
+    """
+    Importa las filas de un csv.DictReader. on_reject(row, motivo) se llama por cada fila
+    rechazada. Devuelve {"leidas", "guardadas", "repetidas", "rechazadas", "motivos"}.
+    ArchivoInvalido si faltan columnas.
+    """
+    faltan = [c for c in COLUMNAS if c not in (reader.fieldnames or [])]
+    if faltan:
+        raise ArchivoInvalido(f"Faltan columnas en el CSV: {', '.join(faltan)}")
+
+    alumnos, mcas = _maps()
+    leidas = guardadas = 0
+    motivos = Counter()
+    batch = {}
+    for row in reader:
+        leidas += 1
+        try:
+            nota = parse_row(row, alumnos, mcas)
+        except Rechazo as e:
+            motivo = str(e)
+            motivos[motivo.split(":")[0]] += 1
+            if on_reject:
+                on_reject(row, motivo)
+            continue
+        # la misma (alumno, mca) repetida en el archivo: gana la última fila
+        batch[(nota.alumno_id, nota.mca_id)] = nota
+        if len(batch) >= batch_size:
+            guardadas += _flush(batch, dry_run)
+            batch = {}
+    guardadas += _flush(batch, dry_run)
+
+    rechazadas = sum(motivos.values())
+    return {
+        "leidas": leidas,
+        "guardadas": guardadas,
+        "repetidas": leidas - rechazadas - guardadas,  # misma (alumno, mca) dentro de un lote
+        "rechazadas": rechazadas,
+        "motivos": motivos,
+    }
@@ -0,0 +1,84 @@
+# academics/pagination.py
+# Paginación por cursor (created_at, id) para los listados de comentarios.
+# A diferencia de OFFSET, cada página es un rango sobre el índice, sin importar qué tan atrás esté.
+from datetime import datetime, timedelta, timezone as dt_timezone
+from urllib.parse import urlencode
+
+from django.db.models import Q
+from django.shortcuts import render
+from django.utils.timezone import localtime
+
+PAGE_SIZE = 50
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def encode_cursor(item) -> str:
+    micros = (item.created_at - _EPOCH) // timedelta(microseconds=1)
+    return f"{micros}-{item.pk}"
+
+
+def decode_cursor(value):
+    """'<microsegundos>-<id>' -> (datetime, id); None si falta o es inválido."""
+    try:
+        micros, pk = (value or "").split("-")
+        return _EPOCH + timedelta(microseconds=int(micros)), int(pk)
+    except (ValueError, OverflowError):
+        return None
+
+
+def keyset_page(qs, order="desc", cursor=None, size=PAGE_SIZE):
+    """
+    Devuelve (items, next_cursor) ordenando por (created_at, id) en el sentido pedido.
+    next_cursor es None cuando no hay más resultados.
+    """
+    if order == "asc":
+        qs = qs.order_by("created_at", "id")
+    else:
+        qs = qs.order_by("-created_at", "-id")
+
+    after = decode_cursor(cursor)
+    if after:
+        created_at, pk = after
+        if order == "asc":
+            qs = qs.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk))
+        else:
+            qs = qs.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+
+    items = list(qs[: size + 1])
+    if len(items) > size:
+        items = items[:size]
+        return items, encode_cursor(items[-1])
+    return items, None
+
+
+def order_param(request) -> str:
+    """?order=asc|desc de los perfiles (sin distinguir mayúsculas); cualquier otra cosa es desc."""
+    order = (request.GET.get("order") or "desc").lower()
+    return order if order in ("asc", "desc") else "desc"
+
+
+def comment_feed(request, qs, order, more_url, fecha_fmt="%d/%m/%Y"):
+    """
+    Página de comentarios para los perfiles (materia, comisión, profesor).
+    Devuelve (comentarios, url_para_cargar_mas | None).
+    """
+    items, next_cursor = keyset_page(qs, order, request.GET.get("cursor"))
+    comentarios = [
+        {
+            "estrellas": int(it.puntuacion or 0),
+            "texto": it.comentario_censurado,
+            "fecha": localtime(it.created_at).strftime(fecha_fmt),
+        }
+        for it in items
+    ]
+    more = f"{more_url}?{urlencode({'order': order, 'cursor': next_cursor})}" if next_cursor else None
+    return comentarios, more
+
+
+def render_comment_fragment(request, comentarios, more_url):
+    """Respuesta del endpoint "cargar más": solo los comentarios de la página pedida."""
+    return render(
+        request,
+        "academics/Components/comentarios.html",
+        {"comentarios": comentarios, "more_url": more_url, "fragment": True},
+    )
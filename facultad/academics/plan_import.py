@@ -0,0 +1,56 @@
+# academics/plan_import.py
+# Importación del plan de estudios a la BD (manage.py import_plan): cada carrera del archivo
+# pasa a un PlanEstudio con sus PlanItem, vinculados a Materia por nombre normalizado.
+# La lectura del archivo está en plan_loader.py.
+from django.db import transaction
+
+from academics.models import Materia, PlanEstudio, PlanItem, ProgresoAlumno
+from academics.plan_loader import normalize_name
+from academics.progress import refresh_progress
+
+
+def import_plan(rows, prune=False, dry_run=False) -> dict:
+    """
+    Vuelca las filas del plan (ya normalizadas) a PlanEstudio/PlanItem, vinculando cada
+    materia por nombre sin tildes ni mayúsculas. Reemplaza los items de cada carrera del archivo;
+    con prune=True borra además los planes de carreras que ya no figuran.
+    """
+    materias = {normalize_name(nombre): pk for pk, nombre in Materia.objects.values_list("id", "nombre")}
+
+    por_carrera = {}
+    for r in rows:
+        # una materia repetida dentro de la misma carrera se importa una vez (la primera)
+        por_carrera.setdefault(r["carrera"], {}).setdefault(normalize_name(r["materia"]), r)
+
+    stats = {"planes": 0, "items": 0, "vinculadas": 0, "sin_materia": [], "borrados": 0}
+    with transaction.atomic():
+        for carrera, items in por_carrera.items():
+            plan, _ = PlanEstudio.objects.update_or_create(carrera=carrera)
+            PlanItem.objects.filter(plan=plan).delete()
+            nuevos = []
+            for nombre_norm, r in items.items():
+                materia_id = materias.get(nombre_norm)
+                if materia_id:
+                    stats["vinculadas"] += 1
+                else:
+                    stats["sin_materia"].append((carrera, r["materia"]))
+                nuevos.append(PlanItem(
+                    plan=plan, materia_id=materia_id, nombre=r["materia"],
+                    nombre_normalizado=nombre_norm, anio=r["anio"],
+                ))
+            PlanItem.objects.bulk_create(nuevos, batch_size=500)
+            stats["planes"] += 1
+            stats["items"] += len(nuevos)
+        if prune:
+            stats["borrados"], _ = PlanEstudio.objects.exclude(carrera__in=list(por_carrera)).delete()
+        if dry_run:
+            transaction.set_rollback(True)
+
+    if not dry_run:
+        # la cobertura del plan de esos alumnos cambió
+        ids = list(
+            ProgresoAlumno.objects.filter(carrera__in=list(por_carrera)).values_list("alumno_id", flat=True)
+        )
+        for i in range(0, len(ids), 500):
+            refresh_progress(ids[i:i + 500])
+    return stats
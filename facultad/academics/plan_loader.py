@@ -1,8 +1,19 @@
 # academics/plan_loader.py
-import csv, json, os
-from functools import lru_cache
+# Plan de estudios leído de ACADEMICS_PLAN_PATH (json o csv). El archivo se vuelve a leer
+# solo cuando cambia su mtime/tamaño, sin reiniciar workers; cada lectura arma índices
+# (por carrera, por materia, por carrera+año) para no recorrer el plan en cada request.
+import csv, hashlib, json, os, threading, unicodedata
+from collections import Counter
 from django.conf import settings
 
+def normalize_name(s: str) -> str:
+    """Normaliza para comparar: minúsculas, sin tildes, solo alfanum y espacios simples."""
+    if not s:
+        return ""
+    s = unicodedata.normalize("NFKD", s).encode("ascii", "ignore").decode("ascii")
+    s = "".join(ch if ch.isalnum() or ch.isspace() else " " for ch in s.lower())
+    return " ".join(s.split())
+
 def _normalize_rows(rows):
     norm = []
     for i, row in enumerate(rows, start=1):
@@ -24,12 +35,7 @@ def _normalize_rows(rows):
     norm.sort(key=lambda x: (x["carrera"], x["anio"], x["materia"]))
     return tuple(norm)
 
-@lru_cache(maxsize=1)
-def load_plan_rows():
-    path = getattr(settings, "ACADEMICS_PLAN_PATH", None)
-    if not path or not os.path.exists(path):
-        return tuple()
-
+def read_plan_file(path):
     ext = os.path.splitext(path)[1].lower()
     try:
         if ext == ".json":
@@ -46,3 +52,130 @@ def load_plan_rows():
             return tuple()
     except Exception:
         return tuple()
+
+
+class PlanIndex:
+    """Filas del plan + índices precalculados. Inmutable: se reemplaza entero al recargar."""
+
+    def __init__(self, rows):
+        self.rows = tuple(rows)
+        # huella del contenido: los snapshots de progreso la guardan para saber si quedaron viejos
+        self.version = hashlib.sha1(
+            json.dumps(self.rows, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()[:12]
+        by_carrera, by_materia, by_carrera_anio = {}, {}, {}
+        for r in self.rows:
+            by_carrera.setdefault(r["carrera"], []).append(r)
+            by_materia.setdefault(normalize_name(r["materia"]), []).append(r)
+            by_carrera_anio.setdefault((r["carrera"], r["anio"]), []).append(r)
+        self.by_carrera = {k: tuple(v) for k, v in by_carrera.items()}
+        self.by_materia = {k: tuple(v) for k, v in by_materia.items()}
+        self.by_carrera_anio = {k: tuple(v) for k, v in by_carrera_anio.items()}
+        self.counts = {k: len(v) for k, v in self.by_carrera.items()}
+        self.carreras = sorted(self.by_carrera)
+        # carrera -> {materia normalizada: filas}, para cruzar con lo cursado sin recorrer el plan
+        self.materia_counts = {
+            c: Counter(normalize_name(r["materia"]) for r in rs) for c, rs in self.by_carrera.items()
+        }
+        # carrera -> (nombre normalizado, tokens) + índice invertido token -> carreras,
+        # para el matcheo aproximado con lo que cargó el usuario
+        self.carrera_tokens = {}
+        self._token_index = {}
+        for c in self.carreras:
+            n = normalize_name(c)
+            self.carrera_tokens[c] = (n, frozenset(n.split()))
+            for token in self.carrera_tokens[c][1]:
+                self._token_index.setdefault(token, []).append(c)
+        self._matches = {}
+        self.most_common_carrera = (
+            Counter(self.counts).most_common(1)[0][0] if self.counts else None
+        )
+
+    def rows_for(self, carrera, anio=None) -> tuple:
+        if anio is None:
+            return self.by_carrera.get(carrera, ())
+        return self.by_carrera_anio.get((carrera, anio), ())
+
+    def rows_for_materia(self, nombre) -> tuple:
+        return self.by_materia.get(normalize_name(nombre), ())
+
+    def resolve_carrera(self, texto) -> str | None:
+        """
+        Carrera del plan para lo que tiene guardado el usuario: exacta, aproximada, la de
+        ACADEMICS_PLAN_DEFAULT_CARRERA o la más frecuente (en ese orden).
+        """
+        texto = (texto or "").strip()
+        if texto in self.by_carrera:
+            return texto
+        return (
+            self.match_carrera(texto)
+            or getattr(settings, "ACADEMICS_PLAN_DEFAULT_CARRERA", None)
+            or self.most_common_carrera
+        )
+
+    def match_carrera(self, texto) -> str | None:
+        """
+        Carrera del plan que mejor coincide con texto: 10 puntos por token en común y 1 si
+        un nombre contiene al otro. None si nada coincide. El resultado queda memoizado.
+        """
+        texto = normalize_name(texto)
+        if not texto:
+            return None
+        if texto in self._matches:
+            return self._matches[texto]
+
+        scores = Counter()
+        for token in set(texto.split()):
+            for c in self._token_index.get(token, ()):
+                scores[c] += 10
+        for c, (n, _) in self.carrera_tokens.items():
+            if texto in n or n in texto:
+                scores[c] += 1
+        # a igual puntaje gana la primera en orden alfabético (como el max() de antes)
+        best = max(self.carreras, key=scores.__getitem__) if scores else None
+
+        if len(self._matches) >= 1024:
+            self._matches.clear()
+        self._matches[texto] = best
+        return best
+
+
+class PlanRepository:
+    """Recarga el plan cuando cambia el archivo (mtime + tamaño); una consulta = un stat()."""
+
+    def __init__(self, path=None):
+        self._path = path
+        self._lock = threading.Lock()
+        self._signature = None
+        self._index = PlanIndex(())
+
+    @property
+    def path(self):
+        return self._path or getattr(settings, "ACADEMICS_PLAN_PATH", None)
+
+    def _stat(self, path):
+        try:
+            st = os.stat(path)
+        except (OSError, TypeError):
+            return None
+        return (str(path), st.st_mtime_ns, st.st_size)
+
+    def get(self) -> PlanIndex:
+        path = self.path
+        signature = self._stat(path) if path else None
+        if signature == self._signature:
+            return self._index
+        with self._lock:
+            if signature != self._signature:
+                self._index = PlanIndex(read_plan_file(path) if signature else ())
+                self._signature = signature
+            return self._index
+
+
+_repository = PlanRepository()
+
+def get_plan() -> PlanIndex:
+    return _repository.get()
+
+def load_plan_rows():
+    return get_plan().rows
@@ -0,0 +1,230 @@
+# academics/progress.py
+# Snapshot de avance por alumno (ProgresoAlumno).
+# - signals de Nota (save/delete) -> nota_changed: aplica solo la diferencia entre la nota
+#   vieja y la nueva con UPDATEs F(), en la misma transacción
+# - imports masivos (bulk_create/update no disparan signals) -> notas_bulk_changed, que
+#   recalcula entero a esos alumnos al confirmar
+# - manage.py rebuild_progress -> todos, en paralelo
+import threading
+from collections import Counter, defaultdict
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Greatest, Least
+
+from academics.models import MateriaComisionAnio, Nota, PlanItem, ProgresoAlumno
+from academics.plan_loader import get_plan, normalize_name
+
+_ESTADOS = {
+    Nota.Estado.CURSANDO: "cursando",
+    Nota.Estado.PROMOCIONADA: "promocionada",
+    Nota.Estado.APROBADA: "aprobada",
+}
+
+_FIELDS = [
+    "cursando", "promocionada", "aprobada", "total_notas", "materias",
+    "nota_suma", "nota_cantidad", "carrera", "plan_total", "plan_tocadas", "plan_version",
+]
+
+
+def _plan_coverage(ids_by_carrera, plan):
+    """{alumno_id: (plan_total, plan_tocadas)}: una consulta por carrera."""
+    coverage = {}
+    imported = {
+        row["plan__carrera"]: row["n"]
+        for row in PlanItem.objects.filter(plan__carrera__in=list(ids_by_carrera))
+        .values("plan__carrera").annotate(n=Count("id")).order_by()
+    }
+    for carrera, ids in ids_by_carrera.items():
+        if carrera in imported:
+            # plan en la BD: materias del plan con alguna nota del alumno
+            tocadas = dict(
+                Nota.objects.filter(
+                    alumno_id__in=ids,
+                    mca__materia_id__in=PlanItem.objects.filter(plan__carrera=carrera).values("materia_id"),
+                )
+                .values("alumno_id").annotate(n=Count("mca__materia", distinct=True))
+                .values_list("alumno_id", "n").order_by()
+            )
+            total = imported[carrera]
+        else:
+            # solo el archivo: cruzo por nombre normalizado
+            en_plan = plan.materia_counts.get(carrera, {})
+            tocadas = {}
+            for alumno_id, nombre in (
+                Nota.objects.filter(alumno_id__in=ids)
+                .values_list("alumno_id", "mca__materia__nombre").distinct()
+            ):
+                tocadas[alumno_id] = tocadas.get(alumno_id, 0) + en_plan.get(normalize_name(nombre), 0)
+            total = len(plan.rows_for(carrera))
+        for alumno_id in ids:
+            coverage[alumno_id] = (total, min(tocadas.get(alumno_id, 0), total))
+    return coverage
+
+
+def refresh_progress(alumno_ids) -> int:
+    """Recalcula y guarda el snapshot de esos alumnos (upsert en lote). Devuelve cuántos."""
+    alumno_ids = {a for a in alumno_ids if a}
+    if not alumno_ids:
+        return 0
+
+    stats = {
+        row["alumno_id"]: row
+        for row in Nota.objects.filter(alumno_id__in=alumno_ids)
+        .values("alumno_id")
+        .annotate(
+            total_notas=Count("id"),
+            materias=Count("mca__materia", distinct=True),
+            nota_suma=Sum("nota"),
+            nota_cantidad=Count("nota"),
+            **{alias: Count("id", filter=Q(estado=estado)) for estado, alias in _ESTADOS.items()},
+        )
+        .order_by()
+    }
+
+    plan = get_plan()
+    carreras = dict(
+        get_user_model().objects.filter(pk__in=alumno_ids).values_list("pk", "carrera")
+    )
+    ids_by_carrera = {}
+    for alumno_id in alumno_ids:
+        if alumno_id not in carreras:
+            continue  # usuario borrado
+        carrera = plan.resolve_carrera(carreras[alumno_id]) if plan.carreras else None
+        ids_by_carrera.setdefault(carrera, []).append(alumno_id)
+    coverage = _plan_coverage({c: ids for c, ids in ids_by_carrera.items() if c}, plan)
+
+    rows = []
+    for carrera, ids in ids_by_carrera.items():
+        for alumno_id in ids:
+            s = stats.get(alumno_id, {})
+            plan_total, plan_tocadas = coverage.get(alumno_id, (0, 0))
+            rows.append(ProgresoAlumno(
+                alumno_id=alumno_id,
+                cursando=s.get("cursando", 0),
+                promocionada=s.get("promocionada", 0),
+                aprobada=s.get("aprobada", 0),
+                total_notas=s.get("total_notas", 0),
+                materias=s.get("materias", 0),
+                nota_suma=s.get("nota_suma") or 0,
+                nota_cantidad=s.get("nota_cantidad", 0),
+                carrera=carrera or "",
+                plan_total=plan_total,
+                plan_tocadas=plan_tocadas,
+                plan_version=plan.version,
+            ))
+    ProgresoAlumno.objects.bulk_create(
+        rows, batch_size=500,
+        update_conflicts=True, unique_fields=["alumno"], update_fields=_FIELDS + ["updated_at"],
+    )
+    return len(rows)
+
+
+def get_progress(user) -> ProgresoAlumno:
+    """Snapshot del alumno; lo (re)calcula si falta o si cambió el plan o su carrera."""
+    snap = ProgresoAlumno.objects.filter(alumno_id=user.pk).first()
+    plan = get_plan()
+    carrera = (plan.resolve_carrera(user.carrera) if plan.carreras else None) or ""
+    if snap is None or snap.plan_version != plan.version or snap.carrera != carrera:
+        refresh_progress([user.pk])
+        snap = ProgresoAlumno.objects.get(alumno_id=user.pk)
+    return snap
+
+
+def _plan_weight(carrera, materia_id, nombre) -> int:
+    # cuánto suma la materia a plan_tocadas, igual que _plan_coverage
+    if not carrera:
+        return 0
+    plan = PlanItem.objects.filter(plan__carrera=carrera).aggregate(
+        total=Count("id"), match=Count("materia", distinct=True, filter=Q(materia_id=materia_id)),
+    )
+    if plan["total"]:
+        return plan["match"]
+    return get_plan().materia_counts.get(carrera, {}).get(normalize_name(nombre), 0)
+
+
+def nota_changed(pk, old, new):
+    """
+    Aplica al snapshot el cambio de una nota: old/new son {"alumno_id", "mca_id", "estado",
+    "nota"} antes y después (None si se creó o se borró). Llamar después de guardar/borrar.
+    Los alumnos sin snapshot se saltean: get_progress lo arma entero cuando haga falta.
+    """
+    deltas = defaultdict(Counter)
+    for nota, sign in ((old, -1), (new, 1)):
+        if not nota or not nota["alumno_id"]:
+            continue
+        d = deltas[nota["alumno_id"]]
+        d["total_notas"] += sign
+        if nota["estado"] in _ESTADOS:
+            d[_ESTADOS[nota["estado"]]] += sign
+        if nota["nota"] is not None:
+            d["nota_suma"] += sign * Decimal(str(nota["nota"]))
+            d["nota_cantidad"] += sign
+
+    # materias y plan_tocadas solo cambian si el alumno pasa a tener (o deja de tener)
+    # alguna nota en la materia
+    tocadas = {}
+    notas = [n for n in (old, new) if n and n["alumno_id"]]
+    materias = {}
+    if old is None or new is None or (old["alumno_id"], old["mca_id"]) != (new["alumno_id"], new["mca_id"]):
+        materias = {
+            mca_id: (materia_id, nombre)
+            for mca_id, materia_id, nombre in MateriaComisionAnio.objects
+            .filter(pk__in=[n["mca_id"] for n in notas])
+            .values_list("id", "materia_id", "materia__nombre")
+        }
+    antes = (old["alumno_id"], materias.get(old["mca_id"])) if old and old["alumno_id"] else None
+    despues = (new["alumno_id"], materias.get(new["mca_id"])) if new and new["alumno_id"] else None
+    for lado, sign in ((antes, -1), (despues, 1)):
+        if not lado or not lado[1] or antes == despues:
+            continue
+        alumno_id, (materia_id, nombre) = lado
+        if Nota.objects.filter(alumno_id=alumno_id, mca__materia_id=materia_id).exclude(pk=pk).exists():
+            continue
+        carrera = ProgresoAlumno.objects.filter(alumno_id=alumno_id).values_list("carrera", flat=True).first()
+        if carrera is None:
+            continue  # sin snapshot
+        deltas[alumno_id]["materias"] += sign
+        tocadas[alumno_id] = tocadas.get(alumno_id, 0) + sign * _plan_weight(carrera, materia_id, nombre)
+
+    for alumno_id, d in deltas.items():
+        updates = {field: F(field) + n for field, n in d.items() if n}
+        w = tocadas.get(alumno_id)
+        if w:
+            # _plan_coverage lo limita a plan_total; si se pasa, rebuild_progress lo corrige
+            updates["plan_tocadas"] = (
+                Least(F("plan_tocadas") + w, F("plan_total")) if w > 0 else Greatest(F("plan_tocadas") + w, 0)
+            )
+        if updates:
+            ProgresoAlumno.objects.filter(alumno_id=alumno_id).update(**updates)
+
+
+_local = threading.local()
+
+
+def _pending() -> set:
+    if not hasattr(_local, "ids"):
+        _local.ids = set()
+    return _local.ids
+
+
+def _flush_pending():
+    ids = set(_pending())
+    _pending().difference_update(ids)
+    refresh_progress(ids)
+
+
+def schedule_refresh(*alumno_ids):
+    """
+    Recalcula los alumnos al confirmar la transacción: los ids se juntan por thread y el
+    primer callback los procesa todos (los demás no encuentran nada pendiente).
+    """
+    _pending().update(a for a in alumno_ids if a)
+    transaction.on_commit(_flush_pending)
+
+
+def notas_bulk_changed(alumno_ids):
+    """Hook para imports masivos de Nota (bulk_create/update no disparan signals)."""
+    schedule_refresh(*alumno_ids)
@@ -0,0 +1,226 @@
+# academics/ratings.py
+from collections import defaultdict, namedtuple
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+
+from academics import catalog_cache, singleflight
+from academics.models import MateriaComisionAnio, RatingSummary, ResenaItem
+
+STAR_FIELDS = tuple(f"estrellas_{i}" for i in range(1, 6))
+
+Rating = namedtuple("Rating", ["promedio", "cantidad"])
+SIN_RATING = Rating(0.0, 0)
+
+# Tipos que acepta ratings_for además de los de ResenaItem.Target
+MCA = "MCA"            # rating de la comisión dentro de una cursada puntual
+PROFESOR = "PROFESOR"  # TITULAR + JTP del mismo usuario
+
+RATING_CACHE_TTL = 300
+
+_TARGET_FK = {
+    ResenaItem.Target.MATERIA: "materia_id",
+    ResenaItem.Target.COMISION: "comision_id",
+    ResenaItem.Target.TITULAR: "titular_id",
+    ResenaItem.Target.JTP: "jtp_id",
+}
+
+
+def target_id_of(item) -> int | None:
+    """Id de la entidad reseñada por el item (materia, comisión o profesor)."""
+    return getattr(item, _TARGET_FK[item.target_type])
+
+
+def _apply(changes, mca):
+    mca_id = mca.pk if isinstance(mca, MateriaComisionAnio) else mca
+    # Acumulo los deltas por clave: total de la entidad (mca=None) y por cursada
+    deltas = defaultdict(lambda: [0, 0, [0] * 5])
+    for it, sign in changes:
+        tid = target_id_of(it)
+        if not tid:
+            continue
+        for key in ((it.target_type, tid, None), (it.target_type, tid, mca_id)):
+            d = deltas[key]
+            d[0] += sign * it.puntuacion
+            d[1] += sign
+            d[2][it.puntuacion - 1] += sign
+    deltas = {k: d for k, d in deltas.items() if d[1] or any(d[2])}
+    if not deltas:
+        return
+
+    # Las filas que falten, en cero y en un solo INSERT (las que ya existen se ignoran).
+    # Si falta una fila al descontar no se crea: se corrige con rebuild_rating_summaries.
+    RatingSummary.objects.bulk_create(
+        [
+            RatingSummary(target_type=target_type, target_id=target_id, mca_id=key_mca)
+            for (target_type, target_id, key_mca), (suma, cantidad, estrellas) in deltas.items()
+            if min(suma, cantidad, *estrellas) >= 0
+        ],
+        ignore_conflicts=True,
+    )
+    for (target_type, target_id, key_mca), (suma, cantidad, estrellas) in deltas.items():
+        updates = {"suma": F("suma") + suma, "cantidad": F("cantidad") + cantidad}
+        for field, n in zip(STAR_FIELDS, estrellas):
+            if n:
+                updates[field] = F(field) + n
+        RatingSummary.objects.filter(
+            target_type=target_type, target_id=target_id, mca_id=key_mca,
+        ).update(**updates)
+
+    _invalidate_cards(mca)
+    _invalidate_ratings(deltas)
+
+
+def _invalidate_cards(mca):
+    # Las estrellas de las cards de la materia (por departamento) y de la comisión cambiaron,
+    # y con ellas los ETags de la API que muestran ratings. Con la MCA ya cargada (con su
+    # materia) no hace falta consultar.
+    if isinstance(mca, MateriaComisionAnio) and MateriaComisionAnio.materia.is_cached(mca):
+        materia_id, departamento_id = mca.materia_id, mca.materia.departamento_id
+    else:
+        pk = mca.pk if isinstance(mca, MateriaComisionAnio) else mca
+        row = (
+            MateriaComisionAnio.objects
+            .filter(pk=pk)
+            .values_list("materia_id", "materia__departamento_id")
+            .first()
+        )
+        materia_id, departamento_id = row or (None, None)
+    catalog_cache.bump(
+        catalog_cache.RATINGS,
+        catalog_cache.dept_scope(departamento_id) if departamento_id else None,
+        catalog_cache.materia_scope(materia_id) if materia_id else None,
+    )
+
+
+def _rating_key(target_types, target_id, mca_id=None) -> str:
+    # La generación cambia con rebuild_summaries, que invalida todo de una
+    gen = catalog_cache.versions([catalog_cache.GLOBAL])[0]
+    return f"rating:{gen}:{'+'.join(sorted(target_types))}:{target_id}:{mca_id or ''}"
+
+
+def _invalidate_ratings(deltas):
+    profesor = [ResenaItem.Target.TITULAR, ResenaItem.Target.JTP]
+    keys = set()
+    for target_type, target_id, mca in deltas:
+        keys.add(_rating_key([target_type], target_id, mca))
+        if target_type in profesor and mca is None:
+            keys.add(_rating_key(profesor, target_id))
+    singleflight.invalidate(*keys)
+
+
+# mca: la MateriaComisionAnio (mejor con la materia ya cargada: select_related) o su id
+
+def register_items(items, mca):
+    """Suma los items (ya guardados) a los resúmenes. Llamar dentro de la transacción."""
+    _apply([(it, 1) for it in items], mca)
+
+
+def unregister_items(items, mca):
+    """Descuenta los items (antes de borrarlos) de los resúmenes."""
+    _apply([(it, -1) for it in items], mca)
+
+
+def replace_items(old_items, new_items, mca):
+    """Edición: descuenta los valores viejos y suma los nuevos en una sola pasada."""
+    _apply([(it, -1) for it in old_items] + [(it, 1) for it in new_items], mca)
+
+
+def get_rating(target_types, target_id, mca_id=None) -> Rating:
+    """
+    (promedio, cantidad) de una entidad leyendo solo RatingSummary.
+    target_types puede ser un tipo o varios (ej. TITULAR + JTP de un profesor).
+    """
+    if isinstance(target_types, str):
+        target_types = [target_types]
+    agg = (
+        RatingSummary.objects
+        .filter(target_type__in=target_types, target_id=target_id, mca_id=mca_id)
+        .aggregate(suma=Sum("suma"), cantidad=Sum("cantidad"))
+    )
+    cantidad = int(agg["cantidad"] or 0)
+    if not cantidad:
+        return SIN_RATING
+    return Rating(agg["suma"] / cantidad, cantidad)
+
+
+def cached_rating(target_types, target_id, mca_id=None) -> Rating:
+    """get_rating a través del cache single-flight (para los perfiles)."""
+    if isinstance(target_types, str):
+        target_types = [target_types]
+    value = singleflight.get_or_compute(
+        _rating_key(target_types, target_id, mca_id),
+        lambda: tuple(get_rating(target_types, target_id, mca_id)),
+        ttl=RATING_CACHE_TTL,
+    )
+    return Rating(*value)
+
+
+def ratings_for(target_type, ids) -> dict:
+    """
+    Ratings de muchas entidades con una sola consulta agrupada sobre RatingSummary.
+    target_type: MATERIA, COMISION, TITULAR, JTP, MCA o PROFESOR.
+    Devuelve {id: Rating}; los ids sin reseñas quedan con SIN_RATING.
+    """
+    ids = {i for i in ids if i is not None}
+    if not ids:
+        return {}
+
+    if target_type == MCA:
+        key = "mca_id"
+        qs = RatingSummary.objects.filter(target_type=ResenaItem.Target.COMISION, mca_id__in=ids)
+    else:
+        key = "target_id"
+        types = (
+            [ResenaItem.Target.TITULAR, ResenaItem.Target.JTP]
+            if target_type == PROFESOR else [target_type]
+        )
+        qs = RatingSummary.objects.filter(
+            target_type__in=types, target_id__in=ids, mca__isnull=True
+        )
+
+    result = dict.fromkeys(ids, SIN_RATING)
+    grouped = (
+        qs.values(key)
+        .annotate(suma_total=Sum("suma"), cantidad_total=Sum("cantidad"))
+        .order_by()
+    )
+    for row in grouped:
+        cantidad = int(row["cantidad_total"] or 0)
+        if cantidad:
+            result[row[key]] = Rating(row["suma_total"] / cantidad, cantidad)
+    return result
+
+
+def rebuild_summaries() -> int:
+    """Recalcula todos los resúmenes desde ResenaItem. Devuelve la cantidad de filas creadas."""
+    stars = {
+        field: Count("id", filter=Q(puntuacion=i))
+        for i, field in enumerate(STAR_FIELDS, start=1)
+    }
+    rows = defaultdict(lambda: {"suma": 0, "cantidad": 0, **{f: 0 for f in STAR_FIELDS}})
+    for target_type, fk in _TARGET_FK.items():
+        grouped = (
+            ResenaItem.objects
+            .filter(target_type=target_type, **{f"{fk}__isnull": False})
+            .values("target_type", fk, "resena__mca_id")
+            .annotate(suma=Sum("puntuacion"), cantidad=Count("id"), **stars)
+            .order_by()
+        )
+        for g in grouped:
+            for mca in (None, g["resena__mca_id"]):
+                acc = rows[(g["target_type"], g[fk], mca)]
+                for k in acc:
+                    acc[k] += g[k]
+
+    with transaction.atomic():
+        RatingSummary.objects.all().delete()
+        RatingSummary.objects.bulk_create(
+            [
+                RatingSummary(target_type=tt, target_id=tid, mca_id=mca, **vals)
+                for (tt, tid, mca), vals in rows.items()
+            ],
+            batch_size=1000,
+        )
+        catalog_cache.bump(catalog_cache.GLOBAL)
+    return len(rows)
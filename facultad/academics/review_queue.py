@@ -0,0 +1,226 @@
+# academics/review_queue.py
+# Modo write-behind para las reseñas (RESENAS_WRITE_BEHIND=True, pensado para el cierre
+# de cuatrimestre): evaluar_mca valida en memoria y solo inserta una fila en
+# ResenaPendiente; manage.py drain_resenas la pasa a Resena/ResenaItem en lotes, con una
+# transacción corta por lote. Mientras tanto el dashboard muestra la cursada "pendiente".
+# Cada worker toma su lote con un UPDATE condicional (PENDIENTE -> PROCESANDO), así que
+# anda igual en SQLite que en Postgres; lo que un worker caído deja tomado se libera a
+# los RESENAS_CLAIM_TIMEOUT segundos.
+# Métricas: profundidad de la cola (depth) y ritmo del último drenaje, guardado en el
+# cache para que lo vean todos los workers (ver drain_resenas --stats).
+import logging
+import time
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Min, Q
+from django.utils import timezone
+
+from academics import ratings, reviews
+from academics.models import Nota, Resena, ResenaItem, ResenaPendiente
+
+_LAST_RUN_KEY = "resena_queue:ultimo"
+_TOTAL_KEY = "resena_queue:procesadas"
+
+DUPLICADA = "Ya había una reseña para esta cursada."
+
+logger = logging.getLogger(__name__)
+
+
+def enabled() -> bool:
+    return getattr(settings, "RESENAS_WRITE_BEHIND", False)
+
+
+def claim_timeout() -> int:
+    return getattr(settings, "RESENAS_CLAIM_TIMEOUT", 300)
+
+
+def _cache():
+    return caches[getattr(settings, "SINGLEFLIGHT_CACHE_ALIAS", "default")]
+
+
+def encolar(alumno, mca, items) -> ResenaPendiente:
+    """
+    Encola la reseña (items ya armados con reviews.build_items). Si había una fila en
+    ERROR para la misma cursada se reemplaza y vuelve a PENDIENTE (con la fecha de ahora).
+    """
+    datos = {}
+    for it in items:
+        name = reviews.TARGETS[it.target_type]
+        datos[f"{name}_score"] = it.puntuacion
+        datos[f"{name}_comment"] = it.comentario
+    fila = ResenaPendiente(alumno=alumno, mca=mca, datos=datos)
+    ResenaPendiente.objects.bulk_create(
+        [fila],
+        update_conflicts=True,
+        unique_fields=["alumno", "mca"],
+        update_fields=["datos", "estado", "error", "lote", "tomada_at", "created_at"],
+    )
+    return fila
+
+
+def _claim(batch_size) -> list[ResenaPendiente]:
+    """
+    Toma hasta batch_size filas para este worker. El UPDATE solo cambia las que siguen
+    libres, así que si otro worker tomó alguna entre la consulta y el UPDATE no la pisa.
+    """
+    ahora = timezone.now()
+    libres = Q(estado=ResenaPendiente.Estado.PENDIENTE) | Q(
+        estado=ResenaPendiente.Estado.PROCESANDO, tomada_at__lt=ahora - timedelta(seconds=claim_timeout()),
+    )
+    ids = list(
+        ResenaPendiente.objects.filter(libres).order_by("id").values_list("id", flat=True)[:batch_size]
+    )
+    if not ids:
+        return []
+    lote = uuid.uuid4().hex
+    ResenaPendiente.objects.filter(libres, pk__in=ids).update(
+        estado=ResenaPendiente.Estado.PROCESANDO, lote=lote, tomada_at=ahora,
+    )
+    return list(
+        ResenaPendiente.objects
+        .filter(lote=lote, estado=ResenaPendiente.Estado.PROCESANDO)
+        .select_related("mca__materia", "mca__comision", "mca__titular", "mca__jtp")
+        .order_by("id")
+    )
+
+
+def _publicar(ok):
+    resenas = Resena.objects.bulk_create(
+        [Resena(alumno_id=p.alumno_id, mca_id=p.mca_id) for p, _ in ok]
+    )
+    por_mca = defaultdict(list)
+    mcas = {}
+    for resena, (p, items) in zip(resenas, ok):
+        for it in items:
+            it.resena = resena
+        por_mca[p.mca_id].extend(items)
+        mcas[p.mca_id] = p.mca  # ya viene con la materia (_claim)
+    ResenaItem.objects.bulk_create([it for items in por_mca.values() for it in items])
+    for mca_id, items in por_mca.items():
+        ratings.register_items(items, mcas[mca_id])
+
+
+def drain_batch(batch_size=200) -> tuple[int, int]:
+    """
+    Procesa hasta batch_size filas en una transacción. Devuelve (publicadas, con error).
+    Las validaciones de acceso se repiten acá (pudo cambiar la nota o existir ya una
+    reseña), con una consulta por lote cada una. Si igual choca con una reseña creada
+    en el medio, esa fila queda en ERROR y el resto del lote se publica.
+    """
+    lote = _claim(batch_size)
+    if not lote:
+        return 0, 0
+    try:
+        with transaction.atomic():
+            return _procesar(lote)
+    except Exception:
+        # que otro intento las vuelva a tomar sin esperar el timeout
+        ResenaPendiente.objects.filter(pk__in=[p.pk for p in lote]).update(
+            estado=ResenaPendiente.Estado.PENDIENTE, lote="", tomada_at=None,
+        )
+        raise
+
+
+def _procesar(lote) -> tuple[int, int]:
+    alumnos = {p.alumno_id for p in lote}
+    mcas = {p.mca_id for p in lote}
+    ya = set(
+        Resena.objects.filter(alumno_id__in=alumnos, mca_id__in=mcas).values_list("alumno_id", "mca_id")
+    )
+    habilitadas = set(
+        Nota.objects.filter(
+            alumno_id__in=alumnos, mca_id__in=mcas, estado__in=reviews.ESTADOS_HABILITANTES,
+        ).values_list("alumno_id", "mca_id")
+    )
+
+    ok, errores = [], defaultdict(list)
+    for p in lote:
+        par = (p.alumno_id, p.mca_id)
+        items = reviews.build_items(p.mca, p.datos)
+        if par in ya:
+            errores[DUPLICADA].append(p.pk)
+        elif par not in habilitadas:
+            errores["La nota ya no habilita la reseña."].append(p.pk)
+        elif not items:
+            errores["Sin puntajes válidos."].append(p.pk)
+        else:
+            ok.append((p, items))
+
+    if ok:
+        try:
+            with transaction.atomic():
+                _publicar(ok)
+        except IntegrityError:
+            # alguna ya tenía reseña (se mandó sin la cola en el medio): de a una, cada
+            # una en su savepoint
+            publicadas = []
+            for p, items in ok:
+                try:
+                    with transaction.atomic():
+                        _publicar([(p, items)])
+                except IntegrityError:
+                    errores[DUPLICADA].append(p.pk)
+                else:
+                    publicadas.append((p, items))
+            ok = publicadas
+        ResenaPendiente.objects.filter(pk__in=[p.pk for p, _ in ok]).delete()
+
+    for motivo, pks in errores.items():
+        ResenaPendiente.objects.filter(pk__in=pks).update(
+            estado=ResenaPendiente.Estado.ERROR, error=motivo, intentos=F("intentos") + 1,
+            lote="", tomada_at=None,
+        )
+    return len(ok), sum(len(pks) for pks in errores.values())
+
+
+def drain(batch_size=200, max_batches=None) -> dict:
+    """Drena la cola hasta vaciarla (o max_batches lotes) y guarda el ritmo en el cache."""
+    t0 = time.perf_counter()
+    publicadas = errores = lotes = 0
+    while max_batches is None or lotes < max_batches:
+        n_ok, n_err = drain_batch(batch_size)
+        if not n_ok and not n_err:
+            break
+        publicadas += n_ok
+        errores += n_err
+        lotes += 1
+    segundos = time.perf_counter() - t0
+    stats = {
+        "publicadas": publicadas, "errores": errores, "lotes": lotes,
+        "segundos": segundos, "por_segundo": publicadas / segundos if segundos else 0.0,
+        "at": timezone.now().isoformat(),
+    }
+    if lotes:
+        cache = _cache()
+        cache.set(_LAST_RUN_KEY, stats, None)
+        if not cache.add(_TOTAL_KEY, publicadas, None):
+            cache.incr(_TOTAL_KEY, publicadas)
+    return stats
+
+
+def depth() -> dict:
+    """Filas en cola (pendientes o tomadas) / con error y antigüedad (segundos) de la más vieja."""
+    en_cola = ~Q(estado=ResenaPendiente.Estado.ERROR)
+    agg = ResenaPendiente.objects.aggregate(
+        pendientes=Count("id", filter=en_cola),
+        errores=Count("id", filter=Q(estado=ResenaPendiente.Estado.ERROR)),
+        mas_vieja=Min("created_at", filter=en_cola),
+    )
+    mas_vieja = agg.pop("mas_vieja")
+    agg["espera_max"] = (timezone.now() - mas_vieja).total_seconds() if mas_vieja else 0.0
+    return agg
+
+
+def metrics() -> dict:
+    """depth() + el último drenaje y el total publicado por la cola (de todos los workers)."""
+    cache = _cache()
+    return {
+        **depth(),
+        "ultimo_drenaje": cache.get(_LAST_RUN_KEY),
+        "publicadas_total": cache.get(_TOTAL_KEY, 0),
+    }
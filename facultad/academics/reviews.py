@@ -0,0 +1,166 @@
+# academics/reviews.py
+# Alta y edición de reseñas (evaluar_mca / editar_resena_mca). Los items se arman y validan
+# en memoria contra la cursada ya cargada (sin el full_clean() de ResenaItem.save, que
+# vuelve a leer la MCA) y se escriben en lote. Las constraints de la base (una reseña por
+# alumno y cursada, un item por tipo, FK según el tipo) quedan como red de seguridad.
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from academics import ratings
+from academics.models import MateriaComisionAnio, Nota, Resena, ResenaItem, ResenaPendiente
+
+# tipo -> nombre en el form ({nombre}_score / {nombre}_comment), en la MCA y en el item
+TARGETS = {
+    ResenaItem.Target.MATERIA: "materia",
+    ResenaItem.Target.COMISION: "comision",
+    ResenaItem.Target.TITULAR: "titular",
+    ResenaItem.Target.JTP: "jtp",
+}
+
+ESTADOS_HABILITANTES = [Nota.Estado.APROBADA, Nota.Estado.PROMOCIONADA]
+
+
+class ResenaDuplicada(Exception):
+    pass
+
+
+class ResenaDesactualizada(Exception):
+    """La reseña se modificó (otra pestaña/dispositivo) después de abrir el form de edición."""
+
+
+def mca_queryset(alumno):
+    """
+    Cursadas con todo lo que usa el form y, en la misma consulta, si el alumno puede
+    evaluarla (nota_valida), si ya la evaluó (ya_evaluo) y si tiene una reseña esperando
+    en la cola write-behind (en_cola).
+    """
+    return (
+        MateriaComisionAnio.objects
+        .select_related("materia", "comision", "titular", "jtp")
+        .annotate(
+            nota_valida=Exists(Nota.objects.filter(
+                alumno=alumno, mca=OuterRef("pk"), estado__in=ESTADOS_HABILITANTES,
+            )),
+            ya_evaluo=Exists(Resena.objects.filter(alumno=alumno, mca=OuterRef("pk"))),
+            en_cola=Exists(ResenaPendiente.objects.filter(
+                alumno=alumno, mca=OuterRef("pk"),
+            ).exclude(estado=ResenaPendiente.Estado.ERROR)),
+        )
+    )
+
+
+def parse_score(raw) -> int | None:
+    """Puntaje 1..5 del form; vacío o inválido -> None (el item no se carga)."""
+    try:
+        score = int(raw or 0)
+    except (TypeError, ValueError):
+        return None
+    return score if 1 <= score <= 5 else None
+
+
+def build_items(mca, data) -> list[ResenaItem]:
+    """
+    Items sin guardar (ni reseña asignada) para lo que vino en el form, con la FK que
+    corresponde a cada tipo tomada de la MCA. Si la cursada no tiene titular/JTP ese
+    puntaje se ignora.
+    """
+    items = []
+    for target, name in TARGETS.items():
+        entidad = getattr(mca, name)
+        score = parse_score(data.get(f"{name}_score"))
+        if entidad is None or score is None:
+            continue
+        item = ResenaItem(
+            target_type=target,
+            puntuacion=score,
+            comentario=(data.get(f"{name}_comment") or "").strip(),
+            **{name: entidad},
+        )
+        item.censurar()
+        items.append(item)
+    return items
+
+
+def crear_resena(alumno, mca, items) -> Resena:
+    """
+    Reseña + items + resúmenes de rating en una transacción. ResenaDuplicada si el alumno
+    ya tenía reseña para la cursada (doble envío).
+    """
+    resena = None
+    try:
+        with transaction.atomic():
+            resena = Resena.objects.create(alumno=alumno, mca=mca)
+            for it in items:
+                it.resena = resena
+            ResenaItem.objects.bulk_create(items)
+            ratings.register_items(items, mca)
+    except IntegrityError:
+        if resena is None:
+            # uq_resena_alumno_mca: ya había una reseña
+            raise ResenaDuplicada()
+        raise
+    return resena
+
+
+# Columnas que reescribe la edición; created_at del item se conserva
+_EDIT_FIELDS = [
+    "puntuacion", "comentario", "comentario_censurado", "censura_version",
+    "materia", "comision", "titular", "jtp",
+]
+
+
+def version_of(resena) -> str:
+    """Valor del campo oculto "version" del form de edición."""
+    return resena.updated_at.isoformat()
+
+
+def parse_version(raw):
+    """
+    updated_at que vio el form. Sin el campo (form viejo) -> None y se compara contra lo
+    recién leído; si no se puede leer se trata como desactualizada.
+    """
+    if not raw:
+        return None
+    try:
+        version = parse_datetime(raw)
+    except ValueError:
+        version = None
+    if version is None:
+        raise ResenaDesactualizada()
+    return version
+
+
+def editar_resena(resena, mca, items, version=None) -> Resena:
+    """
+    Deja la reseña con exactamente estos items: un upsert en lote por (reseña, tipo) y un
+    borrado de los tipos que ya no vienen, en una transacción. Control optimista: solo se
+    aplica si updated_at sigue siendo `version` (el que vio el form); si no,
+    ResenaDesactualizada y no se toca nada.
+    """
+    version = version or resena.updated_at
+    now = timezone.now()
+    with transaction.atomic():
+        # el chequeo de versión y el "última edición" de los perfiles (ETag) en una consulta
+        if not Resena.objects.filter(pk=resena.pk, updated_at=version).update(updated_at=now):
+            raise ResenaDesactualizada()
+        resena.updated_at = now
+
+        tipos = {it.target_type for it in items}
+        anteriores = [it for it in resena.items.all() if it.target_type in tipos]
+        for it in items:
+            it.resena = resena
+        if items:
+            ResenaItem.objects.bulk_create(
+                items,
+                update_conflicts=True,
+                unique_fields=["resena", "target_type"],
+                update_fields=_EDIT_FIELDS,
+            )
+        # los que ya no vienen se descuentan de los ratings al borrarlos (signals.py)
+        ResenaItem.objects.filter(resena=resena).exclude(target_type__in=tipos).delete()
+
+        # Resúmenes de rating: saco lo viejo y sumo lo nuevo
+        ratings.replace_items(anteriores, items, mca)
+    return resena
@@ -0,0 +1,63 @@
+# academics/rollover.py
+# Pasaje de año: copia las cursadas (MateriaComisionAnio) de un año al siguiente con los
+# mismos titular/JTP/ayudante. Las (materia, comisión, año) que ya existen en el destino no
+# se tocan, y las de materias dadas de baja (eliminado) no se copian. Lo usan
+# manage.py rollover_mca y el panel administrativo.
+import time
+
+from django.db import transaction
+
+from academics import catalog_cache
+from academics.catalog_cache import CURSADAS, materia_scope
+from academics.models import MateriaComisionAnio
+
+
+def rollover_diff(desde: int, hasta: int) -> dict:
+    """
+    Qué haría el pasaje sin guardar nada (dos consultas):
+    - nuevas: MCAs sin guardar para el año destino
+    - existentes: MCAs del origen que ya tienen su par en el destino (se saltean)
+    """
+    ya = set(
+        MateriaComisionAnio.objects.filter(anio=hasta).values_list("materia_id", "comision_id")
+    )
+    nuevas, existentes = [], []
+    origen = (
+        MateriaComisionAnio.objects.filter(anio=desde, materia__eliminado=False)
+        .select_related("materia", "comision", "titular", "jtp", "ayudante")
+        .order_by("materia__nombre", "comision__nombre")
+    )
+    for mca in origen:
+        if (mca.materia_id, mca.comision_id) in ya:
+            existentes.append(mca)
+            continue
+        nuevas.append(MateriaComisionAnio(
+            materia=mca.materia, comision=mca.comision, anio=hasta,
+            titular=mca.titular, jtp=mca.jtp, ayudante=mca.ayudante,
+        ))
+    return {"desde": desde, "hasta": hasta, "nuevas": nuevas, "existentes": existentes}
+
+
+def rollover(desde: int, hasta: int | None = None, dry_run=False, batch_size=500) -> dict:
+    """
+    Copia las cursadas de `desde` a `hasta` (por defecto desde + 1) en inserts por lote.
+    Devuelve el diff de rollover_diff más creadas y segundos.
+    """
+    hasta = desde + 1 if hasta is None else hasta
+    t0 = time.perf_counter()
+    diff = rollover_diff(desde, hasta)
+    creadas = 0
+    if diff["nuevas"] and not dry_run:
+        destino = MateriaComisionAnio.objects.filter(anio=hasta)
+        with transaction.atomic():
+            antes = destino.count()
+            # ignore_conflicts por si otro admin cargó alguna entre el diff y el insert
+            MateriaComisionAnio.objects.bulk_create(
+                diff["nuevas"], batch_size=batch_size, ignore_conflicts=True
+            )
+            creadas = destino.count() - antes
+            # bulk_create no dispara signals: invalido las grillas de comisiones
+            catalog_cache.bump(
+                CURSADAS, *sorted({materia_scope(m.materia_id) for m in diff["nuevas"]})
+            )
+    return {**diff, "creadas": creadas, "segundos": time.perf_counter() - t0, "dry_run": dry_run}
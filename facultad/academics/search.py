@@ -0,0 +1,176 @@
+# academics/search.py
+# Búsqueda de texto completo sobre los comentarios (ResenaItem.comentario_censurado).
+# - SQLite: tabla virtual FTS5 de contenido externo + triggers que la mantienen al día.
+# - PostgreSQL: columna tsvector generada (STORED) con índice GIN.
+# En ambos casos el índice se actualiza solo en cada alta/edición/baja de items.
+# Otros motores: sin índice, icontains por palabra y sin ranking (ver _search_icontains).
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from academics.models import MateriaComisionAnio, Resena, ResenaItem
+
+ITEMS = ResenaItem._meta.db_table
+FTS = f"{ITEMS}_fts"
+PG_CONFIG = "spanish"
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _sqlite_install(cursor, rebuild):
+    cursor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS} USING fts5("
+        f"comentario_censurado, content='{ITEMS}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2')"
+    )
+    cursor.execute("SELECT count(*) FROM sqlite_master WHERE type='trigger' AND name LIKE %s", [f"{FTS}_%"])
+    if cursor.fetchone()[0] < 3:
+        # faltan triggers (instalación nueva o la tabla fue recreada por una migración)
+        rebuild = True
+    cursor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {FTS}_ai AFTER INSERT ON {ITEMS} BEGIN "
+        f"INSERT INTO {FTS}(rowid, comentario_censurado) VALUES (new.id, new.comentario_censurado); END"
+    )
+    cursor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {FTS}_ad AFTER DELETE ON {ITEMS} BEGIN "
+        f"INSERT INTO {FTS}({FTS}, rowid, comentario_censurado) "
+        f"VALUES ('delete', old.id, old.comentario_censurado); END"
+    )
+    cursor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {FTS}_au AFTER UPDATE OF comentario_censurado ON {ITEMS} BEGIN "
+        f"INSERT INTO {FTS}({FTS}, rowid, comentario_censurado) "
+        f"VALUES ('delete', old.id, old.comentario_censurado); "
+        f"INSERT INTO {FTS}(rowid, comentario_censurado) VALUES (new.id, new.comentario_censurado); END"
+    )
+    if rebuild:
+        cursor.execute(f"INSERT INTO {FTS}({FTS}) VALUES ('rebuild')")
+
+
+def _postgres_install(cursor):
+    cursor.execute(
+        f"ALTER TABLE {ITEMS} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('{PG_CONFIG}', coalesce(comentario_censurado, ''))) STORED"
+    )
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS {ITEMS}_search_gin ON {ITEMS} USING GIN (search_vector)")
+
+
+def install(conn=None, rebuild=False):
+    """Crea (si falta) el índice de búsqueda para el motor de la conexión. Idempotente."""
+    conn = conn or connection
+    with conn.cursor() as cursor:
+        if conn.vendor == "sqlite":
+            _sqlite_install(cursor, rebuild)
+        elif conn.vendor == "postgresql":
+            _postgres_install(cursor)
+
+
+def uninstall(conn=None):
+    conn = conn or connection
+    with conn.cursor() as cursor:
+        if conn.vendor == "sqlite":
+            for suffix in ("ai", "ad", "au"):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {FTS}_{suffix}")
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS}")
+        elif conn.vendor == "postgresql":
+            cursor.execute(f"DROP INDEX IF EXISTS {ITEMS}_search_gin")
+            cursor.execute(f"ALTER TABLE {ITEMS} DROP COLUMN IF EXISTS search_vector")
+
+
+def _fts5_query(q):
+    # Cada palabra entre comillas (sin operadores del usuario) y como prefijo: "profe"* "expl"*
+    return " ".join(f'"{w}"*' for w in _WORD_RE.findall(q))
+
+
+def _search_icontains(q, target_type, materia_id, comision_id, profesor_id, anio, limit, offset):
+    # Respaldo sin índice de texto: todas las palabras tienen que aparecer; lo más nuevo primero
+    qs = ResenaItem.objects.select_related("resena__mca__materia", "resena__mca__comision", "titular", "jtp")
+    for word in _WORD_RE.findall(q):
+        qs = qs.filter(comentario_censurado__icontains=word)
+    if target_type:
+        qs = qs.filter(target_type=target_type)
+    if materia_id:
+        qs = qs.filter(resena__mca__materia_id=materia_id)
+    if comision_id:
+        qs = qs.filter(resena__mca__comision_id=comision_id)
+    if profesor_id:
+        qs = qs.filter(Q(titular_id=profesor_id) | Q(jtp_id=profesor_id))
+    if anio:
+        qs = qs.filter(resena__mca__anio=anio)
+    result = list(qs.order_by("-id")[offset:offset + limit])
+    for it in result:
+        it.rank = 0.0
+    return result
+
+
+def search_items(q, target_type=None, materia_id=None, comision_id=None,
+                 profesor_id=None, anio=None, limit=20, offset=0):
+    """
+    Items cuyo comentario coincide con q, ordenados por relevancia.
+    Devuelve una lista de ResenaItem (con resena/mca/materia/comisión cargados) y
+    el atributo .rank (mayor = más relevante).
+    """
+    if not _WORD_RE.search(q or ""):
+        return []
+
+    vendor = connection.vendor
+    if vendor == "sqlite":
+        match_sql = f"{FTS} MATCH %s"
+        rank_sql = f"-bm25({FTS})"
+        from_sql = f"{FTS} JOIN {ITEMS} i ON i.id = {FTS}.rowid"
+        params = [_fts5_query(q)]
+    elif vendor == "postgresql":
+        match_sql = f"i.search_vector @@ websearch_to_tsquery('{PG_CONFIG}', %s)"
+        rank_sql = f"ts_rank(i.search_vector, websearch_to_tsquery('{PG_CONFIG}', %s))"
+        from_sql = f"{ITEMS} i"
+        params = [q]
+    else:
+        return _search_icontains(
+            q, target_type, materia_id, comision_id, profesor_id, anio, limit, offset,
+        )
+
+    where = [match_sql]
+    if target_type:
+        where.append("i.target_type = %s")
+        params.append(target_type)
+    if materia_id:
+        where.append("m.materia_id = %s")
+        params.append(materia_id)
+    if comision_id:
+        where.append("m.comision_id = %s")
+        params.append(comision_id)
+    if profesor_id:
+        where.append("(i.titular_id = %s OR i.jtp_id = %s)")
+        params += [profesor_id, profesor_id]
+    if anio:
+        where.append("m.anio = %s")
+        params.append(anio)
+
+    sql = (
+        f"SELECT i.id, {rank_sql} AS rank FROM {from_sql} "
+        f"JOIN {Resena._meta.db_table} r ON r.id = i.resena_id "
+        f"JOIN {MateriaComisionAnio._meta.db_table} m ON m.id = r.mca_id "
+        f"WHERE {' AND '.join(where)} "
+        f"ORDER BY rank DESC, i.id DESC LIMIT %s OFFSET %s"
+    )
+    if vendor == "postgresql":
+        params = [q] + params  # el del ts_rank va primero en el SELECT
+    params += [limit, offset]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        ranked = cursor.fetchall()
+
+    items = (
+        ResenaItem.objects
+        .filter(id__in=[pk for pk, _ in ranked])
+        .select_related("resena__mca__materia", "resena__mca__comision", "titular", "jtp")
+    )
+    by_id = {it.id: it for it in items}
+    result = []
+    for pk, rank in ranked:
+        it = by_id.get(pk)
+        if it is not None:
+            it.rank = float(rank)
+            result.append(it)
+    return result
@@ -0,0 +1,100 @@
+# academics/serializers.py
+# Serializers de la API de solo lectura (academics/api.py). Todos aceptan ?fields=a,b
+# (sparse fieldsets); el rating no sale de la base por objeto: la vista lo deja en
+# obj.rating con una consulta agrupada por página (ratings.ratings_for).
+from rest_framework import serializers
+
+from academics.models import Department, Materia, MateriaComisionAnio
+from people.models import User
+
+
+def requested_fields(request) -> set | None:
+    """Campos pedidos con ?fields=; None = todos."""
+    raw = request.query_params.get("fields") if request is not None else None
+    if not raw:
+        return None
+    return {f.strip() for f in raw.split(",") if f.strip()}
+
+
+class SparseFieldsMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = requested_fields(self.context.get("request"))
+        if fields:
+            for name in set(self.fields) - fields:
+                self.fields.pop(name)
+
+
+def rating_data(rating) -> dict:
+    promedio, cantidad = rating
+    return {"promedio": round(promedio, 2) if cantidad else None, "cantidad": cantidad}
+
+
+class RatingField(serializers.Field):
+    """{"promedio", "cantidad"} desde obj.rating (un ratings.Rating)."""
+
+    def __init__(self, **kwargs):
+        kwargs["source"] = "*"
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, obj):
+        return rating_data(obj.rating)
+
+
+class ProfesorBriefSerializer(serializers.ModelSerializer):
+    nombre = serializers.SerializerMethodField()
+
+    class Meta:
+        model = User
+        fields = ["id", "username", "nombre"]
+
+    def get_nombre(self, obj):
+        return obj.get_full_name() or obj.username
+
+
+class DepartmentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Department
+        fields = ["id", "nombre", "imagen", "icono"]
+
+
+class MateriaSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    departamento = serializers.IntegerField(source="departamento_id", read_only=True)
+    departamento_nombre = serializers.CharField(source="departamento.nombre", read_only=True)
+    rating = RatingField()
+
+    class Meta:
+        model = Materia
+        fields = ["id", "nombre", "descripcion", "imagen", "icono", "departamento", "departamento_nombre", "rating"]
+
+
+class MCASerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    materia = serializers.SerializerMethodField()
+    comision = serializers.SerializerMethodField()
+    titular = ProfesorBriefSerializer(read_only=True)
+    jtp = ProfesorBriefSerializer(read_only=True)
+    ayudante = ProfesorBriefSerializer(read_only=True)
+    rating = RatingField()  # de la comisión en esta cursada
+
+    class Meta:
+        model = MateriaComisionAnio
+        fields = ["id", "anio", "materia", "comision", "titular", "jtp", "ayudante", "rating"]
+
+    def get_materia(self, obj):
+        return {"id": obj.materia_id, "nombre": obj.materia.nombre}
+
+    def get_comision(self, obj):
+        return {"id": obj.comision_id, "nombre": obj.comision.nombre}
+
+
+class ProfesorSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    nombre = serializers.SerializerMethodField()
+    rating = RatingField()  # titular + JTP en todas sus cursadas
+
+    class Meta:
+        model = User
+        fields = ["id", "username", "nombre", "first_name", "last_name", "imagen_perfil", "rating"]
+
+    def get_nombre(self, obj):
+        return obj.get_full_name() or obj.username
@@ -0,0 +1,181 @@
+# academics/signals.py
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from academics import catalog_cache, images, progress, ratings
+from academics.catalog_cache import (
+    COMISIONES, CURSADAS, DEPARTMENTS, MATERIAS, PROFESORES, dept_scope, materia_scope,
+)
+from academics.models import (
+    Comision, Department, Materia, MateriaComisionAnio, Nota, PlanItem, ResenaItem,
+)
+from academics.plan_loader import normalize_name
+
+
+def _remember_previous(sender, instance, fields):
+    # Guarda los FKs anteriores para invalidar también el lugar de donde se movió el objeto
+    instance._catalog_prev = None
+    if instance.pk:
+        instance._catalog_prev = sender.objects.filter(pk=instance.pk).values(*fields).first()
+
+
+@receiver(pre_save, sender=Materia)
+def _materia_pre_save(sender, instance, **kwargs):
+    _remember_previous(sender, instance, ["departamento_id"])
+
+
+@receiver(pre_save, sender=MateriaComisionAnio)
+def _mca_pre_save(sender, instance, **kwargs):
+    _remember_previous(sender, instance, ["materia_id"])
+
+
+@receiver([post_save, post_delete], sender=Department)
+def _department_changed(sender, instance, **kwargs):
+    catalog_cache.bump(DEPARTMENTS, dept_scope(instance.pk))
+
+
+@receiver([post_save, post_delete], sender=Materia)
+def _materia_changed(sender, instance, **kwargs):
+    prev = getattr(instance, "_catalog_prev", None) or {}
+    catalog_cache.bump(
+        MATERIAS,
+        dept_scope(instance.departamento_id),
+        dept_scope(prev.get("departamento_id")) if prev.get("departamento_id") != instance.departamento_id else None,
+        materia_scope(instance.pk),
+    )
+
+
+@receiver(post_save, sender=Materia)
+def _materia_plan_link(sender, instance, **kwargs):
+    # Materia nueva o renombrada: la vinculo con las filas del plan que tengan su nombre
+    nombre = normalize_name(instance.nombre)
+    PlanItem.objects.filter(materia=instance).exclude(nombre_normalizado=nombre).update(materia=None)
+    PlanItem.objects.filter(nombre_normalizado=nombre).exclude(materia=instance).update(materia=instance)
+
+
+@receiver([post_save, post_delete], sender=Comision)
+def _comision_changed(sender, instance, **kwargs):
+    # nombre/imagen de la comisión aparecen en las grillas de todas sus materias
+    catalog_cache.bump(COMISIONES)
+
+
+@receiver([post_save, post_delete], sender=MateriaComisionAnio)
+def _mca_changed(sender, instance, **kwargs):
+    prev = getattr(instance, "_catalog_prev", None) or {}
+    catalog_cache.bump(
+        CURSADAS,
+        materia_scope(instance.materia_id),
+        materia_scope(prev.get("materia_id")) if prev.get("materia_id") != instance.materia_id else None,
+    )
+
+
+# lo que muestran de un profesor las cards de comisiones y los perfiles
+_PROFESOR_FIELDS = ["first_name", "last_name", "username", "imagen_perfil", "rol"]
+
+
+def _profesor_data(instance) -> dict:
+    return {f: getattr(instance, f) if f != "imagen_perfil" else (instance.imagen_perfil.name or "")
+            for f in _PROFESOR_FIELDS}
+
+
+@receiver(pre_save, sender=get_user_model())
+def _user_pre_save(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not set(update_fields) & set(_PROFESOR_FIELDS):
+        # el last_login de cada login y otros saves parciales: no cambia nada visible
+        instance._catalog_prev = False
+        return
+    _remember_previous(sender, instance, _PROFESOR_FIELDS)
+    if instance._catalog_prev:
+        instance._catalog_prev["imagen_perfil"] = instance._catalog_prev["imagen_perfil"] or ""
+
+
+@receiver(post_save, sender=get_user_model())
+def _profesor_changed(sender, instance, **kwargs):
+    # nombres e imagen de titular/JTP aparecen en las cards de comisiones; también si
+    # deja de ser profesor
+    prev = getattr(instance, "_catalog_prev", None)
+    if prev is False:
+        return
+    profesor = sender.Role.PROFESOR
+    if instance.rol != profesor and not (prev and prev["rol"] == profesor):
+        return
+    if prev != _profesor_data(instance):
+        catalog_cache.bump(PROFESORES)
+
+
+@receiver(post_delete, sender=get_user_model())
+def _profesor_deleted(sender, instance, **kwargs):
+    if instance.rol == sender.Role.PROFESOR:
+        catalog_cache.bump(PROFESORES)
+
+
+_NOTA_FIELDS = ["alumno_id", "mca_id", "estado", "nota"]
+
+
+@receiver(pre_save, sender=Nota)
+def _nota_pre_save(sender, instance, **kwargs):
+    _remember_previous(sender, instance, _NOTA_FIELDS)
+
+
+@receiver(post_save, sender=Nota)
+def _nota_saved(sender, instance, **kwargs):
+    # snapshot de avance: solo la diferencia (también si la nota cambió de alumno)
+    actual = {f: getattr(instance, f) for f in _NOTA_FIELDS}
+    progress.nota_changed(instance.pk, getattr(instance, "_catalog_prev", None), actual)
+
+
+@receiver(post_delete, sender=Nota)
+def _nota_deleted(sender, instance, **kwargs):
+    progress.nota_changed(instance.pk, {f: getattr(instance, f) for f in _NOTA_FIELDS}, None)
+
+
+# ---- derivados de imágenes (academics/images.py) ----
+_IMAGE_FIELDS = images.image_fields()
+
+
+def _image_pre_save(sender, instance, update_fields=None, **kwargs):
+    # None = la imagen no cambia en este save (p. ej. el last_login del usuario)
+    field = _IMAGE_FIELDS[sender]
+    instance._imagen_prev = None
+    if update_fields is not None and field not in update_fields:
+        return
+    prev = sender.objects.filter(pk=instance.pk).values_list(field, flat=True).first() if instance.pk else None
+    instance._imagen_prev = prev or ""
+
+
+def _image_post_save(sender, instance, **kwargs):
+    prev = getattr(instance, "_imagen_prev", None)
+    fieldfile = getattr(instance, _IMAGE_FIELDS[sender])
+    if prev is None or prev == (fieldfile.name or ""):
+        return
+
+    def run():
+        storage = fieldfile.storage
+        # el original viejo puede seguir en uso por otra fila (forms: "ruta /media/...")
+        if prev and not storage.exists(prev):
+            images.delete_derivatives(storage, prev)
+        if fieldfile:
+            images.generate(fieldfile)
+    transaction.on_commit(run)
+
+
+for _model in _IMAGE_FIELDS:
+    pre_save.connect(_image_pre_save, sender=_model, dispatch_uid=f"imagen_pre_{_model._meta.label}")
+    post_save.connect(_image_post_save, sender=_model, dispatch_uid=f"imagen_post_{_model._meta.label}")
+
+
+@receiver(pre_delete, sender=ResenaItem)
+def _resena_item_deleted(sender, instance, **kwargs):
+    # Todo borrado de un item descuenta su puntaje de los resúmenes de rating: la baja de la
+    # reseña, la edición que saca un tipo y las cascadas al borrar una cursada, materia,
+    # comisión, departamento o usuario. Es pre_delete: la reseña todavía existe.
+    mca = (
+        MateriaComisionAnio.objects
+        .filter(resenas=instance.resena_id)
+        .select_related("materia")
+        .only("id", "materia__id", "materia__departamento_id")
+        .first()
+    )
+    ratings.unregister_items([instance], mca)
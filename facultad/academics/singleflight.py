@@ -0,0 +1,160 @@
+# academics/singleflight.py
+# Cache para agregados caros (ratings, estadísticas del dashboard) que no se cae
+# cuando una clave vence en hora pico:
+# - un solo worker recalcula (lock con cache.add); el resto espera o sirve el valor viejo
+# - refresco anticipado probabilístico (XFetch): cuanto más cerca del vencimiento y más
+#   caro el cálculo, más probable que un request lo recalcule antes de que venza
+# - stale-while-revalidate: pasado el TTL el valor se sigue sirviendo durante stale_ttl
+#   mientras alguien lo recalcula
+# - invalidate() cambia la generación de la clave: un cálculo que arrancó antes no puede
+#   dejar su valor viejo guardado (al leerlo no coincide la generación y se descarta)
+# - métricas opcionales (SINGLEFLIGHT_METRICS=True): hit/miss/stale/early/recompute/wait/
+#   wait_timeout en el mismo cache, así se suman las de todos los workers (manage.py cache_stats)
+import math
+import random
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+METRICS = ("hit", "miss", "stale", "early", "recompute", "wait", "wait_timeout")
+
+
+def _cache():
+    return caches[getattr(settings, "SINGLEFLIGHT_CACHE_ALIAS", "default")]
+
+
+def _metric_key(name):
+    return f"sf:metric:{name}"
+
+
+def metrics_enabled() -> bool:
+    return getattr(settings, "SINGLEFLIGHT_METRICS", False)
+
+
+def _count(cache, name):
+    if not metrics_enabled():
+        return  # un incr por request no se justifica si nadie mira los contadores
+    key = _metric_key(name)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def metrics() -> dict:
+    """Contadores acumulados desde el último reset_metrics()."""
+    found = _cache().get_many([_metric_key(m) for m in METRICS])
+    return {m: found.get(_metric_key(m), 0) for m in METRICS}
+
+
+def reset_metrics():
+    _cache().delete_many([_metric_key(m) for m in METRICS])
+
+
+def _acquire(cache, key, lock_timeout):
+    token = uuid.uuid4().hex
+    return token if cache.add(f"{key}:lock", token, lock_timeout) else None
+
+
+def _release(cache, key, token):
+    # solo libero mi lock (si venció y lo tomó otro, no se lo borro)
+    if cache.get(f"{key}:lock") == token:
+        cache.delete(f"{key}:lock")
+
+
+def _gen_key(key):
+    return f"{key}:gen"
+
+
+def _read(cache, key):
+    """(entrada, generación actual); la entrada es None si no está o es de otra generación."""
+    found = cache.get_many([key, _gen_key(key)])
+    gen = found.get(_gen_key(key))
+    entry = found.get(key)
+    if entry is not None and (len(entry) != 4 or entry[3] != gen):
+        entry = None  # la calculó alguien que arrancó antes del último invalidate()
+    return entry, gen
+
+
+def _recompute(cache, key, compute, ttl, stale_ttl, gen):
+    t0 = time.perf_counter()
+    value = compute()
+    delta = time.perf_counter() - t0
+    # (valor, vence_en, cuánto tardó el cálculo, generación): la clave vive ttl + stale_ttl
+    if cache.get(_gen_key(key)) == gen:
+        cache.set(key, (value, time.time() + ttl, delta, gen), ttl + stale_ttl)
+    _count(cache, "recompute")
+    return value
+
+
+def get_or_compute(key, compute, ttl=60, stale_ttl=None, beta=1.0,
+                   lock_timeout=10, wait_timeout=2.0, poll_interval=0.02):
+    """
+    Devuelve el valor cacheado bajo key o lo calcula con compute() sin que varios
+    workers lo recalculen a la vez.
+    - ttl: segundos en los que el valor se considera fresco.
+    - stale_ttl: segundos extra en los que se sirve vencido mientras se recalcula (default: ttl).
+    - beta: agresividad del refresco anticipado (0 lo desactiva).
+    - wait_timeout: cuánto espera un request sin valor a que otro termine de calcularlo;
+      pasado ese tiempo lo calcula él mismo.
+    """
+    cache = _cache()
+    stale_ttl = ttl if stale_ttl is None else stale_ttl
+
+    entry, gen = _read(cache, key)
+    if entry is not None:
+        value, expires_at, delta, _ = entry
+        now = time.time()
+        # XFetch: -log(u) con u en (0, 1] es >= 0 y casi siempre chico
+        if now - delta * beta * math.log(1.0 - random.random()) < expires_at:
+            _count(cache, "hit")
+            return value
+        _count(cache, "stale" if now >= expires_at else "early")
+        token = _acquire(cache, key, lock_timeout)
+        if token:
+            try:
+                return _recompute(cache, key, compute, ttl, stale_ttl, gen)
+            finally:
+                _release(cache, key, token)
+        # otro worker ya lo está recalculando: sirvo el valor que hay
+        return value
+
+    _count(cache, "miss")
+    deadline = time.monotonic() + wait_timeout
+    waited = False
+    while True:
+        token = _acquire(cache, key, lock_timeout)
+        if token:
+            try:
+                return _recompute(cache, key, compute, ttl, stale_ttl, gen)
+            finally:
+                _release(cache, key, token)
+        if not waited:
+            _count(cache, "wait")
+            waited = True
+        time.sleep(poll_interval)
+        entry, gen = _read(cache, key)
+        if entry is not None:
+            return entry[0]
+        if time.monotonic() >= deadline:
+            # el que tenía el lock tarda demasiado (o se cayó): calculo sin esperarlo
+            _count(cache, "wait_timeout")
+            return _recompute(cache, key, compute, ttl, stale_ttl, gen)
+
+
+def _invalidate_now(keys):
+    cache = _cache()
+    # generación nueva antes de borrar: un cálculo en curso ya no puede guardar lo suyo
+    cache.set_many({_gen_key(k): uuid.uuid4().hex for k in keys}, None)
+    cache.delete_many(keys)
+
+
+def invalidate(*keys):
+    """Invalida las claves cuando se confirma la transacción actual (o ya, si no hay una)."""
+    keys = [k for k in keys if k]
+    if keys:
+        transaction.on_commit(lambda: _invalidate_now(keys))
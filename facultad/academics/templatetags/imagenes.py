@@ -0,0 +1,42 @@
+# academics/templatetags/imagenes.py
+# {% load imagenes %}
+#   {% srcset obj.imagen %}            -> "…foto.jpg.w160.webp 160w, …w320.webp 320w, ..."
+#   {% srcset obj.imagen "jpg" as s %} -> lo mismo en JPEG, en una variable
+#   {% picture obj.imagen alt="…" sizes="320px" class="…" %}
+#       -> <picture> con el WebP, JPEG de respaldo y el original como src
+# Si el valor no es un archivo (URL, SVG) o todavía no tiene derivados, srcset devuelve ""
+# y picture queda en un <img> con el original. Acá no se genera nada (ver images.py).
+from django import template
+from django.utils.html import format_html
+
+from academics import images
+
+register = template.Library()
+
+
+def _is_file(value) -> bool:
+    return bool(value) and hasattr(value, "storage") and hasattr(value, "url")
+
+
+@register.simple_tag
+def srcset(value, ext="webp"):
+    if not _is_file(value) or ext not in images.FORMATS:
+        return ""
+    return images.srcset(value, ext)
+
+
+@register.simple_tag
+def picture(value, alt="", sizes="100vw", **attrs):
+    if not _is_file(value):
+        return ""
+    webp, jpg = srcset(value, "webp"), srcset(value, "jpg")
+    extra = format_html(
+        "".join(f' {k.replace("_", "-")}="{{}}"' for k in attrs), *attrs.values()
+    )
+    if not webp:
+        return format_html('<img src="{}" alt="{}" loading="lazy" decoding="async"{}>', value.url, alt, extra)
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" alt="{}" loading="lazy" decoding="async"{}></picture>',
+        webp, sizes, value.url, jpg, sizes, alt, extra,
+    )
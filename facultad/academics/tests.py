@@ -1,3 +1,776 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import shutil
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
+from urllib.parse import urlencode
 
-# Create your tests here.
+from better_profanity import Profanity
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.template import Context, Template
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+from rest_framework.test import APIClient
+
+from academics import (
+    api, catalog_cache, dashboard, exports, idempotency, images, notas_import, progress, ratings,
+    review_queue, reviews, rollover, search, singleflight,
+)
+from academics.censor import CensorEngine, default_words, recensor_items, wordlist_version
+from academics.management.commands.benchmark_censor import _synthetic_corpus
+from academics.models import (
+    Comision, Department, Materia, MateriaComisionAnio, Nota, ProgresoAlumno, RatingSummary, Resena,
+    ResenaItem, ResenaPendiente,
+)
+from people.models import User
+
+# primera reseña de la cursada con 4 items: sesión y usuario, cursada + permisos (1), y en
+# un savepoint (2): Resena + items (2), las filas de RatingSummary que falten en un INSERT
+# (1) y un UPDATE por clave (4 items x total/cursada = 8)
+SUBMIT_QUERIES = 16
+
+
+class AcademicsTestCase(TestCase):
+    """Un departamento, una materia con dos comisiones en 2025 y tres alumnos aprobados."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.depto = Department.objects.create(nombre="Básicas")
+        cls.materia = Materia.objects.create(nombre="Álgebra", departamento=cls.depto)
+        cls.com1 = Comision.objects.create(nombre="K1")
+        cls.com2 = Comision.objects.create(nombre="K2")
+        cls.prof = User.objects.create(username="prof", email="prof@utn.edu.ar", rol=User.Role.PROFESOR)
+        cls.jtp = User.objects.create(username="jtp", email="jtp@utn.edu.ar", rol=User.Role.PROFESOR)
+        cls.mca = MateriaComisionAnio.objects.create(
+            materia=cls.materia, comision=cls.com1, anio=2025, titular=cls.prof, jtp=cls.jtp,
+        )
+        cls.mca2 = MateriaComisionAnio.objects.create(
+            materia=cls.materia, comision=cls.com2, anio=2025, titular=cls.prof,
+        )
+        cls.alumnos = []
+        for i in range(3):
+            alumno = User.objects.create_user(
+                username=f"alu{i}", email=f"alu{i}@utn.edu.ar", password="x",
+                rol=User.Role.ALUMNO, legajo=f"L{i}",
+            )
+            Nota.objects.create(alumno=alumno, mca=cls.mca, estado=Nota.Estado.APROBADA, nota=8)
+            cls.alumnos.append(alumno)
+
+    def setUp(self):
+        cache.clear()
+
+    def client_for(self, user):
+        client = Client()
+        client.force_login(user)
+        return client
+
+    def evaluar(self, alumno, mca=None, **data):
+        url = reverse("academics:evaluar_mca", args=[(mca or self.mca).pk])
+        return self.client_for(alumno).post(url, data)
+
+
+class CatalogQueryCountTests(AcademicsTestCase):
+    # sesión + usuario + departamento/materia + listado + ratings agrupados
+    LIST_QUERIES = 5
+
+    def _agregar_materias(self, n):
+        for i in range(n):
+            Materia.objects.create(nombre=f"Materia {i}", departamento=self.depto)
+
+    def _agregar_comisiones(self, n):
+        for i in range(n):
+            com = Comision.objects.create(nombre=f"X{i}")
+            MateriaComisionAnio.objects.create(materia=self.materia, comision=com, anio=2025, titular=self.prof)
+
+    def test_materias_list_queries_do_not_grow_with_rows(self):
+        self.evaluar(self.alumnos[0], materia_score="5")
+        client = self.client_for(self.alumnos[0])
+        url = reverse("academics:subjects_by_dept", args=[self.depto.pk])
+        with self.assertNumQueries(self.LIST_QUERIES):
+            response = client.get(url)
+        self.assertContains(response, "5.0")
+
+        self._agregar_materias(20)
+        cache.clear()
+        with self.assertNumQueries(self.LIST_QUERIES):
+            response = client.get(url)
+        self.assertContains(response, "Materia 19")
+
+    def test_comisiones_list_queries_do_not_grow_with_rows(self):
+        self.evaluar(self.alumnos[0], materia_score="5", comision_score="4")
+        client = self.client_for(self.alumnos[0])
+        url = reverse("academics:materia_comisiones", args=[self.materia.pk, 2025])
+        with self.assertNumQueries(self.LIST_QUERIES):
+            response = client.get(url)
+        self.assertContains(response, "4.0")
+
+        self._agregar_comisiones(20)
+        cache.clear()
+        with self.assertNumQueries(self.LIST_QUERIES):
+            response = client.get(url)
+        self.assertContains(response, "X19")
+
+    def test_ratings_for_defaults_missing_ids(self):
+        self.evaluar(self.alumnos[0], materia_score="5", titular_score="3")
+        found = ratings.ratings_for(ratings.PROFESOR, [self.prof.pk, 999])
+        self.assertEqual(found[self.prof.pk], (3.0, 1))
+        self.assertEqual(found[999], ratings.SIN_RATING)
+
+
+class ReviewSubmissionTests(AcademicsTestCase):
+    def test_submit_creates_items_and_updates_ratings(self):
+        response = self.evaluar(
+            self.alumnos[0], materia_score="5", comision_score="4", titular_score="3",
+            jtp_score="9", materia_comment="  que mierda de materia ",
+        )
+        self.assertRedirects(response, reverse("people:perfil"), fetch_redirect_response=False)
+        items = dict(ResenaItem.objects.values_list("target_type", "puntuacion"))
+        # jtp_score=9 está fuera de rango: no se carga
+        self.assertEqual(items, {"MATERIA": 5, "COMISION": 4, "TITULAR": 3})
+        self.assertEqual(
+            ResenaItem.objects.get(target_type="MATERIA").comentario_censurado, "que **** de materia",
+        )
+        self.assertEqual(ratings.get_rating("MATERIA", self.materia.pk), (5.0, 1))
+        self.assertEqual(ratings.get_rating("COMISION", self.com1.pk, self.mca.pk), (4.0, 1))
+        self.assertEqual(ratings.get_rating("TITULAR", self.prof.pk), (3.0, 1))
+
+    def test_second_submit_is_rejected(self):
+        self.evaluar(self.alumnos[0], materia_score="5")
+        self.evaluar(self.alumnos[0], materia_score="1")
+        self.assertEqual(Resena.objects.count(), 1)
+        self.assertEqual(ratings.get_rating("MATERIA", self.materia.pk), (5.0, 1))
+
+    def test_without_valid_nota_nothing_is_created(self):
+        Nota.objects.filter(alumno=self.alumnos[0]).update(estado=Nota.Estado.CURSANDO)
+        self.evaluar(self.alumnos[0], materia_score="5")
+        self.assertFalse(Resena.objects.exists())
+
+    def test_submit_query_count(self):
+        client = self.client_for(self.alumnos[0])
+        url = reverse("academics:evaluar_mca", args=[self.mca.pk])
+        data = {"materia_score": "5", "comision_score": "4", "titular_score": "3", "jtp_score": "2"}
+        with self.assertNumQueries(SUBMIT_QUERIES):
+            client.post(url, data)
+        self.assertEqual(ResenaItem.objects.count(), 4)
+
+
+class IdempotencyTests(AcademicsTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = self.client_for(self.alumnos[0])
+        self.key = idempotency.new_key()
+
+    def post(self, mca_id=None, **data):
+        url = reverse("academics:evaluar_mca", args=[mca_id or self.mca.pk])
+        return self.client.post(url, {idempotency.FIELD: self.key, **data})
+
+    def test_reenvio_devuelve_la_primera_respuesta(self):
+        first = self.post(materia_score="5")
+        with self.assertNumQueries(3):  # sesión, usuario y la cursada; nada de escrituras
+            again = self.post(materia_score="1")
+        self.assertEqual(again["Location"], first["Location"])
+        self.assertEqual(ratings.get_rating("MATERIA", self.materia.pk), (5.0, 1))
+
+    def test_404_no_reserva_la_clave(self):
+        self.assertEqual(self.post(mca_id=99999, materia_score="5").status_code, 404)
+        self.post(materia_score="5")
+        self.assertEqual(ratings.get_rating("MATERIA", self.materia.pk), (5.0, 1))
+
+    def test_error_de_validacion_libera_la_clave(self):
+        self.post()
+        self.post(materia_score="4")
+        self.assertEqual(ratings.get_rating("MATERIA", self.materia.pk), (4.0, 1))
+
+    def test_excepcion_libera_la_clave(self):
+        with mock.patch.object(reviews, "crear_resena", side_effect=RuntimeError("boom")):
+            with self.assertRaises(RuntimeError):
+                self.post(materia_score="3")
+        self.post(materia_score="3")
+        self.assertEqual(ratings.get_rating("MATERIA", self.materia.pk), (3.0, 1))
+
+
+class RatingSummaryDeleteTests(AcademicsTestCase):
+    """Después de cualquier borrado los resúmenes tienen que dar lo mismo que recalcularlos."""
+
+    def setUp(self):
+        super().setUp()
+        Nota.objects.create(alumno=self.alumnos[0], mca=self.mca2, estado=Nota.Estado.APROBADA, nota=7)
+        for i, alumno in enumerate(self.alumnos):
+            self.evaluar(alumno, materia_score=str(i + 3), comision_score="4", titular_score="5", jtp_score="2")
+        self.evaluar(self.alumnos[0], self.mca2, materia_score="1", comision_score="3", titular_score="4")
+
+    def summaries(self):
+        fields = ("target_type", "target_id", "mca_id", "suma", "cantidad") + ratings.STAR_FIELDS
+        return set(RatingSummary.objects.filter(cantidad__gt=0).values_list(*fields))
+
+    def assertSummariesRebuilt(self):
+        actual = self.summaries()
+        ratings.rebuild_summaries()
+        self.assertEqual(actual, self.summaries())
+
+    def test_baja_de_la_resena(self):
+        self.client_for(self.alumnos[1]).post(reverse("academics:eliminar_resena_mca", args=[self.mca.pk]))
+        self.assertEqual(ratings.get_rating("MATERIA", self.materia.pk), ((3 + 5 + 1) / 3, 3))
+        self.assertSummariesRebuilt()
+
+    def test_edicion_que_saca_un_tipo(self):
+        resena = Resena.objects.get(alumno=self.alumnos[0], mca=self.mca)
+        reviews.editar_resena(resena, self.mca, reviews.build_items(self.mca, {"materia_score": "5"}))
+        self.assertEqual(ratings.get_rating("JTP", self.jtp.pk), (2.0, 2))
+        self.assertSummariesRebuilt()
+
+    def test_cascadas(self):
+        borrados = [
+            lambda: self.jtp.delete(),
+            lambda: self.alumnos[2].delete(),
+            lambda: self.com2.delete(),
+            lambda: self.mca.delete(),
+            lambda: self.depto.delete(),
+        ]
+        for borrar in borrados:
+            borrar()
+            self.assertSummariesRebuilt()
+        self.assertEqual(self.summaries(), set())
+        self.assertEqual(ratings.get_rating("MATERIA", self.materia.pk), ratings.SIN_RATING)
+
+
+class ProfileConditionalTests(AcademicsTestCase):
+    def setUp(self):
+        super().setUp()
+        self.evaluar(self.alumnos[0], materia_score="4", materia_comment="muy buena")
+        self.evaluar(self.alumnos[1], materia_score="2", materia_comment="regular")
+        self.url = reverse("academics:perfil_materia", args=[self.materia.pk])
+
+    def get(self, **headers):
+        return Client().get(self.url, headers=headers)
+
+    def test_etag_sin_last_modified(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Last-Modified", response.headers)
+        self.assertEqual(self.get(if_none_match=response["ETag"]).status_code, 304)
+        # sin Last-Modified, If-Modified-Since no alcanza para un 304
+        self.assertEqual(self.get(if_modified_since="Fri, 01 Jan 2100 00:00:00 GMT").status_code, 200)
+
+    def test_baja_cambia_el_etag(self):
+        etag = self.get()["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client_for(self.alumnos[1]).post(reverse("academics:eliminar_resena_mca", args=[self.mca.pk]))
+        self.assertEqual(self.get(if_none_match=etag).status_code, 200)
+
+    def test_recensura_cambia_el_etag(self):
+        etag = self.get()["ETag"]
+        ResenaItem.objects.update(censura_version="vieja")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(recensor_items(ResenaItem.objects.all()), 2)
+        self.assertEqual(self.get(if_none_match=etag).status_code, 200)
+
+    def test_recensura_por_paginas(self):
+        ResenaItem.objects.update(censura_version="vieja", comentario_censurado="")
+        with self.assertNumQueries(2 * 2 + 1):  # SELECT + bulk_update por página, y la última vacía
+            self.assertEqual(recensor_items(ResenaItem.objects.all(), batch_size=1), 2)
+        ResenaItem.objects.update(censura_version="vieja", comentario_censurado="")
+        with self.assertNumQueries(2):  # una página incompleta: no hace falta pedir otra
+            self.assertEqual(recensor_items(ResenaItem.objects.all(), batch_size=5), 2)
+        self.assertEqual(
+            set(ResenaItem.objects.values_list("comentario_censurado", "censura_version")),
+            {("muy buena", wordlist_version()), ("regular", wordlist_version())},
+        )
+
+    def test_orden_igual_en_todos_los_perfiles(self):
+        self.evaluar(self.alumnos[2], titular_score="5", titular_comment="la nueva")
+        ResenaItem.objects.filter(target_type=ResenaItem.Target.TITULAR).update(
+            created_at=timezone.now() + timedelta(days=1)
+        )
+        Nota.objects.create(alumno=self.alumnos[2], mca=self.mca2, estado=Nota.Estado.APROBADA, nota=7)
+        self.evaluar(self.alumnos[2], mca=self.mca2, titular_score="3", titular_comment="la vieja")
+        ResenaItem.objects.filter(comentario="la vieja").update(created_at=timezone.now() - timedelta(days=1))
+        url = reverse("people:perfil_profesor", args=[self.prof.username])
+        for order, primero in [("ASC", "la vieja"), ("desc", "la nueva"), ("otro", "la nueva")]:
+            with self.subTest(order=order):
+                html = Client().get(url, {"order": order}).content.decode()
+                otro = "la nueva" if primero == "la vieja" else "la vieja"
+                self.assertLess(html.index(primero), html.index(otro))
+
+
+class CatalogCacheTests(AcademicsTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = self.client_for(self.alumnos[0])
+        self.urls = [
+            reverse("academics:home"),
+            reverse("academics:subjects_by_dept", args=[self.depto.pk]),
+            reverse("academics:materia_comisiones", args=[self.materia.pk, 2025]),
+        ]
+
+    def test_hit_only_loads_the_session(self):
+        for url in self.urls:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        for url in self.urls:
+            with self.assertNumQueries(2):  # sesión + usuario
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_changes_bump_the_cached_grids(self):
+        for url in self.urls:
+            self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.evaluar(self.alumnos[1], materia_score="5", comision_score="4")
+        self.assertContains(self.client.get(self.urls[1]), "5.0")
+        self.assertContains(self.client.get(self.urls[2]), "4.0")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.com1.nombre = "KXYZ"
+            self.com1.save()
+        self.assertContains(self.client.get(self.urls[2]), "KXYZ")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.prof.first_name = "Zamenhof"
+            self.prof.save()
+        self.assertContains(self.client.get(self.urls[2]), "Zamenhof")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.depto.nombre = "Depto nuevo"
+            self.depto.save()
+        self.assertContains(self.client.get(self.urls[0]), "Depto nuevo")
+        self.assertContains(self.client.get(self.urls[1]), "Depto nuevo")
+
+    def test_profesor_solo_bumpea_si_cambia_algo_visible(self):
+        def version():
+            return catalog_cache.versions([catalog_cache.PROFESORES])[0]
+
+        antes = version()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client_for(self.prof)  # login: save(update_fields=["last_login"])
+            self.prof.save()            # sin cambios
+        self.assertEqual(version(), antes)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.prof.rol = User.Role.ALUMNO
+            self.prof.save()
+        self.assertNotEqual(version(), antes)
+
+
+class CensorTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.words = default_words()
+        cls.engine = CensorEngine(cls.words)
+
+    def test_no_junta_palabras_sueltas(self):
+        for texto in ["notas: 7 1 7", "fue 5 3 x", "la clase de a s s", "h.d.p", "f u c k",
+                      "s h i t", "cl 1 t", "notas: 7 1 7 ok"]:
+            with self.subTest(texto=texto):
+                self.assertEqual(self.engine.censor(texto), texto)
+
+    def test_frases_de_la_lista(self):
+        self.assertEqual(self.engine.censor("bull shit ok"), "**** ok")
+        self.assertEqual(self.engine.censor("hand job"), "****")
+        self.assertEqual(self.engine.censor("un doggy-style"), "un ****")
+        self.assertEqual(self.engine.censor("2 girls 1 cup!"), "****!")
+        self.assertEqual(self.engine.censor("son of a bitch"), "son of a ****")
+        self.assertEqual(self.engine.censor("que Mierda, a$$hole"), "que ****, ****")
+
+    def test_igual_que_better_profanity(self):
+        # muestra chica: better_profanity tarda ~50ms por comentario
+        malas = [w for w in self.words if w.isalpha()]
+        corpus = _synthetic_corpus(40, 7, malas)
+        profanity = Profanity(self.words)
+        self.assertEqual([self.engine.censor(t) for t in corpus], [profanity.censor(t) for t in corpus])
+
+
+class SingleFlightTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _run_threads(self, n, target):
+        threads = [threading.Thread(target=target) for _ in range(n)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    def test_concurrent_misses_compute_once(self):
+        calls, out = [], []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.2)
+            return 42
+
+        self._run_threads(20, lambda: out.append(singleflight.get_or_compute("sf-test", slow, ttl=1)))
+        self.assertEqual(out, [42] * 20)
+        self.assertEqual(len(calls), 1)
+
+        # vencido (pasado ttl + stale_ttl): de nuevo un solo cálculo
+        time.sleep(2.05)
+        calls.clear()
+        out.clear()
+        self._run_threads(20, lambda: out.append(singleflight.get_or_compute("sf-test", slow, ttl=1)))
+        self.assertEqual(out, [42] * 20)
+        self.assertEqual(len(calls), 1)
+
+    def test_invalidate_during_compute_discards_the_old_value(self):
+        started, release = threading.Event(), threading.Event()
+
+        def old():
+            started.set()
+            release.wait(2)
+            return "viejo"
+
+        worker = threading.Thread(target=lambda: singleflight.get_or_compute("sf-inv", old, ttl=60))
+        worker.start()
+        started.wait(2)
+        singleflight.invalidate("sf-inv")  # sin transacción abierta: en el momento
+        release.set()
+        worker.join()
+        self.assertEqual(singleflight.get_or_compute("sf-inv", lambda: "nuevo", ttl=60), "nuevo")
+
+    def test_metrics_are_optional(self):
+        singleflight.reset_metrics()
+        singleflight.get_or_compute("sf-m", lambda: 1, ttl=60)
+        singleflight.get_or_compute("sf-m", lambda: 1, ttl=60)
+        self.assertEqual(sum(singleflight.metrics().values()), 0)
+        with override_settings(SINGLEFLIGHT_METRICS=True):
+            singleflight.get_or_compute("sf-m", lambda: 1, ttl=60)
+        self.assertEqual(singleflight.metrics()["hit"], 1)
+
+
+class DashboardQueryBudgetTests(AcademicsTestCase):
+    def _dashboard_queries(self, alumno):
+        progress.refresh_progress([alumno.pk])  # el snapshot al día, como lo ve el alumno
+        with self.assertNumQueries(dashboard.QUERY_BUDGET):
+            return dashboard.dashboard_context(alumno)
+
+    def test_budget_does_not_grow_with_notas_and_resenas(self):
+        alumno = self.alumnos[0]
+        ctx = self._dashboard_queries(alumno)
+        self.assertEqual(ctx["donut_counts"]["Aprobada"], 1)
+        self.assertEqual(len(ctx["mcas_para_evaluar"]), 1)
+
+        self.evaluar(alumno, materia_score="5", materia_comment="muy buena")
+        for i in range(15):
+            com = Comision.objects.create(nombre=f"D{i}")
+            mca = MateriaComisionAnio.objects.create(materia=self.materia, comision=com, anio=2024, titular=self.prof)
+            Nota.objects.create(alumno=alumno, mca=mca, estado=Nota.Estado.APROBADA, nota=7)
+            self.evaluar(alumno, mca=mca, materia_score="4", titular_score="3", materia_comment=f"c{i}")
+        ctx = self._dashboard_queries(alumno)
+        self.assertEqual(ctx["donut_counts"]["Aprobada"], 16)
+        self.assertEqual(ctx["comentarios_total"], 31)
+
+
+class ApiQueryCountTests(AcademicsTestCase):
+    ENDPOINTS = ["departamento", "materia", "cursada", "profesor"]
+
+    def setUp(self):
+        super().setUp()
+        self.evaluar(self.alumnos[0], materia_score="5", comision_score="4", titular_score="3")
+        self.api = APIClient()
+        self.api.force_authenticate(self.alumnos[0])  # sin consultas de sesión
+
+    def _url(self, name, pk=None, **params):
+        if pk is None:
+            url = reverse(f"api:{name}-list", kwargs={"version": "v1"})
+        else:
+            url = reverse(f"api:{name}-detail", kwargs={"version": "v1", "pk": pk})
+        return f"{url}?{urlencode(params)}" if params else url
+
+    def _check(self, url, queries):
+        with self.assertNumQueries(queries):
+            response = self.api.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        # el 304 sale solo de las versiones del catálogo: ninguna consulta
+        with self.assertNumQueries(0):
+            again = self.api.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(again.status_code, 304, url)
+        return response
+
+    def test_list_detail_and_not_modified(self):
+        for name in self.ENDPOINTS:
+            con_rating = name != "departamento"
+            with self.subTest(endpoint=name):
+                response = self._check(self._url(name), 2 if con_rating else 1)
+                pk = response.data["results"][0]["id"]
+                self._check(self._url(name, pk), 2 if con_rating else 1)
+                self._check(self._url(name, fields="id"), 1)
+
+    def test_list_queries_do_not_grow_with_rows(self):
+        for i in range(30):
+            com = Comision.objects.create(nombre=f"X{i}")
+            MateriaComisionAnio.objects.create(materia=self.materia, comision=com, anio=2025, titular=self.prof, jtp=self.jtp)
+        response = self._check(self._url("cursada", materia=self.materia.pk, anio=2025), 2)
+        self.assertEqual(len(response.data["results"]), 32)
+
+    def test_rating_change_moves_the_etag(self):
+        url = self._url("materia")
+        etag = self.api.get(url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.evaluar(self.alumnos[1], materia_score="1")
+        response = self.api.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"][0]["rating"], {"promedio": 3.0, "cantidad": 2})
+        # sin rating pedido el ETag no depende de las reseñas
+        url = self._url("materia", fields="id,nombre")
+        etag = self.api.get(url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.evaluar(self.alumnos[2], materia_score="2")
+        self.assertEqual(self.api.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_ratings_batch_one_query_per_type(self):
+        url = reverse("api:ratings", kwargs={"version": "v1"})
+        params = {name: "1,2,3" for name in api.RATING_TYPES}
+        with self.assertNumQueries(len(api.RATING_TYPES)):
+            response = self.api.get(url, params)
+        self.assertEqual(response.data["materia"][str(self.materia.pk)], {"promedio": 5.0, "cantidad": 1})
+        response = self.api.post(url, {"titular": [self.prof.pk]}, format="json")
+        self.assertEqual(response.data, {"titular": {str(self.prof.pk): {"promedio": 3.0, "cantidad": 1}}})
+        with override_settings(RATINGS_BATCH_MAX=2):
+            self.assertEqual(self.api.get(url, {"materia": "1,2,3"}).status_code, 400)
+
+
+class ReviewQueueTests(AcademicsTestCase):
+    def encolar(self, alumno, **data):
+        return review_queue.encolar(alumno, self.mca, reviews.build_items(self.mca, data or {"materia_score": "4"}))
+
+    def test_drena_la_cola(self):
+        with override_settings(RESENAS_WRITE_BEHIND=True):
+            for alumno in self.alumnos:
+                self.evaluar(alumno, materia_score="4", materia_comment="mierda")
+        self.assertEqual(ResenaPendiente.objects.count(), 3)
+        Nota.objects.filter(alumno=self.alumnos[2]).update(estado=Nota.Estado.CURSANDO)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            stats = review_queue.drain(batch_size=2)
+        self.assertEqual((stats["publicadas"], stats["errores"]), (2, 1))
+        self.assertEqual(ratings.get_rating(ResenaItem.Target.MATERIA, self.materia.pk), (4.0, 2))
+        self.assertEqual(ResenaItem.objects.filter(comentario_censurado="****").count(), 2)
+        self.assertEqual(ResenaPendiente.objects.get().estado, ResenaPendiente.Estado.ERROR)
+
+    def test_reseña_creada_en_el_medio_no_frena_el_lote(self):
+        for alumno in self.alumnos:
+            self.encolar(alumno)
+        directa = reviews.build_items(self.mca, {"materia_score": "2"})
+        build_items = reviews.build_items
+
+        def build_items_y_resena_directa(mca, data):
+            # la reseña aparece después del chequeo del lote, justo antes del insert
+            if not Resena.objects.exists():
+                reviews.crear_resena(self.alumnos[1], self.mca, directa)
+            return build_items(mca, data)
+
+        with mock.patch.object(reviews, "build_items", build_items_y_resena_directa):
+            self.assertEqual(review_queue.drain_batch(), (2, 1))
+        fila = ResenaPendiente.objects.get()
+        self.assertEqual((fila.alumno, fila.estado, fila.error),
+                         (self.alumnos[1], ResenaPendiente.Estado.ERROR, review_queue.DUPLICADA))
+        self.assertEqual(Resena.objects.count(), 3)
+        self.assertEqual(ratings.get_rating(ResenaItem.Target.MATERIA, self.materia.pk), (10 / 3, 3))
+
+    def test_claim_no_toma_filas_de_otro_worker(self):
+        for alumno in self.alumnos:
+            self.encolar(alumno)
+        primero = review_queue._claim(2)
+        self.assertEqual(len(primero), 2)
+        segundo = review_queue._claim(10)
+        self.assertEqual([p.alumno for p in segundo], [self.alumnos[2]])
+        self.assertEqual(review_queue._claim(10), [])
+
+        # el worker del primer lote se cayó: pasado el timeout, otro lo vuelve a tomar
+        ResenaPendiente.objects.filter(pk__in=[p.pk for p in primero]).update(
+            tomada_at=timezone.now() - timedelta(seconds=review_queue.claim_timeout() + 1),
+        )
+        self.assertEqual({p.pk for p in review_queue._claim(10)}, {p.pk for p in primero})
+
+    def test_error_inesperado_devuelve_el_lote(self):
+        self.encolar(self.alumnos[0])
+        with mock.patch.object(review_queue, "_procesar", side_effect=RuntimeError("boom")):
+            with self.assertRaises(RuntimeError):
+                review_queue.drain_batch()
+        self.assertEqual(ResenaPendiente.objects.get().estado, ResenaPendiente.Estado.PENDIENTE)
+        self.assertEqual(review_queue.drain_batch(), (1, 0))
+
+    def test_reencolar_resetea_la_fecha(self):
+        self.encolar(self.alumnos[0])
+        viejo = timezone.now() - timedelta(days=3)
+        ResenaPendiente.objects.update(estado=ResenaPendiente.Estado.ERROR, error="x", created_at=viejo)
+        self.encolar(self.alumnos[0], materia_score="5")
+        fila = ResenaPendiente.objects.get()
+        self.assertEqual((fila.estado, fila.error, fila.datos["materia_score"]), (ResenaPendiente.Estado.PENDIENTE, "", 5))
+        self.assertGreater(fila.created_at, viejo + timedelta(days=2))
+        self.assertLess(review_queue.depth()["espera_max"], 60)
+
+
+class ProgressDeltaTests(AcademicsTestCase):
+    CAMPOS = ["cursando", "promocionada", "aprobada", "total_notas", "materias", "nota_suma",
+              "nota_cantidad", "plan_tocadas"]
+
+    def _snapshot(self, alumno):
+        return ProgresoAlumno.objects.filter(alumno=alumno).values(*self.CAMPOS).get()
+
+    def _check(self, alumno, cambio):
+        # el cambio se aplica como diferencia, sin recalcular; después comparo con el recálculo
+        with mock.patch.object(progress, "refresh_progress", side_effect=AssertionError("recalculó")):
+            with self.captureOnCommitCallbacks(execute=True):
+                cambio()
+        incremental = self._snapshot(alumno)
+        progress.refresh_progress([alumno.pk])
+        self.assertEqual(incremental, self._snapshot(alumno))
+
+    def test_delta_igual_al_recalculo(self):
+        alumno = self.alumnos[0]
+        progress.refresh_progress([alumno.pk])
+        otra = Materia.objects.create(nombre="Física I", departamento=self.depto)  # está en el plan
+        mca = MateriaComisionAnio.objects.create(materia=otra, comision=self.com1, anio=2025, titular=self.prof)
+        nota = Nota(alumno=alumno, mca=mca, estado=Nota.Estado.CURSANDO)
+
+        self._check(alumno, nota.save)
+        self.assertEqual(self._snapshot(alumno)["plan_tocadas"], 1)
+        nota.estado, nota.nota = Nota.Estado.APROBADA, 9
+        self._check(alumno, nota.save)
+        nota.mca = self.mca2  # misma materia que la otra nota del alumno
+        self._check(alumno, nota.save)
+        self._check(alumno, nota.delete)
+
+
+class NotasImportTests(AcademicsTestCase):
+    def importar(self, text, **kwargs):
+        return notas_import.import_notas(csv.DictReader(io.StringIO(text)), **kwargs)
+
+    def test_upsert_y_rechazos(self):
+        User.objects.filter(pk=self.prof.pk).update(legajo="P1")
+        rechazadas = []
+        stats = self.importar(
+            "legajo,materia,comision,anio,estado,nota\n"
+            "L0,algebra,k1,2025,Promocionada,\"9,5\"\n"   # actualiza la nota existente
+            "L1,ÁLGEBRA,K2,2025,aprobada,7\n"
+            "L1,Álgebra,K2,2025,aprobada,8\n"                  # repetida: gana la última
+            "P1,Álgebra,K1,2025,aprobada,8\n"                  # profesor
+            "L2,Álgebra,K9,2025,aprobada,8\n"
+            "L2,Álgebra,K1,2025,aprobada,11\n",
+            on_reject=lambda row, motivo: rechazadas.append((row["legajo"], motivo)),
+        )
+        self.assertEqual(
+            {k: stats[k] for k in ("leidas", "guardadas", "repetidas", "rechazadas")},
+            {"leidas": 6, "guardadas": 2, "repetidas": 1, "rechazadas": 3},
+        )
+        self.assertEqual(
+            [legajo for legajo, _ in rechazadas], ["P1", "L2", "L2"],
+        )
+        self.assertTrue(rechazadas[0][1].startswith("legajo desconocido"))
+        self.assertFalse(Nota.objects.filter(alumno=self.prof).exists())
+        nota = Nota.objects.get(alumno=self.alumnos[0], mca=self.mca)
+        self.assertEqual((nota.estado, str(nota.nota)), (Nota.Estado.PROMOCIONADA, "9.5"))
+        self.assertEqual(Nota.objects.get(alumno=self.alumnos[1], mca=self.mca2).nota, 8)
+
+    def test_dry_run_no_guarda(self):
+        stats = self.importar("legajo,materia,comision,anio,estado\nL0,Álgebra,K2,2025,aprobada\n", dry_run=True)
+        self.assertEqual(stats["guardadas"], 1)
+        self.assertFalse(Nota.objects.filter(mca=self.mca2).exists())
+
+    def test_faltan_columnas(self):
+        with self.assertRaises(notas_import.ArchivoInvalido):
+            self.importar("legajo,materia\nL0,Álgebra\n")
+
+
+class SearchTests(AcademicsTestCase):
+    def setUp(self):
+        super().setUp()
+        self.evaluar(self.alumnos[0], materia_score="5", materia_comment="El profe explica muy bien")
+        self.evaluar(self.alumnos[1], materia_score="3", comision_score="3", comision_comment="explica rápido")
+        self.evaluar(self.alumnos[2], materia_score="1", materia_comment="parciales difíciles")
+
+    def comentarios(self, q, **filters):
+        return [it.comentario for it in search.search_items(q, **filters)]
+
+    def test_fts(self):
+        self.assertEqual(
+            sorted(self.comentarios("explic")), ["El profe explica muy bien", "explica rápido"],
+        )
+        self.assertEqual(self.comentarios("explica", target_type="COMISION"), ["explica rápido"])
+
+    def test_otro_motor_usa_icontains(self):
+        with mock.patch.object(connection, "vendor", "mysql"):
+            self.assertEqual(
+                self.comentarios("EXPLICA"), ["explica rápido", "El profe explica muy bien"],
+            )
+            self.assertEqual(self.comentarios("profe bien", materia_id=self.materia.pk), ["El profe explica muy bien"])
+            self.assertEqual(self.comentarios("explica", comision_id=self.com2.pk), [])
+            self.assertEqual(self.comentarios("explica", limit=1, offset=1), ["El profe explica muy bien"])
+
+
+class RolloverTests(AcademicsTestCase):
+    def test_no_copia_materias_eliminadas(self):
+        baja = Materia.objects.create(nombre="Plan viejo", departamento=self.depto, eliminado=True)
+        MateriaComisionAnio.objects.create(materia=baja, comision=self.com1, anio=2025)
+
+        diff = rollover.rollover_diff(2025, 2026)
+        self.assertEqual({m.materia for m in diff["nuevas"]}, {self.materia})
+
+        stats = rollover.rollover(2025)
+        self.assertEqual(stats["creadas"], 2)
+        self.assertFalse(MateriaComisionAnio.objects.filter(materia=baja, anio=2026).exists())
+        self.assertEqual(
+            MateriaComisionAnio.objects.get(comision=self.com1, anio=2026).jtp, self.jtp,
+        )
+        self.assertEqual(rollover.rollover(2025)["creadas"], 0)
+
+
+class ExportTests(AcademicsTestCase):
+    def test_csv_sin_formulas(self):
+        self.evaluar(self.alumnos[0], materia_score="5", materia_comment='=HYPERLINK("http://x","clic")')
+        self.evaluar(self.alumnos[1], materia_score="4", materia_comment="-muy buena")
+        self.evaluar(self.alumnos[2], materia_score="3", materia_comment="normal")
+        Materia.objects.filter(pk=self.materia.pk).update(nombre="@Álgebra")
+
+        rows = list(csv.DictReader(io.StringIO("".join(exports.stream("resenas", "csv")))))
+        self.assertEqual(
+            [r["comentario"] for r in rows],
+            ["'=HYPERLINK(\"http://x\",\"clic\")", "'-muy buena", "normal"],
+        )
+        self.assertEqual({r["materia"] for r in rows}, {"'@Álgebra"})
+        self.assertEqual(rows[0]["puntuacion"], "5")
+
+        # NDJSON va sin tocar
+        first = json.loads(next(iter(exports.stream("resenas", "ndjson"))))
+        self.assertEqual(first["comentario"], '=HYPERLINK("http://x","clic")')
+
+    def test_numeros_negativos_no_se_tocan(self):
+        lines = list(exports._csv_lines(["a", "b"], [[-1, "-1"]]))
+        self.assertEqual(lines[1], "-1,'-1\r\n")
+
+
+class ImageTagTests(SimpleTestCase):
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=media, IMAGE_DERIVATIVE_WIDTHS=(160, 320))
+        override.enable()
+        self.addCleanup(override.disable)
+        cache.clear()
+
+        buf = io.BytesIO()
+        Image.new("RGB", (640, 480), (200, 30, 30)).save(buf, "JPEG")
+        self.imagen = Materia(imagen=default_storage.save("materias/foto.jpg", ContentFile(buf.getvalue()))).imagen
+        self.template = Template('{% load imagenes %}{% picture imagen alt="foto" %}')
+
+    def test_sin_derivados_usa_el_original_sin_generar(self):
+        with mock.patch.object(images, "generate") as generate:
+            html = self.template.render(Context({"imagen": self.imagen}))
+        generate.assert_not_called()
+        self.assertNotIn("<picture>", html)
+        self.assertIn(f'src="{self.imagen.url}"', html)
+
+    def test_con_derivados_arma_el_srcset(self):
+        self.assertEqual(images.generate(self.imagen), [160, 320])
+        html = self.template.render(Context({"imagen": self.imagen}))
+        self.assertIn("foto.jpg.w320.webp 320w", html)
+        self.assertIn("foto.jpg.w160.jpg 160w", html)
@@ -7,8 +7,12 @@ urlpatterns = [
     path("subjects/<int:department_id>/", views.MateriasListView.as_view(), name="subjects_by_dept"),
     path("materia/<int:materia_id>/", views.perfil_materia, name="perfil_materia"),
     path("materias/<int:materia_id>/comisiones/<int:comision_id>/<int:anio>/", views.perfil_comision, name="perfil_comision"),
+    path("materia/<int:materia_id>/comentarios/", views.comentarios_materia, name="comentarios_materia"),
+    path("materias/<int:materia_id>/comisiones/<int:comision_id>/<int:anio>/comentarios/", views.comentarios_comision, name="comentarios_comision"),
     path("materias/<int:materia_id>/<int:anio>/comisiones/", views.MateriaComisionAnioListView.as_view(), name="materia_comisiones"),
     path("evaluar/<int:mca_id>/", views.evaluar_mca, name="evaluar_mca"),
+    path("buscar/", views.buscar_comentarios, name="buscar"),
+    path("buscar.json", views.buscar_comentarios_json, name="buscar_json"),
     path("admin-panel/", views.AdminPanelView.as_view(), name="admin_panel"),
     path("admin/departamentos/", views.DepartmentList.as_view(), name="dept_list"),
     path("admin/departamentos/nuevo/", views.DepartmentCreate.as_view(), name="dept_create"),
@@ -22,6 +26,8 @@ urlpatterns = [
     path("comisiones/nueva/", views.ComisionCreateView.as_view(), name="comision_create"),
     path("comisiones/<int:pk>/editar/", views.ComisionUpdateView.as_view(), name="comision_update"),
     path("comisiones/<int:pk>/eliminar/", views.ComisionDelete.as_view(), name="comision_delete"),
+    path("comisiones/pasaje-de-anio/", views.MCARolloverView.as_view(), name="mca_rollover"),
+    path("admin/exportar/<str:dataset>.<str:fmt>", views.ExportView.as_view(), name="export"),
     path("mca/<int:mca_id>/resena/editar/", views.editar_resena_mca, name="editar_resena_mca"),
     path("mca/<int:mca_id>/resena/eliminar/", views.eliminar_resena_mca, name="eliminar_resena_mca"),
 ]
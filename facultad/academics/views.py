@@ -1,20 +1,18 @@
 from django.contrib.auth.decorators import login_required
-from django.db.models import Avg, Count, Max, Value, OuterRef, Subquery, IntegerField, FloatField
-from django.db.models.functions import Coalesce
+from django.db.models import Max
 from django.shortcuts import get_object_or_404, render, redirect
 from django.utils.timezone import localtime
 from django.utils import timezone
-from academics.models import MateriaComisionAnio, ResenaItem, Materia, Department, Nota, Resena, Comision
-from academics.models import MateriaComisionAnio, ResenaItem, Materia, Department, Nota, Resena, Comision
+from academics.models import MateriaComisionAnio, ResenaItem, Materia, Department, Resena, Comision
+from academics.models import MateriaComisionAnio, ResenaItem, Materia, Department, Resena, Comision
 from people.models import User
 from django.contrib import messages
-from django.db import transaction, IntegrityError
+from django.db import transaction
 from django.http import HttpResponseForbidden
 from academics.models import Department
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import TemplateView, ListView, CreateView, UpdateView, DeleteView
 from django.views.generic import TemplateView, ListView, CreateView, UpdateView, DeleteView
-from better_profanity import profanity
 from django.urls import reverse_lazy
 from academics.mixins import AdminRequiredMixin
 import json
@@ -22,6 +20,13 @@ from django.utils.safestring import mark_safe
 from .forms import ComisionForm, MCAFormSet, DepartmentForm, MateriaForm
 from django.urls import reverse
 from django.http import Http404
+from academics import catalog_cache, exports, idempotency, ratings, review_queue, reviews, rollover, search
+from academics.conditional import conditional_profile
+from academics.mixins import CatalogCacheMixin
+from django.http import HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
+from django.utils.dateparse import parse_date
+from django.views import View
+from academics.pagination import comment_feed, order_param, render_comment_fragment
 
 from django.urls import reverse_lazy
 from academics.mixins import AdminRequiredMixin
@@ -31,39 +36,38 @@ from .forms import ComisionForm, MCAFormSet, DepartmentForm, MateriaForm
 
 
 
-class DepartmentListView(LoginRequiredMixin, ListView):
+class DepartmentListView(LoginRequiredMixin, CatalogCacheMixin, ListView):
     template_name = "academics/home.html"
+    grid_template = "academics/Components/grid_departamentos.html"
     context_object_name = "departments"
     model = Department
 
-class MateriasListView(LoginRequiredMixin, ListView):
+    def catalog_scopes(self):
+        return [catalog_cache.GLOBAL, catalog_cache.DEPARTMENTS]
+
+class MateriasListView(LoginRequiredMixin, CatalogCacheMixin, ListView):
     template_name = "academics/materias.html"
+    grid_template = "academics/Components/grid_materias.html"
     context_object_name = "subjects"
     model = Materia
 
-    def get_queryset(self):
-        self.department = get_object_or_404(Department, pk=self.kwargs["department_id"])
+    def catalog_scopes(self):
+        return [catalog_cache.GLOBAL, catalog_cache.dept_scope(self.kwargs["department_id"])]
 
-        # Subqueries para evitar depender del related_name
-        avg_sq = (ResenaItem.objects
-                  .filter(target_type="MATERIA", materia_id=OuterRef('pk'))
-                  .values('materia_id')
-                  .annotate(avg=Avg('puntuacion'))
-                  .values('avg')[:1])
+    def catalog_key_parts(self):
+        return (self.kwargs["department_id"], timezone.now().year)
 
-        cnt_sq = (ResenaItem.objects
-                  .filter(target_type="MATERIA", materia_id=OuterRef('pk'))
-                  .values('materia_id')
-                  .annotate(cnt=Count('id'))
-                  .values('cnt')[:1])
+    def header_context(self, ctx):
+        return {
+            "department": {"id": self.department.pk, "nombre": self.department.nombre},
+            "current_year": ctx["current_year"],
+        }
 
+    def get_queryset(self):
+        self.department = get_object_or_404(Department, pk=self.kwargs["department_id"])
         return (Materia.objects
                 .filter(departamento_id=self.department.pk, eliminado=False)
                 .select_related("departamento")
-                .annotate(
-                    avg_rating=Coalesce(Subquery(avg_sq, output_field=FloatField()), Value(0.0)),
-                    opiniones_cnt=Coalesce(Subquery(cnt_sq, output_field=IntegerField()), Value(0)),
-                )
                 .order_by("nombre"))
 
     def get_context_data(self, **kwargs):
@@ -72,9 +76,11 @@ class MateriasListView(LoginRequiredMixin, ListView):
         ctx["current_year"] = timezone.now().year
 
         # Construyo el objeto rating que espera card.html para cada materia
-        for d in ctx["subjects"]:
-            promedio = float(getattr(d, "avg_rating", 0.0) or 0.0)
-            cantidad = int(getattr(d, "opiniones_cnt", 0) or 0)
+        subjects = list(ctx["subjects"])
+        por_materia = ratings.ratings_for(ResenaItem.Target.MATERIA, [d.pk for d in subjects])
+        for d in subjects:
+            promedio, cantidad = por_materia.get(d.pk, ratings.SIN_RATING)
+            d.opiniones_cnt = cantidad
             full_stars = max(0, min(5, int(round(promedio)))) if cantidad else 0
             d.rating = {
                 "score": f"{promedio:.1f}" if cantidad else "—",
@@ -83,11 +89,29 @@ class MateriasListView(LoginRequiredMixin, ListView):
             }
         return ctx
 
-class MateriaComisionAnioListView(LoginRequiredMixin, ListView):
+class MateriaComisionAnioListView(LoginRequiredMixin, CatalogCacheMixin, ListView):
     template_name = "academics/comision.html"
+    grid_template = "academics/Components/grid_comisiones.html"
     context_object_name = "mca_list"
     model = MateriaComisionAnio
 
+    def catalog_scopes(self):
+        return [
+            catalog_cache.GLOBAL,
+            catalog_cache.COMISIONES,
+            catalog_cache.PROFESORES,
+            catalog_cache.materia_scope(self.kwargs["materia_id"]),
+        ]
+
+    def catalog_key_parts(self):
+        return (self.kwargs["materia_id"], self.kwargs.get("anio"), timezone.now().year)
+
+    def header_context(self, ctx):
+        return {
+            "materia": {"id": self.materia.pk, "nombre": self.materia.nombre},
+            "current_year": ctx["current_year"],
+            "year_choices": ctx["year_choices"],
+        }
 
     def get_queryset(self):
         self.materia = get_object_or_404(Materia, pk=self.kwargs["materia_id"], eliminado=False)
@@ -105,23 +129,12 @@ class MateriaComisionAnioListView(LoginRequiredMixin, ListView):
         ctx["current_year"] = self.anio
         ctx["year_choices"] = [system_year - i for i in range(6)]
 
-        # —— ratings por cada MCA del queryset ——
+        # —— ratings de todas las MCA del queryset en una sola consulta ——
+        mcas = list(ctx["mca_list"])
+        por_mca = ratings.ratings_for(ratings.MCA, [mca.pk for mca in mcas])
         mca_with_rating = []
-        for mca in ctx["mca_list"]:
-            agg = (
-                ResenaItem.objects
-                .filter(
-                    target_type="COMISION",
-                    resena__mca=mca,
-                    comision_id=mca.comision_id,
-                )
-                .aggregate(
-                    promedio=Coalesce(Avg("puntuacion"), Value(0.0)),
-                    cantidad=Coalesce(Count("id"), Value(0)),
-                )
-            )
-            promedio = float(agg["promedio"])
-            cantidad = int(agg["cantidad"])
+        for mca in mcas:
+            promedio, cantidad = por_mca.get(mca.pk, ratings.SIN_RATING)
             full_stars = max(0, min(5, int(round(promedio)))) if cantidad else 0
 
             rating = {
@@ -138,30 +151,43 @@ def _count_text(n: int) -> str:
         # usa tu implementación; dejo un fallback simple
         return f"{n} opiniones" if n < 1000 else f"{n/1000:.1f} k opiniones"
 
-def perfil_comision(request, materia_id: int, comision_id: int, anio: int):
+
+def _comision_feed(request, materia_id, comision_id, anio):
     mca = get_object_or_404(
         MateriaComisionAnio,
         materia_id=materia_id,
         comision_id=comision_id,
         anio=anio,
     )
-    materia = mca.materia
-    comision = mca.comision
-
-    # --- NUEVO: orden por query param ---
-    order = (request.GET.get("order") or "desc").lower()
-    if order not in {"asc", "desc"}:
-        order = "desc"
-
     base_qs = (
         ResenaItem.objects
         .filter(target_type="COMISION", resena__mca=mca, comision_id=comision_id)
     )
+    more_url = reverse("academics:comentarios_comision", args=[materia_id, comision_id, anio])
+    comentarios, more = comment_feed(request, base_qs, order_param(request), more_url)
+    return mca, comentarios, more
+
+
+def _comision_validator_parts(materia_id, comision_id, anio):
+    items = ResenaItem.objects.filter(
+        target_type="COMISION", comision_id=comision_id,
+        resena__mca__materia_id=materia_id, resena__mca__anio=anio,
+    )
+    scopes = [catalog_cache.materia_scope(materia_id), catalog_cache.COMISIONES, catalog_cache.PROFESORES]
+    return items, scopes
+
+
+@conditional_profile(_comision_validator_parts)
+def perfil_comision(request, materia_id: int, comision_id: int, anio: int):
+    mca, comentarios, more_url = _comision_feed(request, materia_id, comision_id, anio)
+    materia = mca.materia
+    comision = mca.comision
+
+    # --- NUEVO: orden por query param ---
+    order = order_param(request)
 
-    # Agregados (independientes del orden)
-    agg = base_qs.aggregate(promedio=Avg("puntuacion"), cantidad=Count("id"))
-    promedio = float(agg["promedio"] or 0.0)
-    cantidad = int(agg["cantidad"] or 0)
+    # Agregados (independientes del orden), leídos del resumen de la cursada
+    promedio, cantidad = ratings.cached_rating(ResenaItem.Target.COMISION, comision_id, mca_id=mca.id)
     full_stars = int(round(promedio)) if cantidad else 0
     full_stars = max(0, min(5, full_stars))
     rating = {
@@ -170,19 +196,6 @@ def perfil_comision(request, materia_id: int, comision_id: int, anio: int):
         "full_stars": full_stars,
     }
 
-    # Orden aplicado a los items
-    order_by = "created_at" if order == "asc" else "-created_at"
-    items_qs = base_qs.order_by(order_by)
-
-    comentarios = [
-        {
-            "estrellas": int(it.puntuacion or 0),
-            "texto": profanity.censor((it.comentario or "").strip()),
-            "fecha": localtime(it.created_at).strftime("%d/%m/%Y"),
-        }
-        for it in items_qs[:50]
-    ]
-
     return render(
         request,
         "academics/perfil_comision.html",
@@ -194,10 +207,31 @@ def perfil_comision(request, materia_id: int, comision_id: int, anio: int):
             "jtp": mca.jtp,
             "rating": rating,
             "comentarios": comentarios,
+            "more_url": more_url,
             "order": order,  # <- pasar al template para marcar el seleccionado
         },
     )
 
+
+def comentarios_comision(request, materia_id: int, comision_id: int, anio: int):
+    """Siguiente página de comentarios de la comisión ("cargar más")."""
+    _, comentarios, more_url = _comision_feed(request, materia_id, comision_id, anio)
+    return render_comment_fragment(request, comentarios, more_url)
+
+
+def _materia_feed(request, materia_id):
+    items_qs = ResenaItem.objects.filter(target_type="MATERIA", materia_id=materia_id)
+    more_url = reverse("academics:comentarios_materia", args=[materia_id])
+    return comment_feed(request, items_qs, order_param(request), more_url)
+
+
+def _materia_validator_parts(materia_id):
+    items = ResenaItem.objects.filter(target_type="MATERIA", materia_id=materia_id)
+    scopes = [catalog_cache.materia_scope(materia_id), catalog_cache.COMISIONES, catalog_cache.PROFESORES]
+    return items, scopes
+
+
+@conditional_profile(_materia_validator_parts)
 def perfil_materia(request, materia_id: int):
     materia = get_object_or_404(Materia, id=materia_id)
 
@@ -225,20 +259,10 @@ def perfil_materia(request, materia_id: int):
         for row in comisiones_qs
     ]
 
-    order = request.GET.get("order", "desc")
-    if order not in ("asc", "desc"):
-        order = "desc"
-    order_prefix = "" if order == "asc" else "-"
+    order = order_param(request)
+    comentarios, more_url = _materia_feed(request, materia_id)
 
-    items_qs = (
-        ResenaItem.objects
-        .filter(target_type="MATERIA", resena__mca__materia_id=materia_id)
-        .order_by(f"{order_prefix}created_at")
-    )
-
-    agg = items_qs.aggregate(promedio=Avg("puntuacion"), cantidad=Count("id"))
-    promedio = float(agg["promedio"] or 0.0)
-    cantidad = int(agg["cantidad"] or 0)
+    promedio, cantidad = ratings.cached_rating(ResenaItem.Target.MATERIA, materia_id)
     full_stars = max(0, min(5, int(round(promedio)) if cantidad else 0))
 
     rating = {
@@ -247,15 +271,6 @@ def perfil_materia(request, materia_id: int):
         "full_stars": full_stars,
     }
 
-    comentarios = [
-        {
-            "estrellas": int(it.puntuacion or 0),
-            "texto": profanity.censor((it.comentario or "").strip()),
-            "fecha": localtime(it.created_at).strftime("%d/%m/%Y"),
-        }
-        for it in items_qs[:50]
-    ]
-
     return render(
         request,
         "academics/perfil_materia.html",
@@ -265,34 +280,125 @@ def perfil_materia(request, materia_id: int):
             "comisiones": comisiones,
             "rating": rating,
             "comentarios": comentarios,
+            "more_url": more_url,
             "order": order,
         },
     )
 
+
+def comentarios_materia(request, materia_id: int):
+    """Siguiente página de comentarios de la materia ("cargar más")."""
+    get_object_or_404(Materia, id=materia_id)
+    comentarios, more_url = _materia_feed(request, materia_id)
+    return render_comment_fragment(request, comentarios, more_url)
+
+def _int_param(request, name):
+    try:
+        return int(request.GET.get(name) or 0) or None
+    except ValueError:
+        return None
+
+
+def _search_filters(request):
+    tipo = (request.GET.get("tipo") or "").upper()
+    return {
+        "target_type": tipo if tipo in ResenaItem.Target.values else None,
+        "materia_id": _int_param(request, "materia"),
+        "comision_id": _int_param(request, "comision"),
+        "profesor_id": _int_param(request, "profesor"),
+        "anio": _int_param(request, "anio"),
+    }
+
+
+def _search_result(it):
+    mca = it.resena.mca
+    prof = it.titular or it.jtp
+    if it.target_type == ResenaItem.Target.MATERIA:
+        url = reverse("academics:perfil_materia", args=[mca.materia_id])
+    elif it.target_type == ResenaItem.Target.COMISION:
+        url = reverse("academics:perfil_comision", args=[mca.materia_id, mca.comision_id, mca.anio])
+    elif prof and prof.username:
+        url = reverse("people:perfil_profesor", args=[prof.username])
+    else:
+        url = None
+    return {
+        "id": it.id,
+        "tipo": it.target_type,
+        "tipo_display": it.get_target_type_display(),
+        "puntuacion": it.puntuacion,
+        "comentario": it.comentario_censurado,
+        "fecha": localtime(it.created_at).strftime("%d/%m/%Y"),
+        "materia": mca.materia.nombre,
+        "comision": mca.comision.nombre,
+        "anio": mca.anio,
+        "profesor": (prof.get_full_name() or prof.username) if prof else None,
+        "rank": round(it.rank, 4),
+        "url": url,
+    }
+
+
+@login_required
+def buscar_comentarios(request):
+    q = (request.GET.get("q") or "").strip()
+    filtros = _search_filters(request)
+    resultados = search.search_items(q, limit=50, **filtros) if q else []
+    return render(
+        request,
+        "academics/buscar.html",
+        {
+            "q": q,
+            "filtros": filtros,
+            "tipos": ResenaItem.Target.choices,
+            "resultados": [_search_result(it) for it in resultados],
+        },
+    )
+
+
+@login_required
+def buscar_comentarios_json(request):
+    q = (request.GET.get("q") or "").strip()
+    limit = min(_int_param(request, "limit") or 20, 100)
+    offset = _int_param(request, "offset") or 0
+    resultados = search.search_items(q, limit=limit, offset=offset, **_search_filters(request))
+    return JsonResponse({
+        "q": q,
+        "offset": offset,
+        "results": [_search_result(it) for it in resultados],
+    })
+
+
 @login_required
 def evaluar_mca(request, mca_id):
     u = request.user
-    mca = get_object_or_404(
-        MateriaComisionAnio.objects.select_related("materia", "comision", "titular", "jtp"),
-        pk=mca_id
-    )
 
-    # ===== VALIDACIONES DE ACCESO (GET y POST) =====
-    tiene_nota_valida = Nota.objects.filter(
-        alumno=u,
-        mca=mca,
-        estado__in=[Nota.Estado.APROBADA, Nota.Estado.PROMOCIONADA],
-    ).exists()
+    def _responder(level, text, to, **kwargs):
+        messages.add_message(request, level, text)
+        if level == messages.ERROR:
+            # con un error el mismo form se puede volver a enviar
+            idempotency.release(request, "evaluar")
+            return redirect(to, **kwargs)
+        return idempotency.finish(request, "evaluar", redirect(to, **kwargs), level, text)
 
-    ya_tiene_resena = Resena.objects.filter(alumno=u, mca=mca).exists()
+    # Cursada + si puede evaluarla + si ya la evaluó: una sola consulta (ver academics/reviews.py)
+    mca = get_object_or_404(reviews.mca_queryset(u), pk=mca_id)
 
-    if not tiene_nota_valida:
-        messages.error(request, "Solo podés evaluar materias que aprobaste o promocionaste.")
-        return redirect('people:perfil')
+    if request.method == "POST":
+        # doble click / reenvío: la respuesta del primer POST, sin tocar la base
+        previa = idempotency.begin(request, "evaluar")
+        if previa is not None:
+            return previa
 
-    if ya_tiene_resena:
-        messages.info(request, "Ya enviaste una reseña para esta cursada.")
-        return redirect('people:perfil')
+    # ===== VALIDACIONES DE ACCESO (GET y POST) =====
+    # En el POST se vuelven a calcular con la misma consulta, por si algo cambió desde el GET
+    if not mca.nota_valida:
+        if request.method == "POST":
+            return _responder(messages.ERROR, "Tu estado en la materia ya no habilita enviar reseña.", 'people:perfil')
+        return _responder(messages.ERROR, "Solo podés evaluar materias que aprobaste o promocionaste.", 'people:perfil')
+
+    if mca.ya_evaluo:
+        return _responder(messages.INFO, "Ya enviaste una reseña para esta cursada.", 'people:perfil')
+    if mca.en_cola:
+        return _responder(messages.INFO, "Tu reseña para esta cursada se está publicando.", 'people:perfil')
 
     # ===== GET: mostrar formulario =====
     if request.method == "GET":
@@ -300,100 +406,34 @@ def evaluar_mca(request, mca_id):
             "mca": mca,
             "titular": mca.titular,
             "jtp": mca.jtp,
+            "idempotency_key": idempotency.new_key(),
         }
         return render(request, "academics/evaluar_mca.html", ctx)
 
-    # ===== POST: re-validar y crear reseña + items =====
-    # Revalido nuevamente por si hubo carrera entre GET y POST
-    if Resena.objects.filter(alumno=u, mca=mca).exists():
-        messages.info(request, "Ya enviaste una reseña para esta cursada.")
-        return redirect('people:perfil')
-
-
-    if not Nota.objects.filter(
-        alumno=u, mca=mca,
-        estado__in=[Nota.Estado.APROBADA, Nota.Estado.PROMOCIONADA]
-    ).exists():
-        # Alguien manipuló el form o cambió la nota en el medio
-        messages.error(request, "Tu estado en la materia ya no habilita enviar reseña.")
-        return redirect('people:perfil')
-
-    # Helpers
-    def _clean_score(name):
-        v = request.POST.get(name)
-        if not v:
-            return None
-        try:
-            iv = int(v)
-            return iv if 1 <= iv <= 5 else None
-        except ValueError:
-            return None
-
-    materia_score  = _clean_score("materia_score")
-    materia_comment = (request.POST.get("materia_comment") or "").strip()
-
-    comision_score = _clean_score("comision_score")
-    comision_comment = (request.POST.get("comision_comment") or "").strip()
-
-    titular_score = _clean_score("titular_score") if mca.titular_id else None
-    titular_comment = (request.POST.get("titular_comment") or "").strip() if mca.titular_id else ""
-
-    jtp_score = _clean_score("jtp_score") if mca.jtp_id else None
-    jtp_comment = (request.POST.get("jtp_comment") or "").strip() if mca.jtp_id else ""
+    # ===== POST: crear reseña + items =====
+    try:
+        items = reviews.build_items(mca, request.POST)
+        if not items:
+            return _responder(messages.ERROR, "Elegí al menos una puntuación antes de enviar.", "academics:evaluar_mca", mca_id=mca.id)
+
+        if review_queue.enabled():
+            # write-behind: un insert en la cola; manage.py drain_resenas la publica
+            review_queue.encolar(u, mca, items)
+            return _responder(
+                messages.SUCCESS, "¡Gracias! Recibimos tu evaluación; se publica en unos minutos.", 'people:perfil'
+            )
 
-    if not any([materia_score, comision_score, titular_score, jtp_score]):
-        messages.error(request, "Elegí al menos una puntuación antes de enviar.")
-        return redirect("academics:evaluar_mca", mca_id=mca.id)
+        try:
+            reviews.crear_resena(u, mca, items)
+        except reviews.ResenaDuplicada:
+            # Respaldo por la UniqueConstraint uq_resena_alumno_mca (doble envío)
+            return _responder(messages.INFO, "Ya existe una reseña para esta cursada.", 'people:perfil')
+    except Exception:
+        # que un reintento con la misma clave no espere una respuesta que no va a llegar
+        idempotency.release(request, "evaluar")
+        raise
 
-    try:
-        with transaction.atomic():
-            # Esta línea puede lanzar IntegrityError si alguien duplica el envío:
-            resena = Resena.objects.create(alumno=u, mca=mca)
-
-            if materia_score:
-                ResenaItem.objects.create(
-                    resena=resena,
-                    target_type=ResenaItem.Target.MATERIA,
-                    puntuacion=materia_score,
-                    comentario=materia_comment,
-                    materia=mca.materia,
-                )
-
-            if comision_score:
-                ResenaItem.objects.create(
-                    resena=resena,
-                    target_type=ResenaItem.Target.COMISION,
-                    puntuacion=comision_score,
-                    comentario=comision_comment,
-                    comision=mca.comision,
-                )
-
-            if mca.titular_id and titular_score:
-                ResenaItem.objects.create(
-                    resena=resena,
-                    target_type=ResenaItem.Target.TITULAR,
-                    puntuacion=titular_score,
-                    comentario=titular_comment,
-                    titular=mca.titular,
-                )
-
-            if mca.jtp_id and jtp_score:
-                ResenaItem.objects.create(
-                    resena=resena,
-                    target_type=ResenaItem.Target.JTP,
-                    puntuacion=jtp_score,
-                    comentario=jtp_comment,
-                    jtp=mca.jtp,
-                )
-
-    except IntegrityError:
-        # Respaldo por la UniqueConstraint uq_resena_alumno_mca
-        messages.info(request, "Ya existe una reseña para esta cursada.")
-        return redirect('people:perfil')
-
-
-    messages.success(request, "¡Gracias! Tu evaluación fue registrada.")
-    return redirect('people:perfil')
+    return _responder(messages.SUCCESS, "¡Gracias! Tu evaluación fue registrada.", 'people:perfil')
 
 # VISTAS ADMIN 
 
@@ -564,6 +604,74 @@ class ComisionDelete(DeleteView):
     template_name = "academics/confirm_delete.html"
     success_url = reverse_lazy("academics:comision_list")
 
+
+class ExportView(AdminRequiredMixin, View):
+    """
+    Export de reseñas o notas (academics/exports.py) en streaming. Filtros opcionales:
+    ?desde=AAAA-MM-DD&hasta=AAAA-MM-DD&anio=&departamento=
+    """
+
+    def get(self, request, dataset, fmt):
+        if dataset not in exports.DATASETS or fmt not in exports.FORMATOS:
+            raise Http404("Export inexistente")
+        filters = {"anio": _int_param(request, "anio"), "departamento": _int_param(request, "departamento")}
+        for name in ("desde", "hasta"):
+            raw = request.GET.get(name)
+            try:
+                filters[name] = parse_date(raw) if raw else None
+            except ValueError:
+                filters[name] = None
+            if raw and filters[name] is None:
+                return HttpResponseBadRequest(f"{name}: fecha inválida (usar AAAA-MM-DD).")
+
+        response = StreamingHttpResponse(
+            exports.stream(dataset, fmt, **filters), content_type=exports.FORMATOS[fmt]
+        )
+        fecha = timezone.localdate().isoformat()
+        response["Content-Disposition"] = f'attachment; filename="{dataset}-{fecha}.{fmt}"'
+        response["Cache-Control"] = "no-store"
+        return response
+
+
+class MCARolloverView(AdminRequiredMixin, TemplateView):
+    """
+    Pasaje de año de las cursadas (academics/rollover.py). GET muestra el diff
+    (?desde=&hasta=) y POST lo aplica.
+    """
+    template_name = "academics/mca_rollover.html"
+
+    def _anios(self, data):
+        anios = list(
+            MateriaComisionAnio.objects.order_by("-anio").values_list("anio", flat=True).distinct()
+        )
+        try:
+            desde = int(data.get("desde") or (anios[0] if anios else timezone.now().year))
+            hasta = int(data.get("hasta") or desde + 1)
+        except ValueError:
+            raise Http404("Año inválido")
+        return anios, desde, hasta
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        anios, desde, hasta = self._anios(self.request.GET)
+        ctx.update({"anios": anios, "desde": desde, "hasta": hasta})
+        if desde != hasta:
+            ctx["diff"] = rollover.rollover(desde, hasta, dry_run=True)
+        return ctx
+
+    def post(self, request, *args, **kwargs):
+        _, desde, hasta = self._anios(request.POST)
+        if desde == hasta:
+            messages.error(request, "El año destino tiene que ser distinto del origen.")
+            return redirect(f"{reverse('academics:mca_rollover')}?desde={desde}")
+        res = rollover.rollover(desde, hasta)
+        messages.success(
+            request,
+            f"Cursadas {desde} → {hasta}: {res['creadas']} creadas, "
+            f"{len(res['existentes'])} ya existían ({res['segundos']:.2f}s).",
+        )
+        return redirect(f"{reverse('academics:mca_rollover')}?desde={desde}&hasta={hasta}")
+
 @login_required
 def editar_resena_mca(request, mca_id):
     """
@@ -582,6 +690,20 @@ def editar_resena_mca(request, mca_id):
         messages.info(request, "Aún no enviaste una reseña para esta cursada. Podés crearla ahora.")
         return redirect('academics:evaluar_mca', mca_id=mca.id)
 
+    if request.method == "POST":
+        try:
+            version = reviews.parse_version(request.POST.get("version"))
+            reviews.editar_resena(resena, mca, reviews.build_items(mca, request.POST), version=version)
+        except reviews.ResenaDesactualizada:
+            messages.warning(
+                request,
+                "Tu reseña cambió mientras la editabas (¿otra pestaña?). Revisá los valores actuales y volvé a guardar.",
+            )
+            return redirect("academics:editar_resena_mca", mca_id=mca.id)
+
+        messages.success(request, "¡Listo! Tu reseña fue actualizada.")
+        return redirect('people:perfil')  # o tu destino preferido
+
     # Precarga para el template
     initial = {}
     items = {i.target_type: i for i in resena.items.all()}
@@ -594,52 +716,6 @@ def editar_resena_mca(request, mca_id):
     it = items.get(ResenaItem.Target.JTP)
     if it: initial.update(jtp_score=it.puntuacion, jtp_comment=it.comentario)
 
-    if request.method == "POST":
-        data = request.POST
-
-        def upsert_item(target, score_key, comment_key):
-            puntuacion = (data.get(score_key) or "").strip()
-            comentario = (data.get(comment_key) or "").strip()
-
-            # Si no se envía puntaje, eliminar el item si existía
-            if not puntuacion:
-                ResenaItem.objects.filter(resena=resena, target_type=target).delete()
-                return
-
-            item, _ = ResenaItem.objects.get_or_create(resena=resena, target_type=target)
-            item.puntuacion = int(puntuacion)
-            item.comentario = comentario
-
-            # Vincular FK según target (y limpiar las demás)
-            if target == ResenaItem.Target.MATERIA:
-                item.materia = mca.materia
-                item.comision = item.titular = item.jtp = None
-            elif target == ResenaItem.Target.COMISION:
-                item.comision = mca.comision
-                item.materia = item.titular = item.jtp = None
-            elif target == ResenaItem.Target.TITULAR:
-                if not mca.titular_id:
-                    ResenaItem.objects.filter(resena=resena, target_type=target).delete()
-                    return
-                item.titular = mca.titular
-                item.materia = item.comision = item.jtp = None
-            elif target == ResenaItem.Target.JTP:
-                if not mca.jtp_id:
-                    ResenaItem.objects.filter(resena=resena, target_type=target).delete()
-                    return
-                item.jtp = mca.jtp
-                item.materia = item.comision = item.titular = None
-
-            item.save()  # valida con clean()
-
-        upsert_item(ResenaItem.Target.MATERIA,  "materia_score",  "materia_comment")
-        upsert_item(ResenaItem.Target.COMISION, "comision_score", "comision_comment")
-        upsert_item(ResenaItem.Target.TITULAR,  "titular_score",  "titular_comment")
-        upsert_item(ResenaItem.Target.JTP,      "jtp_score",      "jtp_comment")
-
-        messages.success(request, "¡Listo! Tu reseña fue actualizada.")
-        return redirect('people:perfil')  # o tu destino preferido
-
     ctx = {
         "mca": mca,
         "titular": mca.titular,
@@ -653,6 +729,7 @@ def editar_resena_mca(request, mca_id):
         "jtp_score":      initial.get("jtp_score", ""),
         "jtp_comment":    initial.get("jtp_comment", ""),
         "is_edit": True,  # <- para que el botón diga “Editar”
+        "version": reviews.version_of(resena),
     }
     return render(request, "academics/evaluar_mca.html", ctx)
 
@@ -666,8 +743,12 @@ def eliminar_resena_mca(request, mca_id):
     u = request.user
     mca = get_object_or_404(MateriaComisionAnio, pk=mca_id)
 
-    # 🧹 Eliminar SOLO la reseña (sus items se borran por cascade)
-    Resena.objects.filter(alumno=u, mca=mca).delete()
+    # 🧹 Eliminar SOLO la reseña (sus items se borran por cascade y se descuentan
+    # de los ratings en signals.py)
+    with transaction.atomic():
+        resena = Resena.objects.filter(alumno=u, mca=mca).first()
+        if resena:
+            resena.delete()
 
     messages.success(request, "Se eliminó tu reseña. Podés volver a evaluarla cuando quieras.")
     return redirect("people:perfil") 
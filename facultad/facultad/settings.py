@@ -124,6 +124,62 @@ else:
     }
 
 
+# Cache
+# CACHE_URL: "locmem://" (default, por proceso), "file:///ruta/al/dir" (compartido entre
+# workers del mismo host) o "redis://host:6379/0" (requiere el paquete redis).
+# Con locmem cada worker de gunicorn tiene su propia copia: por eso el timeout corto.
+
+CACHE_URL = os.getenv("CACHE_URL", "locmem://")
+_cache_url = urlparse.urlparse(CACHE_URL)
+
+if _cache_url.scheme in ("redis", "rediss"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+        }
+    }
+elif _cache_url.scheme == "file":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": _cache_url.path,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "facultad",
+        }
+    }
+
+# Grillas del catálogo (academics/catalog_cache.py)
+CATALOG_CACHE_ALIAS = "default"
+CATALOG_CACHE_TIMEOUT = int(os.getenv("CATALOG_CACHE_TIMEOUT", 300 if _cache_url.scheme == "locmem" else 60 * 60 * 24))
+
+# Contadores hit/miss del cache de agregados (academics/singleflight.py, manage.py cache_stats).
+# Apagados por defecto: suman un incr al cache en cada lectura.
+SINGLEFLIGHT_METRICS = os.getenv("SINGLEFLIGHT_METRICS", "0").lower() in ("1", "true", "yes")
+
+# Reseñas en modo write-behind (academics/review_queue.py): evaluar_mca encola y
+# manage.py drain_resenas --loop las publica. Para los picos de fin de cuatrimestre.
+RESENAS_WRITE_BEHIND = os.getenv("RESENAS_WRITE_BEHIND", "0").lower() in ("1", "true", "yes")
+# segundos que una fila tomada por un worker espera antes de que otro la vuelva a tomar
+RESENAS_CLAIM_TIMEOUT = int(os.getenv("RESENAS_CLAIM_TIMEOUT", "300"))
+
+# API de solo lectura (academics/api.py), versionada en la URL: /api/v1/...
+REST_FRAMEWORK = {
+    "DEFAULT_VERSIONING_CLASS": "rest_framework.versioning.URLPathVersioning",
+    "DEFAULT_VERSION": "v1",
+    "ALLOWED_VERSIONS": ["v1"],
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "rest_framework.authentication.SessionAuthentication",
+    ],
+    "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.IsAuthenticated"],
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -39,6 +39,7 @@ urlpatterns = [
     path("people/", include("people.urls")),
     path("", lambda request: redirect("people:login")),
     path("academics/", include("academics.urls")),
+    path("api/<str:version>/", include("academics.api_urls")),
     path("accounts/login/", lambda request: redirect("people:login")),
     path("accounts/", include("allauth.urls")),
     path("navbar-test/", TemplateView.as_view(template_name="navbar_test.html"), name="navbar-test"),
@@ -8,8 +8,8 @@ class UserAdmin(DjangoUserAdmin):
     list_filter  = ("rol", "is_active", "is_staff", "is_superuser")
 
     fieldsets = DjangoUserAdmin.fieldsets + (
-        ("Rol y datos UTN", {"fields": ("rol", "legajo")}),
+        ("Rol y datos UTN", {"fields": ("rol", "legajo", "carrera")}),
     )
     add_fieldsets = DjangoUserAdmin.add_fieldsets + (
-        ("Rol y datos UTN", {"fields": ("rol", "legajo")}),
+        ("Rol y datos UTN", {"fields": ("rol", "legajo", "carrera")}),
     )
\ No newline at end of file
@@ -0,0 +1,50 @@
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from people import provisioning
+
+
+class Command(BaseCommand):
+    help = (
+        "Da de alta profesores en lote desde un .json (array de objetos) o .csv con columnas "
+        "email, legajo, first_name, last_name. Las filas con errores se informan y no se crean."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--delimiter", default=",")
+        parser.add_argument("--output", help="Guarda el resultado por fila en este .json.")
+        parser.add_argument("--dry-run", action="store_true", help="Valida sin crear nada.")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        try:
+            with open(path, encoding="utf-8-sig") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            raise CommandError(f"No existe el archivo {path}")
+
+        try:
+            if os.path.splitext(path)[1].lower() == ".json":
+                rows = provisioning.parse_json(raw)
+            else:
+                rows = provisioning.parse_csv(raw, delimiter=options["delimiter"])
+            res = provisioning.provision_professors(rows, dry_run=options["dry_run"])
+        except provisioning.LoteInvalido as e:
+            raise CommandError(str(e))
+
+        for r in res["resultados"]:
+            if not r["ok"]:
+                self.stdout.write(self.style.WARNING(
+                    f"fila {r['fila']} ({r['email'] or '-'}): {'; '.join(r['errores'])}"
+                ))
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as f:
+                json.dump(res, f, ensure_ascii=False, indent=2)
+
+        resumen = f"Válidos: {res['validos']}, creados: {res['creados']}, rechazados: {res['rechazados']}"
+        if options["dry_run"]:
+            resumen += " (dry-run, no se guardó nada)"
+        self.stdout.write(self.style.SUCCESS(resumen))
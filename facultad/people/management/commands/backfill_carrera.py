@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from academics.plan_loader import get_plan
+from people.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Completa User.carrera de los alumnos con el nombre de carrera del plan: la que "
+        "coincide (aproximadamente) con lo que tengan cargado, o la carrera por defecto."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Recalcula también a quienes ya tienen una carrera válida.")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        plan = get_plan()
+        if not plan.carreras:
+            raise CommandError("El plan de estudios está vacío (ACADEMICS_PLAN_PATH).")
+
+        qs = User.objects.filter(rol=User.Role.ALUMNO).only("id", "carrera").order_by("id")
+        if not options["all"]:
+            qs = qs.exclude(carrera__in=plan.carreras)
+
+        cambios = []
+        total = 0
+        por_carrera = {}
+        for u in qs.iterator(chunk_size=options["batch_size"]):
+            carrera = plan.resolve_carrera(u.carrera)
+            if carrera == u.carrera:
+                continue
+            u.carrera = carrera
+            cambios.append(u)
+            por_carrera[carrera] = por_carrera.get(carrera, 0) + 1
+            if len(cambios) >= options["batch_size"]:
+                total += self._flush(cambios, options["dry_run"])
+                cambios = []
+        total += self._flush(cambios, options["dry_run"])
+
+        for carrera, n in sorted(por_carrera.items()):
+            self.stdout.write(f"{n:6d}  {carrera}")
+        sufijo = " (dry-run, no se guardó nada)" if options["dry_run"] else ""
+        self.stdout.write(self.style.SUCCESS(f"Alumnos actualizados: {total}{sufijo}"))
+
+    def _flush(self, users, dry_run):
+        if users and not dry_run:
+            User.objects.bulk_update(users, ["carrera"])
+        return len(users)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('people', '0004_alter_user_rol'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='carrera',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=200),
+        ),
+    ]
@@ -10,6 +10,8 @@ class User(AbstractUser):
 
     rol = models.CharField(max_length=3, choices=Role.choices)
     legajo = models.CharField(max_length=20, unique=True, null=True, blank=True)  # solo alumnos
+    # nombre de la carrera tal cual figura en el plan (academics/plan_loader); vacío = sin elegir
+    carrera = models.CharField(max_length=200, blank=True, default="", db_index=True)
     username = models.CharField(max_length=150, blank=True, default='')
 
     imagen_perfil = models.ImageField(
@@ -0,0 +1,147 @@
+# people/provisioning.py
+# Alta de profesores en lote (endpoint people:alta_profesores_lote y manage.py
+# alta_profesores). Se valida todo en memoria más una consulta contra los usuarios
+# existentes y se inserta con un solo bulk_create; cada fila devuelve su resultado.
+import csv
+import io
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from academics import catalog_cache
+from people.models import User
+
+class LoteInvalido(Exception):
+    """El payload entero no se puede leer (no es un error de una fila)."""
+
+
+def max_batch() -> int:
+    return getattr(settings, "PROFESSOR_BATCH_MAX", 1000)
+
+
+def parse_json(raw) -> list[dict]:
+    """Array de objetos, o {"profesores": [...]}."""
+    try:
+        data = json.loads(raw or "[]")
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise LoteInvalido(f"JSON inválido: {e}")
+    if isinstance(data, dict):
+        data = data.get("profesores")
+    if not isinstance(data, list) or not all(isinstance(r, dict) for r in data):
+        raise LoteInvalido("Se esperaba una lista de profesores.")
+    return data
+
+
+def parse_csv(text: str, delimiter=",") -> list[dict]:
+    reader = csv.DictReader(io.StringIO(text), delimiter=delimiter)
+    if "email" not in (reader.fieldnames or []):
+        raise LoteInvalido("El CSV tiene que tener al menos la columna email.")
+    return list(reader)
+
+
+def _clean(row) -> dict:
+    return {
+        "email": str(row.get("email") or "").strip().lower(),
+        "legajo": str(row.get("legajo") or "").strip(),
+        "first_name": str(row.get("first_name") or "").strip(),
+        "last_name": str(row.get("last_name") or "").strip(),
+    }
+
+
+def _validate(rows) -> list[dict]:
+    """Resultado por fila con sus errores; una sola consulta para emails/legajos ya usados."""
+    limpias = [_clean(r) for r in rows]
+    emails = {r["email"] for r in limpias if r["email"]}
+    legajos = {r["legajo"] for r in limpias if r["legajo"]}
+    usados_email, usados_legajo = set(), set()
+    if emails or legajos:
+        for email, legajo in (
+            User.objects.annotate(email_l=Lower("email"))
+            .filter(Q(email_l__in=emails) | Q(legajo__in=legajos))
+            .values_list("email_l", "legajo")
+        ):
+            usados_email.add(email)
+            usados_legajo.add(legajo)
+
+    legajo_max = User._meta.get_field("legajo").max_length
+    vistos_email, vistos_legajo = set(), set()
+    resultados = []
+    for i, r in enumerate(limpias, start=1):
+        errores = []
+        if not r["email"]:
+            errores.append("email es obligatorio")
+        else:
+            try:
+                validate_email(r["email"])
+            except ValidationError:
+                errores.append("email inválido")
+        if not r["legajo"]:
+            errores.append("legajo es obligatorio")
+        elif len(r["legajo"]) > legajo_max:
+            errores.append(f"legajo de más de {legajo_max} caracteres")
+
+        if r["email"] and r["email"] in usados_email:
+            errores.append("ya existe un usuario con este email")
+        elif r["email"] in vistos_email:
+            errores.append("email repetido en el lote")
+        if r["legajo"] and r["legajo"] in usados_legajo:
+            errores.append("ya existe un usuario con este legajo")
+        elif r["legajo"] in vistos_legajo:
+            errores.append("legajo repetido en el lote")
+        vistos_email.add(r["email"] or None)
+        vistos_legajo.add(r["legajo"] or None)
+
+        resultados.append({"fila": i, **r, "ok": not errores, "errores": errores})
+    return resultados
+
+
+def provision_professors(rows, dry_run=False) -> dict:
+    """
+    Da de alta los profesores válidos (contraseña no utilizable, username = email) y
+    devuelve {"creados", "validos", "rechazados", "resultados"}; las filas con errores
+    no frenan al resto.
+    """
+    if len(rows) > max_batch():
+        raise LoteInvalido(f"Máximo {max_batch()} profesores por lote.")
+
+    for intento in range(2):
+        resultados = _validate(rows)
+        nuevos = []
+        for res in resultados:
+            if not res["ok"]:
+                continue
+            user = User(
+                username=res["email"], email=res["email"], legajo=res["legajo"],
+                first_name=res["first_name"], last_name=res["last_name"],
+                rol=User.Role.PROFESOR,
+            )
+            user.set_unusable_password()
+            nuevos.append((res, user))
+        if dry_run or not nuevos:
+            break
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create([u for _, u in nuevos], batch_size=500)
+        except IntegrityError:
+            # otro alta usó el mismo legajo entre la validación y el insert: revalido una vez
+            if intento:
+                raise
+            continue
+        for res, user in nuevos:
+            res["id"] = user.pk
+        # bulk_create no dispara signals: los nombres de profesores están en las cards
+        catalog_cache.bump(catalog_cache.PROFESORES)
+        break
+
+    creados = sum(1 for r in resultados if r["ok"])
+    return {
+        "creados": 0 if dry_run else creados,
+        "validos": creados,
+        "rechazados": len(resultados) - creados,
+        "resultados": resultados,
+    }
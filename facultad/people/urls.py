@@ -13,6 +13,7 @@ urlpatterns = [
     path("register/", views.register, name="register"),
     path("olvide-clave/", views.olvideClave, name="olvideClave"),
     path("alta-profesor/", views.altaProfesor, name="altaProfesor"),
+    path("alta-profesores/", views.alta_profesores_lote, name="alta_profesores_lote"),
     path("perfil/", PerfilUsuarioView.as_view(), name="perfil"),
     path("perfil/upload-avatar/", views.SubirAvatarView.as_view(), name="upload_avatar"),
     path("profesores/", views.professor_list, name="professor_list"),
@@ -20,6 +21,7 @@ urlpatterns = [
     path("profesor/<int:pk>/editar/", views.professor_form, name="professor_form"),
     path("profesor/<int:pk>/eliminar/", views.ProfessorDeleteView.as_view(), name="confirm_delete"),
     path("profesor/<str:username>/", views.perfil_profesor, name="perfil_profesor"),
+    path("profesor/<str:username>/comentarios/", views.comentarios_profesor, name="comentarios_profesor"),
     
     
 ]
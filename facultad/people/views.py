@@ -1,23 +1,22 @@
 import json
-from better_profanity import profanity
+from django.http import JsonResponse
 from django.contrib.auth import login, authenticate
 from django.urls import reverse_lazy
 from .forms import SignupForm, UserCreationForm
 from django.shortcuts import render, redirect, get_object_or_404
-from django.db.models import Q, Avg, Count, Exists, OuterRef, Q
+from django.db.models import Q, Exists, OuterRef, Q
 from people.models import User
-from academics.models import MateriaComisionAnio, ResenaItem, Resena, Nota, Materia
+from academics.models import MateriaComisionAnio, ResenaItem, Resena
 from django.contrib.auth import get_user_model
 from django.contrib import messages
 from django.views.decorators.csrf import csrf_exempt
-from django.utils.timezone import localtime
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import TemplateView
-import unicodedata
-from collections import Counter
-from django.conf import settings
-from academics.plan_loader import load_plan_rows
-from better_profanity import profanity
+from academics import catalog_cache, dashboard, ratings
+from people import provisioning
+from academics.conditional import conditional_profile
+from academics.pagination import comment_feed, order_param, render_comment_fragment
+from django.urls import reverse
 
 from django.views import View
 from django.urls import NoReverseMatch 
@@ -98,6 +97,33 @@ def altaProfesor(request):
             messages.error(request, "Email y legajo son obligatorios.")
     return render(request, "people/login.html")
 
+def alta_profesores_lote(request):
+    """
+    Alta de profesores en lote (solo admins). Recibe un array JSON, un CSV en el body
+    (text/csv) o un archivo CSV en el campo "archivo"; ?dry_run=1 solo valida.
+    Responde el resultado de cada fila (people/provisioning.py).
+    """
+    if not request.user.is_authenticated or not request.user.is_admin:
+        return JsonResponse({"error": "Solo administradores."}, status=403)
+    if request.method != "POST":
+        return JsonResponse({"error": "Usar POST."}, status=405)
+
+    try:
+        if "archivo" in request.FILES:
+            rows = provisioning.parse_csv(request.FILES["archivo"].read().decode("utf-8-sig"))
+        elif "csv" in (request.content_type or ""):
+            rows = provisioning.parse_csv(request.body.decode("utf-8-sig"))
+        else:
+            rows = provisioning.parse_json(request.body)
+        res = provisioning.provision_professors(rows, dry_run=bool(request.GET.get("dry_run")))
+    except provisioning.LoteInvalido as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    except UnicodeDecodeError:
+        return JsonResponse({"error": "El CSV tiene que estar en UTF-8."}, status=400)
+
+    return JsonResponse(res, status=201 if res["creados"] else 200)
+
+
 def _count_text(n: int) -> str:
     if n == 1:
         return "1 opinión"
@@ -110,6 +136,23 @@ def _count_text(n: int) -> str:
     return f"{txt} k opiniones"
 
 
+def _profesor_feed(request, profesor, order):
+    qs_tit = ResenaItem.objects.filter(target_type="TITULAR", titular_id=profesor.id)
+    qs_jtp = ResenaItem.objects.filter(target_type="JTP", jtp_id=profesor.id)
+    more_url = reverse("people:comentarios_profesor", args=[profesor.username])
+    return comment_feed(request, qs_tit | qs_jtp, order, more_url, fecha_fmt="%d/%m/%Y %H:%M")
+
+
+def _profesor_validator_parts(username):
+    items = ResenaItem.objects.filter(Q(titular__username=username) | Q(jtp__username=username))
+    scopes = [
+        catalog_cache.PROFESORES, catalog_cache.MATERIAS,
+        catalog_cache.COMISIONES, catalog_cache.CURSADAS,
+    ]
+    return items, scopes
+
+
+@conditional_profile(_profesor_validator_parts)
 def perfil_profesor(request, username):
     profesor = get_object_or_404(User, username=username, rol="PRO")
 
@@ -140,19 +183,12 @@ def perfil_profesor(request, username):
         })
     comisiones.sort(key=lambda x: (x["nombre"], x["anio"]))
 
-    qs_tit = ResenaItem.objects.filter(target_type="TITULAR", titular_id=profesor.id)
-    qs_jtp = ResenaItem.objects.filter(target_type="JTP", jtp_id=profesor.id)
+    order = order_param(request)
+    comentarios, more_url = _profesor_feed(request, profesor, order)
 
-    order = request.GET.get("order", "desc")
-    if order not in ("asc", "desc"):
-        order = "desc"
-    order_prefix = "" if order == "asc" else "-"
-
-    items_qs = (qs_tit | qs_jtp).order_by(f"{order_prefix}created_at")
-
-    agg = items_qs.aggregate(promedio=Avg("puntuacion"), cantidad=Count("id"))
-    promedio = float(agg["promedio"] or 0.0)
-    cantidad = int(agg["cantidad"] or 0)
+    promedio, cantidad = ratings.cached_rating(
+        [ResenaItem.Target.TITULAR, ResenaItem.Target.JTP], profesor.id
+    )
     full_stars = max(0, min(5, int(round(promedio)) if cantidad else 0))
 
     rating = {
@@ -161,15 +197,6 @@ def perfil_profesor(request, username):
         "full_stars": full_stars,
     }
 
-    comentarios = [
-        {
-            "estrellas": int(it.puntuacion or 0),
-            "texto": profanity.censor((it.comentario or "").strip()),
-            "fecha": localtime(it.created_at).strftime("%d/%m/%Y %H:%M"),
-        }
-        for it in items_qs[:50]
-    ]
-
     return render(
         request,
         "people/perfil_profesor.html",
@@ -180,98 +207,18 @@ def perfil_profesor(request, username):
             "comisiones": comisiones,
             "rating": rating,
             "comentarios": comentarios,
+            "more_url": more_url,
             "order": order,
         },
     )
 
 
-def _norm(s: str) -> str:
-    """Normaliza para comparar: minúsculas, sin tildes, solo alfanum y espacios simples."""
-    if not s:
-        return ""
-    s = unicodedata.normalize("NFKD", s).encode("ascii", "ignore").decode("ascii")
-    s = "".join(ch if ch.isalnum() or ch.isspace() else " " for ch in s.lower())
-    s = " ".join(s.split())
-    return s
-
-def _get_user_carrera(user) -> str | None:
-    """
-    Intenta leer la carrera desde varios atributos/relaciones comunes.
-    Devuelve el string tal cual (sin normalizar) si lo encuentra, o None.
-    """
-    # 1) Atributos directos frecuentes
-    direct_attrs = ("carrera", "career", "major", "programa", "plan_carrera", "plan", "titulo")
-    for a in direct_attrs:
-        val = getattr(user, a, None)
-        if isinstance(val, str) and val.strip():
-            return val.strip()
-        # si es un objeto con 'nombre'/'name'
-        if hasattr(val, "nombre"):
-            return str(val.nombre).strip()
-        if hasattr(val, "name"):
-            return str(val.name).strip()
-
-    # 2) Relaciones típicas de perfil
-    rels = ("perfil", "profile", "userprofile", "studentprofile", "alumno", "estudiante")
-    for rel in rels:
-        obj = getattr(user, rel, None)
-        if obj:
-            for a in direct_attrs:
-                val = getattr(obj, a, None)
-                if isinstance(val, str) and val.strip():
-                    return val.strip()
-                if hasattr(val, "nombre"):
-                    return str(val.nombre).strip()
-                if hasattr(val, "name"):
-                    return str(val.name).strip()
-
-    return None
-
-def _pick_carrera_for_user(plan_rows: list[dict], user) -> tuple[str | None, list[dict]]:
-    """
-    Elige la carrera adecuada para el usuario comparando su string con las
-    carreras presentes en el plan. Devuelve (carrera_elegida, plan_filtrado).
-    """
-    if not plan_rows:
-        return (None, [])
-
-    # carreras disponibles en archivo
-    carreras = sorted({r["carrera"] for r in plan_rows if r.get("carrera")})
-    if not carreras:
-        return (None, plan_rows)
-
-    # 1) user -> string candidata
-    user_raw = _get_user_carrera(user)
-    user_norm = _norm(user_raw or "")
-
-    # 2) si no hay nada en el usuario, usar settings ó la más frecuente
-    if not user_norm:
-        default_c = getattr(settings, "ACADEMICS_PLAN_DEFAULT_CARRERA", None)
-        if default_c:
-            chosen = default_c
-        else:
-            chosen = Counter(r["carrera"] for r in plan_rows).most_common(1)[0][0]
-        return (chosen, [r for r in plan_rows if r["carrera"] == chosen])
-
-    # 3) Fuzzy: elegimos la carrera cuyo _norm() más se “contiene”/parece
-    def score(target: str) -> int:
-        t = _norm(target)
-        # heurística simple: tokens en común + contains
-        tokens_u = set(user_norm.split())
-        tokens_t = set(t.split())
-        inter = len(tokens_u & tokens_t)
-        contains = 1 if (user_norm in t or t in user_norm) else 0
-        return inter * 10 + contains  # pondero fuerte tokens
-
-    best = max(carreras, key=score)
-    # si la mejor coincidencia tiene score 0, caemos al default / más frecuente
-    if score(best) == 0:
-        default_c = getattr(settings, "ACADEMICS_PLAN_DEFAULT_CARRERA", None)
-        chosen = default_c or Counter(r["carrera"] for r in plan_rows).most_common(1)[0][0]
-    else:
-        chosen = best
+def comentarios_profesor(request, username):
+    """Siguiente página de comentarios del profesor ("cargar más")."""
+    profesor = get_object_or_404(User, username=username, rol="PRO")
+    comentarios, more_url = _profesor_feed(request, profesor, order_param(request))
+    return render_comment_fragment(request, comentarios, more_url)
 
-    return (chosen, [r for r in plan_rows if r["carrera"] == chosen])
 
 class PerfilUsuarioView(LoginRequiredMixin, TemplateView):
     template_name = "people/perfil_usuario.html"
@@ -281,138 +228,12 @@ class PerfilUsuarioView(LoginRequiredMixin, TemplateView):
         ctx = super().get_context_data(**kwargs)
         u = self.request.user
 
-        # Promedio (igual que tenías)
-        promedio = (
-            Nota.objects.filter(alumno=u, nota__isnull=False)
-            .aggregate(val=Avg("nota"))["val"]
-        )
-
-        # Distribución por estado (sobre Notas existentes)
-        rows = Nota.objects.filter(alumno=u).values("estado").annotate(c=Count("id"))
-        tot_notas = sum(r["c"] for r in rows) or 0
-        pct_estados = {r["estado"]: round(100 * r["c"] / (tot_notas or 1), 2) for r in rows}
-        count_by_estado = {r["estado"]: r["c"] for r in rows}
-
-        # === Donut: usar carrera del usuario para filtrar el plan ===
-        all_plan = list(load_plan_rows())  # lee plan.json/csv
-        carrera_elegida, plan = _pick_carrera_for_user(all_plan, u)
-        total_plan = len(plan)
-
-        # Materias con alguna nota del usuario (distinct por materia)
-        cursadas_ids = set(
-            Nota.objects.filter(alumno=u)
-            .values_list("mca__materia_id", flat=True)
-            .distinct()
-        )
-
-        # nombre -> id (si no existe en BD, la materia igual cuenta como pendiente)
-        by_name = {m.nombre.lower(): m.id for m in Materia.objects.only("id", "nombre")}
-        tocadas_en_plan = 0
-        for r in plan:
-            mid = by_name.get(r["materia"].lower())
-            if mid and mid in cursadas_ids:
-                tocadas_en_plan += 1
-        pendientes_count = max(total_plan - tocadas_en_plan, 0)
-
-        # Contadores de estados ya cursados
-        cursando_count = count_by_estado.get(Nota.Estado.CURSANDO, 0)
-        promo_count    = count_by_estado.get(Nota.Estado.PROMOCIONADA, 0)
-        apro_count     = count_by_estado.get(Nota.Estado.APROBADA, 0)
-
-        donut_counts = {
-            "Cursando": cursando_count,
-            "Promocionada": promo_count,
-            "Aprobada": apro_count,
-            "Pendientes": pendientes_count if total_plan else 0,
-        }
-        donut_total = sum(donut_counts.values()) or 1
-        donut_pct = {k: round(v * 100 / donut_total, 2) for k, v in donut_counts.items()}
-
-        # === Lo tuyo de “evaluar materias” + comentarios (sin cambios funcionales)
-        mcas_para_evaluar = (
-            MateriaComisionAnio.objects
-            .filter(
-                notas__alumno=u,
-                notas__estado__in=[Nota.Estado.APROBADA, Nota.Estado.PROMOCIONADA],
-            )
-            .exclude(resenas__alumno=u)
-            .select_related("materia", "comision")
-            .order_by("materia__nombre", "comision__nombre", "-anio")
-            .distinct()
-        )
-
         orden = self.request.GET.get("orden", "desc")
         if orden not in ("asc", "desc"):
             orden = "desc"
-        order_by = ("-" if orden == "desc" else "") + "resena__created_at"
-
-        base_qs = (
-            ResenaItem.objects
-            .filter(resena__alumno=u)
-            .select_related(
-                "resena", "resena__mca",
-                "resena__mca__materia", "resena__mca__comision",
-                "materia", "comision", "titular", "jtp",
-            )
-            .order_by(order_by, "id")
-        )
 
-        comentarios_todos = []
-        for it in base_qs:
-            mca = it.resena.mca
-            if it.target_type == ResenaItem.Target.MATERIA:
-                comentarios_todos.append({
-                    "tipo": "Materia",
-                    "badge": "materia",
-                    "title": mca.materia.nombre,
-                    "subtitle": f"Año {mca.anio}",
-                    "fecha": it.resena.created_at,
-                    "puntuacion": it.puntuacion,
-                    "comentario": profanity.censor((it.comentario or "").strip()),
-                    "mca_id": mca.id,                           # 👈 clave
-                })
-            elif it.target_type == ResenaItem.Target.COMISION:
-                com = mca.comision.nombre if mca.comision else "—"
-                comentarios_todos.append({
-                    "tipo": "Comisión",
-                    "badge": "comision",
-                    "title": f"{mca.materia.nombre} — {com}",
-                    "subtitle": f"Año {mca.anio}",
-                    "fecha": it.resena.created_at,
-                    "puntuacion": it.puntuacion,
-                    "comentario": profanity.censor((it.comentario or "").strip()),
-                    "mca_id": mca.id,                           # 👈 clave
-                })
-            elif it.target_type in (ResenaItem.Target.TITULAR, ResenaItem.Target.JTP):
-                rol = "Titular" if it.target_type == ResenaItem.Target.TITULAR else "JTP"
-                prof = (it.titular or it.jtp)
-                nombre = (prof.get_full_name() or prof.username) if prof else "—"
-                com = mca.comision.nombre if mca.comision else "—"
-                comentarios_todos.append({
-                    "tipo": f"Profesor · {rol}",
-                    "badge": "profesor",
-                    "title": nombre,
-                    "subtitle": f"{mca.materia.nombre} — {com} · Año {mca.anio}",
-                    "fecha": it.resena.created_at,
-                    "puntuacion": it.puntuacion,
-                    "comentario": profanity.censor((it.comentario or "").strip()),
-                    "mca_id": mca.id,                           # 👈 clave
-                })
-
-        ctx.update({
-            "promedio": promedio,
-            "pct": pct_estados,
-            "mcas_para_evaluar": mcas_para_evaluar,
-            "comentarios_todos": comentarios_todos,
-            "comentarios_total": len(comentarios_todos),
-            "orden": orden,
-
-            # donut
-            "donut_counts": donut_counts,
-            "donut_pct": donut_pct,
-            "donut_total": donut_total,
-            "dashboard_carrera": carrera_elegida or "Plan",
-        })
+        # stats de notas, donut, cursadas para evaluar y comentarios (academics/dashboard.py)
+        ctx.update(dashboard.dashboard_context(u, orden))
         return ctx
 
     